@@ -4,6 +4,9 @@ Module for extracting text from various resume formats (PDF, DOCX, TXT)
 import os
 from pathlib import Path
 
+# Shared with the backend; installed from the Backend directory by requirements.txt
+from document_extraction import get_document_extractor, open_source
+
 def extract_text_from_resume(file_path: str) -> str:
     """
     Extract text from resume file (PDF, DOCX, or TXT)
@@ -32,19 +35,38 @@ def extract_text_from_resume(file_path: str) -> str:
     except Exception as e:
         raise Exception(f"Error extracting text from {file_path}: {str(e)}")
 
+def extract_text_from_upload(file_data, filename: str) -> str:
+    """
+    Extract text from resume contents held in memory (no temporary file)
+    
+    Args:
+        file_data: bytes / memoryview, or a binary file object such as UploadFile.file
+        filename: Original file name; its extension selects the format
+        
+    Returns:
+        Extracted text from the resume
+    """
+    file_extension = Path(filename or "").suffix.lower()
+    
+    try:
+        if file_extension == '.pdf':
+            return extract_from_pdf(file_data)
+        elif file_extension in ['.docx', '.doc']:
+            return extract_from_docx(file_data)
+        elif file_extension == '.txt':
+            return extract_from_txt(file_data)
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+    except Exception as e:
+        raise Exception(f"Error extracting text from {filename}: {str(e)}")
+
 def extract_from_pdf(file_path: Path) -> str:
     """Extract text from PDF file"""
     text = ""
     
-    # Try pdfplumber first (better text extraction)
+    # Shared tiered extractor (PyPDF2 text layer, pdfplumber when that looks poor), page-parallel
     try:
-        import pdfplumber
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        text = text.strip()
+        text = get_document_extractor().extract_pdf(file_path).text.strip()
         if text and len(text) > 0:
             return text
     except ImportError:
@@ -56,17 +78,17 @@ def extract_from_pdf(file_path: Path) -> str:
     try:
         import PyPDF2
         text = ""
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            num_pages = len(pdf_reader.pages)
-            
-            if num_pages == 0:
-                raise ValueError("PDF file appears to be empty or corrupted")
-            
-            for page_num, page in enumerate(pdf_reader.pages):
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+        # PdfReader takes a path or a binary stream (e.g. the spooled upload)
+        pdf_reader = PyPDF2.PdfReader(open_source(file_path))
+        num_pages = len(pdf_reader.pages)
+        
+        if num_pages == 0:
+            raise ValueError("PDF file appears to be empty or corrupted")
+        
+        for page_num, page in enumerate(pdf_reader.pages):
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
         
         text = text.strip()
         
@@ -95,19 +117,18 @@ def extract_from_pdf(file_path: Path) -> str:
 def extract_from_docx(file_path: Path) -> str:
     """Extract text from DOCX file"""
     try:
-        from docx import Document
-        doc = Document(file_path)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text.strip()
-    except ImportError:
-        raise ImportError("python-docx is required for DOCX processing. Install it with: pip install python-docx")
+        # Shared streaming extractor: paragraphs and table cells in document order
+        return get_document_extractor().extract_docx(file_path).text.strip()
     except Exception as e:
         raise Exception(f"Error reading DOCX: {str(e)}")
 
 def extract_from_txt(file_path: Path) -> str:
     """Extract text from TXT file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
+        source = open_source(file_path)
+        if not isinstance(source, str):
+            return source.read().decode('utf-8').strip()
+        with open(source, 'r', encoding='utf-8') as file:
             return file.read().strip()
     except Exception as e:
         raise Exception(f"Error reading TXT file: {str(e)}")
@@ -5,6 +5,9 @@ import re
 from typing import Dict, List, Set
 from collections import Counter
 
+# Installed from the Backend directory (see requirements.txt)
+from keyword_scanner import get_keyword_scanner
+
 # Common skill keywords organized by category
 SKILL_CATEGORIES = {
     "programming_languages": [
@@ -44,6 +47,11 @@ SKILL_CATEGORIES = {
     ]
 }
 
+# Skill dictionary flattened once; the scanner is compiled once per dictionary version
+ALL_SKILLS = tuple(dict.fromkeys(skill.lower() for skills in SKILL_CATEGORIES.values() for skill in skills))
+EDUCATION_KEYWORDS = ["bachelor", "master", "phd", "degree", "bs", "ms", "mba"]
+CERT_KEYWORDS = ["certified", "certification", "cfa", "cpa", "pmp", "aws certified"]
+
 def normalize_text(text: str) -> str:
     """Normalize text for better matching"""
     text = text.lower()
@@ -64,17 +72,9 @@ def extract_skills_from_text(text: str) -> Set[str]:
         Set of found skills
     """
     normalized_text = normalize_text(text)
-    found_skills = set()
-    
-    # Check all skill categories
-    for category, skills in SKILL_CATEGORIES.items():
-        for skill in skills:
-            # Use word boundaries for better matching
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, normalized_text, re.IGNORECASE):
-                found_skills.add(skill.lower())
     
-    return found_skills
+    # Single whole-word pass over the text for every skill in SKILL_CATEGORIES
+    return get_keyword_scanner(ALL_SKILLS, whole_words=True).find(normalized_text)
 
 def extract_requirements_from_jd(jd_text: str) -> Dict[str, List[str]]:
     """
@@ -110,16 +110,12 @@ def extract_requirements_from_jd(jd_text: str) -> Dict[str, List[str]]:
         requirements["experience"].extend(matches)
     
     # Extract education requirements
-    education_keywords = ["bachelor", "master", "phd", "degree", "bs", "ms", "mba"]
-    for keyword in education_keywords:
-        if re.search(r'\b' + keyword + r'\b', normalized_jd, re.IGNORECASE):
-            requirements["education"].append(keyword)
+    found = get_keyword_scanner(tuple(EDUCATION_KEYWORDS), whole_words=True).find(normalized_jd)
+    requirements["education"].extend(keyword for keyword in EDUCATION_KEYWORDS if keyword in found)
     
     # Extract certifications
-    cert_keywords = ["certified", "certification", "cfa", "cpa", "pmp", "aws certified"]
-    for keyword in cert_keywords:
-        if re.search(r'\b' + keyword + r'\b', normalized_jd, re.IGNORECASE):
-            requirements["education"].append(keyword)
+    found = get_keyword_scanner(tuple(CERT_KEYWORDS), whole_words=True).find(normalized_jd)
+    requirements["education"].extend(keyword for keyword in CERT_KEYWORDS if keyword in found)
     
     return requirements
 
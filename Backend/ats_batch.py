@@ -0,0 +1,54 @@
+"""
+ATS Batch Module
+Picklable entry points for scoring resumes in worker processes.
+
+Kept free of database and FastAPI imports so that spawning a worker only loads the
+parser and the ATS engine.
+"""
+
+from typing import Any, Dict, Optional
+
+from ats_engine import ATSEngine
+from job_profiles import get_requirement_profile
+from models import ResumeData
+from resume_parser import ResumeParser
+
+
+_ats_engine: Optional[ATSEngine] = None
+_resume_parser: Optional[ResumeParser] = None
+
+
+def _get_engines():
+    global _ats_engine, _resume_parser
+    if _ats_engine is None:
+        _ats_engine = ATSEngine()
+        _resume_parser = ResumeParser()
+    return _ats_engine, _resume_parser
+
+
+def score_batch_item(parsed_data: Optional[Dict[str, Any]], resume_text: Optional[str],
+                     job_requirement: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse (if needed) and score one resume.
+
+    Args:
+        parsed_data: Stored parsed resume, or None to parse `resume_text`
+        resume_text: Raw resume text, used when `parsed_data` is None
+        job_requirement: JobRequirement fields as a plain dict
+
+    Returns:
+        Dictionary with the ATS result and the validated resume/job documents
+    """
+    ats_engine, resume_parser = _get_engines()
+    if parsed_data is None:
+        parsed_data = resume_parser.parse(resume_text=resume_text)
+    resume_data = ResumeData(**parsed_data)
+    # Batches usually share one requirement: each worker compiles it once
+    profile = get_requirement_profile(job_requirement)
+    requirement = profile.requirement
+    ats_result = ats_engine.score_resume(resume_data, profile)
+    return {
+        "ats_result": ats_result,
+        "resume_data": getattr(resume_data, "model_dump", resume_data.dict)(),
+        "job_requirement": getattr(requirement, "model_dump", requirement.dict)(),
+    }
@@ -3,52 +3,228 @@ ATS (Applicant Tracking System) Engine Module
 Scores resumes based on job requirements and various criteria
 """
 
-from typing import Dict, List, Tuple
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from models import ResumeData, JobRequirement
-import re
-from difflib import SequenceMatcher
+from ats_memo import ATSResultMemo, get_ats_memo, memo_key
+from config import ATS_MEMO_ENABLED
+from job_profiles import CompiledJobProfile, effective_weights, extract_jd_keywords, get_requirement_profile
+from resume_features import (
+    EDUCATION_HIERARCHY, YEARS_PATTERN, compute_resume_features, features_are_current
+)
+from keyword_scanner import get_keyword_scanner
+from skill_matcher import CompiledSkillMatcher, get_skill_matcher
+
+
+# Bump whenever scoring logic changes, so memoized results of the old logic are not reused
+SCORING_VERSION = 1
+
+# Per-resume scoring errors kept in a ranking snapshot (the rest are only counted)
+MAX_RANKING_ERRORS = 20
 
 
 class ATSEngine:
     """Core ATS scoring engine that evaluates resumes against job requirements"""
     
-    def __init__(self):
+    def __init__(self, use_memo: bool = ATS_MEMO_ENABLED, memo: Optional[ATSResultMemo] = None):
         self.skill_similarity_threshold = 0.7
+        # Results are memoized by (resume fingerprint, requirements hash, SCORING_VERSION)
+        self.memo = (memo or get_ats_memo()) if use_memo else None
     
-    def score_resume(self, resume_data: ResumeData, job_requirement: JobRequirement) -> Dict:
+    def score_resume(self, resume_data: ResumeData,
+                     job_requirement: Union[JobRequirement, CompiledJobProfile]) -> Dict:
         """
         Main scoring function that evaluates resume against job requirements
         
         Args:
             resume_data: Parsed resume data
-            job_requirement: Job requirements posted by recruiter
+            job_requirement: Job requirements posted by recruiter, or their compiled
+                profile (see job_profiles.get_job_profile)
             
         Returns:
             Dictionary containing detailed scoring breakdown
         """
+        profile = self._get_profile(job_requirement)
+        job_requirement = profile.requirement
+        features = self._get_features(resume_data)
+        
+        key = None
+        if self.memo is not None:
+            key = memo_key(features['fingerprint'], profile.requirements_hash, SCORING_VERSION)
+            cached = self.memo.get(key)
+            if cached is not None:
+                return cached
+        
         # Calculate individual scores
         skill_score, matched_skills, missing_skills = self._calculate_skill_score(
-            resume_data.skills, job_requirement.required_skills, job_requirement.preferred_skills
+            features['skills'], job_requirement.required_skills, job_requirement.preferred_skills,
+            profile.skill_matcher
         )
         
         education_score = self._calculate_education_score(
-            resume_data.education, job_requirement.education_level
+            resume_data.education, job_requirement.education_level, features['education_rank']
         )
         
         experience_score = self._calculate_experience_score(
-            resume_data.experience, resume_data.raw_text, job_requirement.years_of_experience
+            resume_data.experience, resume_data.raw_text, job_requirement.years_of_experience,
+            features['max_years']
         )
         
         keyword_score, matched_keywords = self._calculate_keyword_score(
-            resume_data.raw_text, job_requirement.keywords, job_requirement.job_description
+            resume_data.raw_text, job_requirement.keywords, job_requirement.job_description,
+            set(features['tokens']), profile.jd_keywords
         )
         
-        format_score, format_issues = self._calculate_format_score(resume_data)
+        format_score, format_issues = self._calculate_format_score(resume_data, features)
+        
+        result = self._build_result(
+            skill_score, matched_skills, missing_skills,
+            education_score, experience_score,
+            keyword_score, matched_keywords,
+            format_score, format_issues,
+            job_requirement, profile.weights
+        )
+        if key is not None:
+            self.memo.put(key, result)
+        return result
+    
+    def rank_resumes(self, resumes: Iterable[Tuple[Any, ResumeData]],
+                     job_requirement: Union[JobRequirement, CompiledJobProfile],
+                     top_k: int = 10, progress_every: int = 0) -> Iterator[Dict]:
+        """
+        Rank many resumes against one job requirement, keeping only the top K.
+        
+        Components are scored cheapest first (format, education, experience, then skills
+        and keywords). Before each expensive component the best total the resume could
+        still reach (remaining components at 100) is compared with the current K-th best
+        score, and resumes that cannot beat it are pruned without being fully scored.
+        A resume that raises while being scored is counted as failed and skipped.
         
+        Args:
+            resumes: Iterable of (key, ResumeData) pairs
+            job_requirement: Job requirement (or its compiled profile) every resume is scored against
+            top_k: Number of best results to keep
+            progress_every: If > 0, also yield a partial ranking every N resumes
+            
+        Yields:
+            Ranking snapshots: {'processed', 'scored', 'pruned', 'failed', 'errors', 'done',
+            'ranking'} where errors lists the first failures as {'key', 'error'} and ranking is
+            a best-first list of {'key', 'ats_score', 'result'}
+        """
+        profile = self._get_profile(job_requirement)
+        job_requirement = profile.requirement
+        weights = profile.weights
+        heap: List[Tuple[float, int, Any, Dict]] = []  # min-heap of (total, -seq, key, result)
+        processed = scored = pruned = failed = 0
+        errors: List[Dict] = []
+        
+        def snapshot(done: bool) -> Dict:
+            ranking = sorted(heap, key=lambda item: (item[0], item[1]), reverse=True)
+            return {
+                'processed': processed,
+                'scored': scored,
+                'pruned': pruned,
+                'failed': failed,
+                'errors': list(errors),
+                'done': done,
+                'ranking': [
+                    {'key': key, 'ats_score': result['ats_score'], 'result': result}
+                    for _, _, key, result in ranking
+                ]
+            }
+        
+        def cannot_beat(bound: float) -> bool:
+            # Ties keep the earlier resume, so reaching the K-th score exactly is not enough
+            return len(heap) >= top_k and bound <= heap[0][0] + 1e-9
+        
+        def consider(seq: int, key: Any, resume_data: ResumeData) -> None:
+            nonlocal scored, pruned
+            features = self._get_features(resume_data)
+            format_score, format_issues = self._calculate_format_score(resume_data, features)
+            education_score = self._calculate_education_score(
+                resume_data.education, job_requirement.education_level, features['education_rank']
+            )
+            experience_score = self._calculate_experience_score(
+                resume_data.experience, resume_data.raw_text, job_requirement.years_of_experience,
+                features['max_years']
+            )
+            partial = (
+                format_score * weights['format'] +
+                education_score * weights['education'] +
+                experience_score * weights['experience']
+            )
+
+            if cannot_beat(partial + 100.0 * (weights['skill'] + weights['keyword'])):
+                pruned += 1
+            else:
+                skill_score, matched_skills, missing_skills = self._calculate_skill_score(
+                    features['skills'], job_requirement.required_skills, job_requirement.preferred_skills,
+                    profile.skill_matcher
+                )
+                if cannot_beat(partial + skill_score * weights['skill'] + 100.0 * weights['keyword']):
+                    pruned += 1
+                else:
+                    keyword_score, matched_keywords = self._calculate_keyword_score(
+                        resume_data.raw_text, job_requirement.keywords, job_requirement.job_description,
+                        set(features['tokens']), profile.jd_keywords
+                    )
+                    total = self._calculate_total_score(
+                        skill_score, education_score, experience_score, keyword_score, format_score,
+                        job_requirement, weights
+                    )
+                    result = self._build_result(
+                        skill_score, matched_skills, missing_skills,
+                        education_score, experience_score,
+                        keyword_score, matched_keywords,
+                        format_score, format_issues,
+                        job_requirement, weights
+                    )
+                    scored += 1
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, (total, -seq, key, result))
+                    elif total > heap[0][0]:
+                        heapq.heapreplace(heap, (total, -seq, key, result))
+        
+        for seq, (key, resume_data) in enumerate(resumes):
+            processed += 1
+            if top_k > 0:
+                try:
+                    consider(seq, key, resume_data)
+                except Exception as e:
+                    # One malformed resume is reported, not fatal to the whole ranking
+                    failed += 1
+                    if len(errors) < MAX_RANKING_ERRORS:
+                        errors.append({'key': key, 'error': str(e)})
+            
+            if progress_every > 0 and processed % progress_every == 0:
+                yield snapshot(done=False)
+        
+        yield snapshot(done=True)
+    
+    def _get_profile(self, job_requirement: Union[JobRequirement, CompiledJobProfile]) -> CompiledJobProfile:
+        """Compiled profile for the requirement (cached by content when not already compiled)"""
+        if isinstance(job_requirement, CompiledJobProfile):
+            return job_requirement
+        return get_requirement_profile(job_requirement)
+    
+    def _get_features(self, resume_data: ResumeData) -> Dict:
+        """Stored feature record of the resume, recomputed (and cached on it) if missing or stale"""
+        features = resume_data.features
+        if not features_are_current(features):
+            features = compute_resume_features(resume_data)
+            resume_data.features = features
+        return features
+    
+    def _build_result(self, skill_score: float, matched_skills: List[str], missing_skills: List[str],
+                      education_score: float, experience_score: float,
+                      keyword_score: float, matched_keywords: List[str],
+                      format_score: float, format_issues: List[str],
+                      job_requirement: JobRequirement, weights: Optional[Dict[str, float]] = None) -> Dict:
+        """Combine component scores into the scoring breakdown returned to callers"""
         # Calculate weighted total ATS score
         total_score = self._calculate_total_score(
             skill_score, education_score, experience_score, keyword_score, format_score,
-            job_requirement
+            job_requirement, weights
         )
         
         # Determine if passed
@@ -74,45 +250,42 @@ class ATSEngine:
         }
     
     def _calculate_skill_score(self, resume_skills: List[str], required_skills: List[str], 
-                               preferred_skills: List[str]) -> Tuple[float, List[str], List[str]]:
+                               preferred_skills: List[str],
+                               matcher: Optional[CompiledSkillMatcher] = None) -> Tuple[float, List[str], List[str]]:
         """Calculate score based on skill matching"""
         if not required_skills and not preferred_skills:
             return 100.0, [], []
         
-        resume_skills_lower = [skill.lower().strip() for skill in resume_skills]
-        required_skills_lower = [skill.lower().strip() for skill in required_skills]
-        preferred_skills_lower = [skill.lower().strip() for skill in preferred_skills]
+        # Normalized forms and trigram index are compiled once per job requirement
+        if matcher is None:
+            matcher = get_skill_matcher(
+                tuple(required_skills), tuple(preferred_skills), self.skill_similarity_threshold
+            )
+        required_flags, preferred_flags = matcher.match(resume_skills)
+        required_skills_lower = matcher.required
+        preferred_skills_lower = matcher.preferred
         
         matched_skills = []
         missing_skills = []
         
         # Check required skills (critical - 70% weight)
         required_matches = 0
-        for req_skill in required_skills_lower:
-            matched = False
-            for res_skill in resume_skills_lower:
-                similarity = SequenceMatcher(None, req_skill, res_skill).ratio()
-                if similarity >= self.skill_similarity_threshold or req_skill in res_skill or res_skill in req_skill:
-                    matched_skills.append(req_skill.title())
-                    matched = True
-                    break
-            if not matched:
-                missing_skills.append(req_skill.title())
-            else:
+        for req_skill, matched in zip(required_skills_lower, required_flags):
+            if matched:
+                matched_skills.append(req_skill.title())
                 required_matches += 1
+            else:
+                missing_skills.append(req_skill.title())
         
         required_score = (required_matches / len(required_skills_lower) * 100) if required_skills_lower else 50
         
         # Check preferred skills (bonus - 30% weight)
         preferred_matches = 0
-        for pref_skill in preferred_skills_lower:
-            for res_skill in resume_skills_lower:
-                similarity = SequenceMatcher(None, pref_skill, res_skill).ratio()
-                if similarity >= self.skill_similarity_threshold or pref_skill in res_skill or res_skill in pref_skill:
-                    if pref_skill.title() not in matched_skills:
-                        matched_skills.append(pref_skill.title())
-                    preferred_matches += 1
-                    break
+        for pref_skill, matched in zip(preferred_skills_lower, preferred_flags):
+            if matched:
+                if pref_skill.title() not in matched_skills:
+                    matched_skills.append(pref_skill.title())
+                preferred_matches += 1
         
         preferred_score = (preferred_matches / len(preferred_skills_lower) * 100) if preferred_skills_lower else 50
         
@@ -128,24 +301,16 @@ class ATSEngine:
         
         return total_score, matched_skills, missing_skills
     
-    def _calculate_education_score(self, resume_education: List[Dict], required_education: str) -> float:
+    def _calculate_education_score(self, resume_education: List[Dict], required_education: str,
+                                   resume_level: Optional[int] = None) -> float:
         """Calculate score based on education level matching"""
         if not required_education:
             return 100.0
         
         required_edu_lower = required_education.lower()
-        resume_text = ' '.join([str(edu) for edu in resume_education]).lower()
-        
-        # Education hierarchy
-        education_hierarchy = {
-            'phd': 5, 'doctorate': 5,
-            'master': 4, 'm.sc': 4, 'm.tech': 4, 'mba': 4, 'm.e': 4,
-            'bachelor': 3, 'b.sc': 3, 'b.tech': 3, 'b.e': 3, 'b.a': 3,
-            'diploma': 2, 'certificate': 1
-        }
         
         required_level = 0
-        for key, level in education_hierarchy.items():
+        for key, level in EDUCATION_HIERARCHY.items():
             if key in required_edu_lower:
                 required_level = level
                 break
@@ -153,10 +318,12 @@ class ATSEngine:
         if required_level == 0:
             return 100.0  # Can't determine, give benefit of doubt
         
-        resume_level = 0
-        for key, level in education_hierarchy.items():
-            if key in resume_text:
-                resume_level = max(resume_level, level)
+        if resume_level is None:
+            resume_text = ' '.join([str(edu) for edu in resume_education]).lower()
+            resume_level = 0
+            for key, level in EDUCATION_HIERARCHY.items():
+                if key in resume_text:
+                    resume_level = max(resume_level, level)
         
         if resume_level >= required_level:
             return 100.0
@@ -166,34 +333,34 @@ class ATSEngine:
             return 30.0  # Much below requirement
     
     def _calculate_experience_score(self, resume_experience: List[Dict], resume_text: str, 
-                                    required_years: int) -> float:
+                                    required_years: int, total_years: Optional[float] = None) -> float:
         """Calculate score based on years of experience"""
         if not required_years or required_years == 0:
             return 100.0
         
-        # Extract years from experience text
-        year_pattern = r'(\d+\.?\d*)\s*(?:years?|yrs?|year)'
-        matches = re.findall(year_pattern, resume_text, re.IGNORECASE)
-        
-        total_years = 0
-        for match in matches:
-            try:
-                years = float(match)
-                total_years = max(total_years, years)
-            except:
-                continue
-        
-        # Also check experience list
-        for exp in resume_experience:
-            if exp.get('duration'):
-                duration_text = str(exp['duration'])
-                matches = re.findall(year_pattern, duration_text, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        years = float(match)
-                        total_years = max(total_years, years)
-                    except:
-                        continue
+        if total_years is None:
+            # Extract years from experience text
+            matches = YEARS_PATTERN.findall(resume_text)
+            
+            total_years = 0
+            for match in matches:
+                try:
+                    years = float(match)
+                    total_years = max(total_years, years)
+                except:
+                    continue
+            
+            # Also check experience list
+            for exp in resume_experience:
+                if exp.get('duration'):
+                    duration_text = str(exp['duration'])
+                    matches = YEARS_PATTERN.findall(duration_text)
+                    for match in matches:
+                        try:
+                            years = float(match)
+                            total_years = max(total_years, years)
+                        except:
+                            continue
         
         if total_years >= required_years:
             return 100.0
@@ -207,36 +374,31 @@ class ATSEngine:
             return 10.0  # No experience found
     
     def _calculate_keyword_score(self, resume_text: str, keywords: List[str], 
-                                 job_description: str) -> Tuple[float, List[str]]:
+                                 job_description: str, resume_tokens: Optional[Set[str]] = None,
+                                 jd_keywords: Optional[List[str]] = None) -> Tuple[float, List[str]]:
         """Calculate score based on keyword matching"""
-        resume_text_lower = resume_text.lower()
+        # Top 20 job description keywords (precomputed in the job profile when available)
+        unique_job_keywords = jd_keywords if jd_keywords is not None else extract_jd_keywords(job_description)
+        
+        # One substring scan for explicit and job description keywords; whole-token
+        # hits from the resume's feature record skip the text scan
+        scanner = get_keyword_scanner(tuple(keywords) + tuple(unique_job_keywords), whole_words=False)
+        found = scanner.find(resume_text, resume_tokens)
+        
         matched_keywords = []
         
         # Check explicit keywords
         keyword_matches = 0
         for keyword in keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in resume_text_lower:
+            if keyword in found:
                 matched_keywords.append(keyword)
                 keyword_matches += 1
         
         explicit_score = (keyword_matches / len(keywords) * 100) if keywords else 50
         
-        # Extract keywords from job description if provided
+        # Keywords extracted from the job description
         if job_description:
-            # Simple keyword extraction (can be enhanced with NLP)
-            job_keywords = re.findall(r'\b[a-z]{4,}\b', job_description.lower())
-            common_words = {'the', 'and', 'or', 'but', 'with', 'from', 'this', 'that', 
-                          'will', 'would', 'should', 'could', 'must', 'have', 'has', 
-                          'been', 'were', 'was', 'they', 'their', 'them', 'these', 'those'}
-            job_keywords = [kw for kw in job_keywords if kw not in common_words and len(kw) > 4]
-            
-            job_keyword_matches = 0
-            unique_job_keywords = list(set(job_keywords))[:20]  # Top 20 unique keywords
-            for keyword in unique_job_keywords:
-                if keyword in resume_text_lower:
-                    job_keyword_matches += 1
-            
+            job_keyword_matches = sum(1 for keyword in unique_job_keywords if keyword in found)
             job_desc_score = (job_keyword_matches / len(unique_job_keywords) * 100) if unique_job_keywords else 50
         else:
             job_desc_score = 50
@@ -253,38 +415,41 @@ class ATSEngine:
         
         return total_score, matched_keywords
     
-    def _calculate_format_score(self, resume_data: ResumeData) -> Tuple[float, List[str]]:
+    def _calculate_format_score(self, resume_data: ResumeData,
+                                features: Optional[Dict] = None) -> Tuple[float, List[str]]:
         """Calculate score based on resume format and structure"""
+        if features is None:
+            features = compute_resume_features(resume_data)
         score = 100.0
         issues = []
         
         # Check for essential sections
-        if not resume_data.name:
+        if not features['has_name']:
             score -= 10
             issues.append("Missing name")
         
-        if not resume_data.email:
+        if not features['has_email']:
             score -= 15
             issues.append("Missing email address")
         
-        if not resume_data.phone:
+        if not features['has_phone']:
             score -= 10
             issues.append("Missing phone number")
         
-        if len(resume_data.skills) < 3:
+        if features['skill_count'] < 3:
             score -= 10
             issues.append("Insufficient skills listed (less than 3)")
         
-        if not resume_data.education:
+        if not features['has_education']:
             score -= 15
             issues.append("Missing education information")
         
-        if not resume_data.experience and len(resume_data.raw_text) < 500:
+        text_length = features['text_length']
+        if not features['has_experience'] and text_length < 500:
             score -= 10
             issues.append("Limited experience or content")
         
         # Check resume length (should be substantial but not too long)
-        text_length = len(resume_data.raw_text)
         if text_length < 200:
             score -= 15
             issues.append("Resume too short (less than 200 characters)")
@@ -293,7 +458,7 @@ class ATSEngine:
             issues.append("Resume very long (may need trimming)")
         
         # Check for proper structure
-        if not any(keyword in resume_data.raw_text.lower() for keyword in ['education', 'experience', 'skill']):
+        if not features['has_standard_sections']:
             score -= 10
             issues.append("Missing standard resume sections")
         
@@ -301,33 +466,11 @@ class ATSEngine:
     
     def _calculate_total_score(self, skill_score: float, education_score: float, 
                                experience_score: float, keyword_score: float, 
-                               format_score: float, job_requirement: JobRequirement) -> float:
+                               format_score: float, job_requirement: JobRequirement,
+                               weights: Optional[Dict[str, float]] = None) -> float:
         """Calculate weighted total ATS score"""
-        # Weight distribution (can be adjusted based on job requirements)
-        weights = {
-            'skill': 0.40,      # Skills are most important
-            'keyword': 0.25,    # Keyword matching is important for ATS
-            'experience': 0.20, # Experience matters
-            'education': 0.10,  # Education has some weight
-            'format': 0.05      # Format is important but not critical
-        }
-        
-        # Adjust weights if certain requirements are not specified
-        if not job_requirement.required_skills and not job_requirement.preferred_skills:
-            # If no skills specified, reduce skill weight
-            weights['skill'] = 0.20
-            weights['keyword'] += 0.10
-            weights['experience'] += 0.10
-        
-        if not job_requirement.years_of_experience:
-            weights['experience'] = 0.10
-            weights['skill'] += 0.05
-            weights['keyword'] += 0.05
-        
-        if not job_requirement.education_level:
-            weights['education'] = 0.05
-            weights['skill'] += 0.025
-            weights['keyword'] += 0.025
+        if weights is None:
+            weights = self._get_weights(job_requirement)
         
         # Calculate weighted total
         total = (
@@ -339,5 +482,7 @@ class ATSEngine:
         )
         
         return total
-
-
+    
+    def _get_weights(self, job_requirement: JobRequirement) -> Dict[str, float]:
+        """Component weights, adjusted for requirements the recruiter left unspecified"""
+        return effective_weights(job_requirement)
@@ -0,0 +1,126 @@
+"""
+ATS Memo Module
+Content-addressed memoization of ATS scoring results.
+
+A result is fully determined by the resume fingerprint (resume_features), the job
+requirements hash (job_profiles) and the scoring code version, so re-scoring the same
+resume against an unchanged job is a cache lookup. Lookups go to an in-process LRU
+first, then to the optional MongoDB `ats_memo` collection (expired by a TTL index).
+The Mongo tier is attached by the API process at startup; worker processes use the
+in-process tier only.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import ATS_MEMO_CACHE_SIZE, ATS_MEMO_TTL_SECONDS
+
+
+def memo_key(resume_fingerprint: str, requirements_digest: str, scoring_version: int) -> str:
+    return f"{scoring_version}:{requirements_digest}:{resume_fingerprint}"
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    # Callers may append to the lists of a returned result; never share them with the cache
+    return {key: list(value) if isinstance(value, list) else value for key, value in result.items()}
+
+
+class ATSResultMemo:
+    """In-process LRU in front of an optional MongoDB collection"""
+
+    def __init__(self, max_entries: int = ATS_MEMO_CACHE_SIZE, ttl_seconds: int = ATS_MEMO_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._store = None
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.store_errors = 0
+
+    def attach_store(self, collection) -> None:
+        """Use a MongoDB collection as the shared tier (creates the TTL index)."""
+        collection.create_index("created_at", expireAfterSeconds=self.ttl_seconds)
+        self._store = collection
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return _copy_result(result)
+
+        if self._store is not None:
+            try:
+                doc = self._store.find_one({"_id": key}, {"result": 1})
+            except Exception:
+                doc = None
+                with self._lock:
+                    self.store_errors += 1
+            if doc is not None:
+                self._remember(key, doc["result"])
+                with self._lock:
+                    self.store_hits += 1
+                return _copy_result(doc["result"])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        self._remember(key, _copy_result(result))
+        if self._store is not None:
+            try:
+                self._store.replace_one(
+                    {"_id": key},
+                    {"_id": key, "result": result, "created_at": datetime.utcnow()},
+                    upsert=True
+                )
+            except Exception:
+                # Best effort: the in-process tier still has the result
+                with self._lock:
+                    self.store_errors += 1
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the Mongo tier expires on its own)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.store_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "store_attached": self._store is not None,
+                "memory_hits": self.memory_hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "store_errors": self.store_errors,
+                "hit_rate": round((self.memory_hits + self.store_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_memo: Optional[ATSResultMemo] = None
+_memo_lock = threading.Lock()
+
+
+def get_ats_memo() -> ATSResultMemo:
+    """Process-wide ATS result memo."""
+    global _memo
+    if _memo is None:
+        with _memo_lock:
+            if _memo is None:
+                _memo = ATSResultMemo()
+    return _memo
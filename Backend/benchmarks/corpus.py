@@ -0,0 +1,163 @@
+"""
+Synthetic benchmark corpus
+Deterministic resumes, job requirements and student queries for the offline benchmarks.
+
+The same (size, seed) always produces the same corpus, independently of the skill
+dictionaries in the code under test, so timings stay comparable across commits.
+"""
+
+import random
+from typing import Any, Dict, List
+
+
+FIRST_NAMES = [
+    "Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rahul", "Isha",
+    "Karan", "Meera", "Nikhil", "Pooja", "Siddharth", "Divya", "Aditya", "Neha", "Varun", "Riya",
+]
+LAST_NAMES = [
+    "Sharma", "Patel", "Reddy", "Iyer", "Gupta", "Nair", "Singh", "Kumar", "Mehta", "Joshi",
+    "Rao", "Das", "Shah", "Menon", "Verma", "Bose", "Kapoor", "Pillai", "Chopra", "Desai",
+]
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "Go", "SQL", "React", "Angular",
+    "Node.js", "Django", "Flask", "FastAPI", "Spring Boot", "Docker", "Kubernetes", "AWS",
+    "Azure", "GCP", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Kafka", "Spark", "Pandas",
+    "NumPy", "TensorFlow", "PyTorch", "Scikit-learn", "Machine Learning", "Deep Learning",
+    "NLP", "Git", "Linux", "REST API", "GraphQL", "HTML", "CSS", "Tableau", "Power BI",
+    "Excel", "Jenkins", "Terraform", "Airflow", "Hadoop", "Agile", "Figma",
+]
+ROLES = [
+    ("Backend Developer", "backend services and APIs"),
+    ("Frontend Developer", "web interfaces and design systems"),
+    ("Data Engineer", "batch and streaming data pipelines"),
+    ("Data Analyst", "dashboards and business reporting"),
+    ("Machine Learning Engineer", "model training and deployment"),
+    ("DevOps Engineer", "cloud infrastructure and CI/CD"),
+    ("Full Stack Developer", "end-to-end product features"),
+    ("Software Engineer", "core platform components"),
+]
+DEGREES = [
+    ("B.Tech in Computer Science", "Bachelor's"),
+    ("B.E in Information Technology", "Bachelor's"),
+    ("B.Sc in Mathematics", "Bachelor's"),
+    ("M.Tech in Data Science", "Master's"),
+    ("M.Sc in Computer Science", "Master's"),
+    ("Diploma in Computer Engineering", "Diploma"),
+]
+INSTITUTIONS = [
+    "National Institute of Technology", "Anna University", "Delhi Technological University",
+    "Manipal Institute", "Pune University", "Vellore Institute",
+]
+VERBS = ["Built", "Designed", "Implemented", "Optimized", "Maintained", "Migrated", "Automated", "Led"]
+OBJECTS = [
+    "a payment reconciliation service", "an internal analytics dashboard",
+    "a recommendation pipeline", "the campus placement portal", "a real-time chat module",
+    "CI pipelines for three teams", "a document search API", "an inventory forecasting model",
+]
+OUTCOMES = [
+    "reducing latency by 40%", "serving 2 million requests per day", "cutting costs by 25%",
+    "improving test coverage to 85%", "used by 5000 students", "with zero downtime",
+]
+QUERY_TEMPLATES = [
+    "I want a {role} role using {skill}",
+    "looking for {role} internship with {skill} and {skill2}",
+    "entry level {role} jobs where I can work on {focus}",
+    "{skill} developer position",
+]
+
+
+def _resume_text(rng: random.Random, index: int) -> str:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    role, focus = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, rng.randint(4, 12))
+    degree, _ = rng.choice(DEGREES)
+    years = rng.randint(0, 8)
+    bullets = [
+        f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}, {rng.choice(OUTCOMES)}."
+        for _ in range(rng.randint(3, 8))
+    ]
+    projects = [
+        f"- {rng.choice(OBJECTS).capitalize()} with {' and '.join(rng.sample(skills, 2))}"
+        for _ in range(rng.randint(1, 3))
+    ]
+    return "\n".join([
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}{index}@example.com",
+        f"Phone: +91 98{rng.randint(10000000, 99999999)}",
+        "",
+        f"Summary: {role} with {years} years of experience in {focus}.",
+        "",
+        f"Skills: {', '.join(skills)}",
+        "",
+        f"Education: {degree}, {rng.choice(INSTITUTIONS)}, {rng.randint(2012, 2024)}",
+        "",
+        f"Experience: {role} at Company{rng.randint(1, 500)} ({years} years)",
+        *bullets,
+        "",
+        "Projects:",
+        *projects,
+        "",
+        f"Certifications: {rng.choice(['AWS Certified Developer', 'Google Data Analytics', 'None'])}",
+    ])
+
+
+def _job(rng: random.Random, index: int) -> Dict[str, Any]:
+    role, focus = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, rng.randint(4, 9))
+    split = rng.randint(2, len(skills) - 1)
+    required, preferred = skills[:split], skills[split:]
+    _, education_level = rng.choice(DEGREES)
+    description = (
+        f"We are hiring a {role} to work on {focus}. You will collaborate with product, "
+        f"design and data teams, own services end to end and mentor juniors. "
+        f"Required: {', '.join(required)}. Nice to have: {', '.join(preferred) or 'curiosity'}. "
+        f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}."
+    )
+    return {
+        "id": index + 1,
+        "title": role,
+        "description": description,
+        "requirements": {
+            "job_title": role,
+            "required_skills": required,
+            "preferred_skills": preferred,
+            "education_level": rng.choice([education_level, None]),
+            "years_of_experience": rng.choice([None, 0, 1, 2, 3, 5]),
+            "job_description": description,
+            "keywords": [word for word in focus.split() if len(word) > 3],
+            "minimum_ats_score": rng.choice([50.0, 60.0, 70.0]),
+        },
+    }
+
+
+def _query(rng: random.Random) -> Dict[str, Any]:
+    role, focus = rng.choice(ROLES)
+    skill, skill2 = rng.sample(SKILLS, 2)
+    return {
+        "query": rng.choice(QUERY_TEMPLATES).format(role=role.lower(), skill=skill, skill2=skill2, focus=focus),
+        "skills": rng.sample(SKILLS, rng.randint(2, 8)),
+    }
+
+
+def generate_corpus(resumes: int = 1000, jobs: int = 50, queries: int = 50, seed: int = 42) -> Dict[str, List]:
+    """
+    Build a deterministic corpus.
+
+    Args:
+        resumes: Number of resume texts
+        jobs: Number of jobs (dicts shaped like the jobs router output, with `requirements`)
+        queries: Number of student search queries (`query` plus the student's `skills`)
+        seed: Random seed; the same arguments always produce the same corpus
+
+    Returns:
+        Dictionary with 'resumes', 'jobs' and 'queries' lists
+    """
+    # Separate streams so changing one count does not reshuffle the other collections
+    resume_rng = random.Random(f"{seed}:resumes")
+    job_rng = random.Random(f"{seed}:jobs")
+    query_rng = random.Random(f"{seed}:queries")
+    return {
+        "resumes": [_resume_text(resume_rng, i) for i in range(resumes)],
+        "jobs": [_job(job_rng, i) for i in range(jobs)],
+        "queries": [_query(query_rng) for _ in range(queries)],
+    }
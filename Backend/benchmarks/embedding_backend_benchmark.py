@@ -0,0 +1,85 @@
+"""
+Embedding backend benchmark
+Run with: python benchmarks/embedding_backend_benchmark.py [--texts 256] [--batch-sizes 1,8,32]
+          [--repeat 3]
+
+Encode throughput of the two LocalEmbedder inference backends (model_registry.py): "torch"
+(full-precision PyTorch) and "onnx-int8" (the int8 ONNX export from
+`python quantize_embedder.py export`, run by ONNX Runtime). Job descriptions and student
+queries from the synthetic corpus are encoded at each batch size, best of --repeat runs;
+batch size 1 is the per-request path, larger sizes what the micro-batcher and reindexing
+send. A backend that cannot be loaded offline is skipped with the reason.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Never reach out to the Hugging Face hub from a benchmark run
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from model_registry import (  # noqa: E402
+    DEFAULT_SENTENCE_MODEL,
+    EMBEDDING_BACKENDS,
+    lease_sentence_transformer,
+)
+
+
+def texts_per_second(model, texts, batch_size: int, repeat: int) -> float:
+    """Best throughput over `repeat` runs of encoding `texts` in chunks of `batch_size`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(0, len(texts), batch_size):
+            model.encode(texts[i:i + batch_size], normalize_embeddings=True, batch_size=batch_size)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=DEFAULT_SENTENCE_MODEL)
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-sizes", default="1,8,32")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    corpus = generate_corpus(resumes=0, jobs=args.texts // 2, queries=args.texts - args.texts // 2, seed=args.seed)
+    texts = [job["description"] for job in corpus["jobs"]] + [query["query"] for query in corpus["queries"]]
+
+    results = {}
+    for backend in EMBEDDING_BACKENDS:
+        started = time.perf_counter()
+        try:
+            lease = lease_sentence_transformer(args.model, backend)
+        except Exception as e:
+            print(f"{backend:<10} skipped: {e}")
+            continue
+        load_seconds = time.perf_counter() - started
+        with lease as model:
+            model.encode(texts[:8], normalize_embeddings=True)  # warm-up
+            results[backend] = [texts_per_second(model, texts, size, args.repeat) for size in batch_sizes]
+        print(f"{backend:<10} loaded in {load_seconds:.1f}s")
+
+    if not results:
+        return 1
+    print(f"\n{len(texts)} texts, best of {args.repeat} runs (texts/s)\n")
+    print(f"{'backend':<10} " + " ".join(f"{'batch ' + str(size):>10}" for size in batch_sizes))
+    for backend, rates in results.items():
+        print(f"{backend:<10} " + " ".join(f"{rate:>10.1f}" for rate in rates))
+    if len(results) == len(EMBEDDING_BACKENDS):
+        torch_rates, int8_rates = results[EMBEDDING_BACKENDS[0]], results[EMBEDDING_BACKENDS[1]]
+        print(f"{'speedup':<10} " + " ".join(f"{b / a:>9.2f}x" for a, b in zip(torch_rates, int8_rates)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Embedding micro-batching benchmark
+Run with: python benchmarks/embedding_batch_benchmark.py [--clients 16] [--requests 20]
+          [--batch-size 32] [--wait-ms 5]
+
+Simulates concurrent callers of the shared embedder (student searches, job indexing):
+--clients threads each embed --requests texts from the synthetic corpus, one at a time.
+Runs them once against LocalEmbedder.embed_text directly (one encode per text, as the
+routers did before vector/batcher.py) and once through EmbeddingBatcher, and reports
+per-call latency, total throughput and the batch sizes the batcher actually formed.
+
+Needs sentence-transformers and the embedding model available locally (HF_HUB_OFFLINE).
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Callable, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Never reach out to the Hugging Face hub from a benchmark run
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from benchmarks.run_benchmarks import summarize  # noqa: E402
+from vector.batcher import EmbeddingBatcher  # noqa: E402
+
+
+def run_clients(embed: Callable[[str], List[float]], texts_per_client: List[List[str]]):
+    """Run one thread per client, each embedding its texts sequentially; returns a summary."""
+    samples: List[float] = []
+    lock = threading.Lock()
+    start_gate = threading.Barrier(len(texts_per_client) + 1)
+
+    def client(texts: List[str]) -> None:
+        timings = []
+        start_gate.wait()
+        for text in texts:
+            started = time.perf_counter()
+            embed(text)
+            timings.append(time.perf_counter() - started)
+        with lock:
+            samples.extend(timings)
+
+    threads = [threading.Thread(target=client, args=(texts,)) for texts in texts_per_client]
+    for thread in threads:
+        thread.start()
+    start_gate.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=16, help="concurrent callers")
+    parser.add_argument("--requests", type=int, default=20, help="texts embedded by each caller")
+    parser.add_argument("--batch-size", type=int, default=32, help="EmbeddingBatcher max_batch_size")
+    parser.add_argument("--wait-ms", type=float, default=5.0, help="EmbeddingBatcher max_wait_ms")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    try:
+        from vector.embedder import LocalEmbedder
+        embedder = LocalEmbedder()
+    except Exception as e:
+        print(f"Embedding model not available offline: {e}")
+        return 1
+
+    # Search queries and job texts, like the traffic hitting the embedder in production
+    corpus = generate_corpus(resumes=0, jobs=50, queries=50, seed=args.seed)
+    pool = [query["query"] for query in corpus["queries"]] + [job["description"] for job in corpus["jobs"]]
+    texts_per_client = [
+        [pool[(client * args.requests + i) % len(pool)] for i in range(args.requests)]
+        for client in range(args.clients)
+    ]
+    embedder.embed_batch(pool[:8])  # warm-up
+
+    batcher = EmbeddingBatcher(embedder, max_batch_size=args.batch_size, max_wait_ms=args.wait_ms)
+    results = {
+        "unbatched": run_clients(embedder.embed_text, texts_per_client),
+        "batched": run_clients(batcher.embed_text, texts_per_client),
+    }
+    stats = batcher.stats()
+    batcher.close()
+
+    print(f"{args.clients} clients x {args.requests} texts "
+          f"(batcher: max {args.batch_size} texts, {args.wait_ms:g} ms window)\n")
+    print(f"{'path':<10} {'texts':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'texts/s':>10}")
+    for name, summary in results.items():
+        print(f"{name:<10} {summary['count']:>7} {summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} "
+              f"{summary['p99_ms']:>9.2f} {summary['throughput_per_s']:>10.1f}")
+    speedup = results["batched"]["throughput_per_s"] / results["unbatched"]["throughput_per_s"]
+    print(f"\nthroughput {speedup:.2f}x; {stats['batches']} batches, mean {stats['mean_batch_size']} "
+          f"texts (largest {stats['largest_batch']}), mean queueing {stats['mean_wait_ms']} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
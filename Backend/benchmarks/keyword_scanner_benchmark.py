@@ -0,0 +1,114 @@
+"""
+Keyword scanner benchmark
+Run with: python benchmarks/keyword_scanner_benchmark.py [--resumes 200] [--repeat 5]
+
+Compares per-resume keyword extraction cost of the compiled KeywordScanner against
+the per-keyword loops it replaced:
+- JD analyzer skills: one \\b...\\b regex per SKILL_CATEGORIES entry vs whole-word scan
+- resume parser skills: `skill in text` per skill vs substring scanner
+- large dictionary (500 terms): `in` per keyword vs the character-level automaton
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, "JD-Resume-Analyzer"))
+
+import skill_analyzer  # noqa: E402  (JD-Resume-Analyzer)
+from keyword_scanner import KeywordScanner  # noqa: E402
+from resume_parser import ResumeParser  # noqa: E402
+
+
+FILLER = (
+    "experience developed designed implemented team project management data system "
+    "services built university bachelor led improved performance customers reporting"
+).split()
+
+
+def make_resumes(count: int, seed: int = 7):
+    """Synthetic resumes of ~500 words mixing dictionary skills with filler text"""
+    rng = random.Random(seed)
+    skills = list(skill_analyzer.ALL_SKILLS)
+    resumes = []
+    for _ in range(count):
+        words = [rng.choice(skills) if rng.random() < 0.1 else rng.choice(FILLER) for _ in range(500)]
+        lines = [" ".join(words[i:i + 12]) + rng.choice([".", ",", ""]) for i in range(0, len(words), 12)]
+        resumes.append("\n".join(lines))
+    return resumes
+
+
+def legacy_jd_skills(text):
+    normalized_text = skill_analyzer.normalize_text(text)
+    found_skills = set()
+    for skills in skill_analyzer.SKILL_CATEGORIES.values():
+        for skill in skills:
+            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
+            if re.search(pattern, normalized_text, re.IGNORECASE):
+                found_skills.add(skill.lower())
+    return found_skills
+
+
+def legacy_substring(keywords, text):
+    text_lower = text.lower()
+    return {keyword for keyword in keywords if keyword.lower() in text_lower}
+
+
+def per_resume_us(fn, resumes, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in resumes:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(resumes) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    resumes = make_resumes(args.resumes)
+
+    parser_skills = [skill for skills in ResumeParser().skill_keywords.values() for skill in skills]
+    rng = random.Random(11)
+    large_dictionary = list(dict.fromkeys(
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9)))
+        for _ in range(500)
+    )) + list(skill_analyzer.ALL_SKILLS)
+
+    jd_scanner = KeywordScanner(skill_analyzer.ALL_SKILLS, whole_words=True)
+    parser_scanner = KeywordScanner(parser_skills, whole_words=False)
+    large_scanner = KeywordScanner(large_dictionary, whole_words=False)
+
+    cases = [
+        ("JD analyzer skills (%d, whole words)" % len(skill_analyzer.ALL_SKILLS),
+         legacy_jd_skills,
+         lambda text: jd_scanner.find(skill_analyzer.normalize_text(text))),
+        ("Parser skills (%d, substring)" % len(parser_skills),
+         lambda text: legacy_substring(parser_skills, text),
+         parser_scanner.find),
+        ("Large dictionary (%d, substring)" % len(large_dictionary),
+         lambda text: legacy_substring(large_dictionary, text),
+         large_scanner.find),
+    ]
+
+    print(f"{args.resumes} resumes, best of {args.repeat} runs (microseconds per resume)\n")
+    print(f"{'case':<40} {'legacy':>10} {'scanner':>10} {'speedup':>8}")
+    for name, legacy, scanner in cases:
+        for text in resumes[:20]:
+            assert legacy(text) == scanner(text), name
+        legacy_us = per_resume_us(legacy, resumes, args.repeat)
+        scanner_us = per_resume_us(scanner, resumes, args.repeat)
+        print(f"{name:<40} {legacy_us:>10.1f} {scanner_us:>10.1f} {legacy_us / scanner_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
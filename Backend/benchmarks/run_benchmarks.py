@@ -0,0 +1,258 @@
+"""
+ATS and parsing micro-benchmarks
+Run with: python benchmarks/run_benchmarks.py [--resumes 1000] [--jobs 50] [--output results.json]
+          [--baseline baseline.json] [--threshold 0.2]
+
+Times the per-item hot paths on a deterministic synthetic corpus (benchmarks/corpus.py):
+- parse:       ResumeParser.parse on resume text
+- score:       ATSEngine.score_resume (memo disabled, so every call really scores)
+- feedback:    FeedbackGenerator.generate_feedback for every rejected evaluation
+- jd_analysis: analyze_missing_skills (JD-Resume-Analyzer)
+- search:      StudentJobMatchingEngine.search_jobs (skipped when sentence-transformers
+               or the model is not available locally)
+
+Reports p50/p95/p99 latency and throughput per operation. With --baseline, compares
+against a previous --output file and exits with status 1 if any operation regressed by
+more than --threshold. Everything runs in-process and offline; no database is needed.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, "JD-Resume-Analyzer"))
+
+# Never reach out to the Hugging Face hub from a benchmark run
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+from benchmarks.corpus import generate_corpus  # noqa: E402
+from ats_engine import ATSEngine  # noqa: E402
+from feedback_generator import FeedbackGenerator  # noqa: E402
+from models import JobRequirement, ResumeData  # noqa: E402
+from resume_parser import ResumeParser  # noqa: E402
+from skill_analyzer import analyze_missing_skills  # noqa: E402  (JD-Resume-Analyzer)
+
+
+OPERATIONS = ("parse", "score", "feedback", "jd_analysis", "search")
+WARMUP_CALLS = 5
+# Latency changes smaller than this are timer noise, whatever their relative size
+ABSOLUTE_TOLERANCE_MS = 0.01
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[float], wall_seconds: float) -> Dict[str, float]:
+    """Latency percentiles (milliseconds) and throughput (calls per second) of timed calls"""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1e3, 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1e3, 4),
+        "p95_ms": round(percentile(ordered, 95) * 1e3, 4),
+        "p99_ms": round(percentile(ordered, 99) * 1e3, 4),
+        "throughput_per_s": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0,
+    }
+
+
+def measure(fn: Callable, calls: List[Tuple]) -> Tuple[List[Any], Dict[str, float]]:
+    """Call fn(*args) for every argument tuple, timing each call individually"""
+    for args in calls[:WARMUP_CALLS]:
+        fn(*args)
+    outputs, samples = [], []
+    started = time.perf_counter()
+    for args in calls:
+        call_started = time.perf_counter()
+        outputs.append(fn(*args))
+        samples.append(time.perf_counter() - call_started)
+    return outputs, summarize(samples, time.perf_counter() - started)
+
+
+def _load_search_engine():
+    """StudentJobMatchingEngine, or the reason it cannot be loaded offline"""
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        return None, "sentence-transformers is not installed"
+    try:
+        from student_engine import StudentJobMatchingEngine
+        return StudentJobMatchingEngine(), None
+    except Exception as e:
+        return None, f"embedding model not available offline ({e})"
+
+
+def run_benchmarks(corpus: Dict[str, List], operations: Sequence[str]) -> Tuple[Dict, Dict]:
+    """
+    Run the selected operations over a corpus.
+
+    Inputs an operation depends on (parsed resumes for scoring, ATS results for feedback)
+    are computed untimed when that operation is not itself selected.
+
+    Returns:
+        (results, skipped): per-operation summaries, and skip reasons by operation
+    """
+    results: Dict[str, Dict] = {}
+    skipped: Dict[str, str] = {}
+    jobs = corpus["jobs"]
+    requirements = [JobRequirement(**job["requirements"]) for job in jobs]
+    pairs = [(i, i % len(jobs)) for i in range(len(corpus["resumes"]))]
+
+    parsed: List[Dict] = []
+    if {"parse", "score", "feedback"} & set(operations):
+        parser = ResumeParser()
+        calls = [(None, text) for text in corpus["resumes"]]
+        if "parse" in operations:
+            parsed, results["parse"] = measure(parser.parse, calls)
+        else:
+            parsed = [parser.parse(*args) for args in calls]
+
+    ats_results: List[Dict] = []
+    if {"score", "feedback"} & set(operations):
+        engine = ATSEngine(use_memo=False)
+        calls = [(ResumeData(**parsed[i]), requirements[j]) for i, j in pairs]
+        if "score" in operations:
+            ats_results, results["score"] = measure(engine.score_resume, calls)
+        else:
+            ats_results = [engine.score_resume(*args) for args in calls]
+
+    if "feedback" in operations:
+        generator = FeedbackGenerator()
+        calls = [
+            (ats_results[k], parsed[i], requirements[j])
+            for k, (i, j) in enumerate(pairs) if not ats_results[k]["passed"]
+        ]
+        if calls:
+            _, results["feedback"] = measure(generator.generate_feedback, calls)
+        else:
+            skipped["feedback"] = "no rejected evaluations in the corpus"
+
+    if "jd_analysis" in operations:
+        calls = [(corpus["resumes"][i], jobs[j]["description"]) for i, j in pairs]
+        _, results["jd_analysis"] = measure(analyze_missing_skills, calls)
+
+    if "search" in operations:
+        engine, reason = _load_search_engine()
+        if engine is None:
+            skipped["search"] = reason
+        else:
+            calls = [(query["query"], jobs, query["skills"], 10) for query in corpus["queries"]]
+            _, results["search"] = measure(engine.search_jobs, calls)
+
+    return results, skipped
+
+
+def compare_to_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict],
+                        threshold: float) -> Dict[str, List[str]]:
+    """
+    Regressions per operation: p50/p95 latency above, or throughput below, the baseline
+    by more than `threshold` (a fraction). Operations missing from either side are ignored.
+    """
+    regressions: Dict[str, List[str]] = {}
+    for operation, current in results.items():
+        previous = baseline.get(operation)
+        if not previous:
+            continue
+        problems = []
+        for metric in ("p50_ms", "p95_ms"):
+            before, after = previous.get(metric, 0.0), current[metric]
+            if before and after > before * (1 + threshold) and after - before > ABSOLUTE_TOLERANCE_MS:
+                problems.append(f"{metric} {before:.3f} -> {after:.3f}")
+        before, after = previous.get("throughput_per_s", 0.0), current["throughput_per_s"]
+        if before and after < before / (1 + threshold):
+            problems.append(f"throughput {before:.1f}/s -> {after:.1f}/s")
+        if problems:
+            regressions[operation] = problems
+    return regressions
+
+
+def _change(current: Dict, previous: Optional[Dict], metric: str) -> str:
+    if not previous or not previous.get(metric):
+        return ""
+    return f"{(current[metric] / previous[metric] - 1) * 100:+.1f}%"
+
+
+def print_report(results: Dict[str, Dict], skipped: Dict[str, str], baseline: Optional[Dict] = None,
+                 regressions: Optional[Dict[str, List[str]]] = None) -> None:
+    header = f"{'operation':<12} {'calls':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>10}"
+    if baseline is not None:
+        header += f" {'p50 chg':>8} {'p95 chg':>8}  status"
+    print(header)
+    for operation in OPERATIONS:
+        if operation in skipped:
+            print(f"{operation:<12} skipped: {skipped[operation]}")
+        if operation not in results:
+            continue
+        stats = results[operation]
+        line = (f"{operation:<12} {stats['count']:>7} {stats['mean_ms']:>9.3f} {stats['p50_ms']:>9.3f} "
+                f"{stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['throughput_per_s']:>10.1f}")
+        if baseline is not None:
+            previous = baseline.get(operation)
+            status = "REGRESSION" if operation in (regressions or {}) else ("ok" if previous else "new")
+            line += f" {_change(stats, previous, 'p50_ms'):>8} {_change(stats, previous, 'p95_ms'):>8}  {status}"
+        print(line)
+    for operation, problems in (regressions or {}).items():
+        print(f"[REGRESSION] {operation}: {'; '.join(problems)}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=1000, help="synthetic resumes (1k-100k)")
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=50, help="student search queries")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ops", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--output", help="write results as JSON (usable as a later --baseline)")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="allowed slowdown as a fraction before flagging a regression")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    corpus = generate_corpus(args.resumes, args.jobs, args.queries, args.seed)
+    print(f"Corpus: {args.resumes} resumes, {args.jobs} jobs, {args.queries} queries "
+          f"(seed {args.seed}, generated in {time.perf_counter() - started:.1f}s)\n")
+
+    results, skipped = run_benchmarks(corpus, args.ops)
+    meta = {
+        "resumes": args.resumes, "jobs": args.jobs, "queries": args.queries, "seed": args.seed,
+        "python": platform.python_version(), "platform": platform.platform(),
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+    baseline, regressions = None, {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline_doc = json.load(f)
+        baseline = baseline_doc.get("results", {})
+        previous_meta = baseline_doc.get("meta", {})
+        for key in ("resumes", "jobs", "queries", "seed"):
+            if previous_meta.get(key) != meta[key]:
+                print(f"Warning: baseline {key}={previous_meta.get(key)} differs from this run ({meta[key]})")
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+
+    print_report(results, skipped, baseline, regressions)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results, "skipped": skipped}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
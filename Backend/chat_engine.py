@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
 from database.models import Job, Candidate, Application, Evaluation, ApplicationStatus
 from database.schemas import JobResponse, CandidateResponse, EvaluationResponse
-from student_engine import CampusConnectStudentEngine
+from student_engine import get_student_engine
 from config import USE_LLM_FEEDBACK, USE_LLM_CHAT
 from llm.student_feedback import (
     generate_resume_feedback_llm,
@@ -674,41 +674,10 @@ class DataRetriever:
     
     def search_jobs_for_student(self, query: str, student_skills: List[str], top_k: int = 10) -> List[Dict[str, Any]]:
         """Search jobs using student engine"""
-        from student_engine import CampusConnectStudentEngine
-        
-        # Get all jobs
-        jobs = self.db.query(Job).all()
-        
-        # Convert to list of dicts
-        jobs_list = []
-        for job in jobs:
-            requirements = job.requirements_json or {}
-            jobs_list.append({
-                "id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "salary": job.salary,
-                "description": job.description or "",
-                "requirements": requirements.get("job_description", "") or 
-                              f"{', '.join(requirements.get('required_skills', []))}"
-            })
-        
-        # Use student engine
-        student_engine = CampusConnectStudentEngine()
-        results = student_engine.search_jobs(
-            student_query=query,
-            jobs=jobs_list,
-            student_skills=student_skills,
-            top_k=top_k
-        )
-        
-        return results
+        return get_student_engine().search_jobs_in_db(self.db, query, student_skills, top_k)
     
     def analyze_skill_gap_for_job(self, job_id: int, student_skills: List[str]) -> Optional[Dict[str, Any]]:
         """Analyze skill gap for a specific job"""
-        from student_engine import CampusConnectStudentEngine
-        
         job = self.db.query(Job).filter(Job.id == job_id).first()
         
         if not job:
@@ -717,7 +686,7 @@ class DataRetriever:
         requirements = job.requirements_json or {}
         job_skills = requirements.get("required_skills", [])
         
-        student_engine = CampusConnectStudentEngine()
+        student_engine = get_student_engine()
         result = student_engine.analyze_skill_gap(
             student_skills=student_skills,
             job_skills=job_skills,
@@ -1189,7 +1158,7 @@ class StudentChatOrchestrator:
         self.data_retriever = DataRetriever(db)
         self.response_generator = StudentResponseGenerator()
         self.user_id = user_id
-        self.student_engine = CampusConnectStudentEngine()
+        self.student_engine = get_student_engine()
     
     def get_student_skills(self) -> List[str]:
         """Get student's skills from their profile"""
@@ -1203,6 +1172,11 @@ class StudentChatOrchestrator:
         Returns:
             Tuple of (response_text, data_dict)
         """
+        # The engine's models stay leased for every step of the message
+        with self.student_engine.lease_models():
+            return self._process_message(message)
+    
+    def _process_message(self, message: str) -> Tuple[str, Optional[Dict[str, Any]]]:
         # Get student skills
         student_skills = self.get_student_skills()
         
@@ -19,9 +19,44 @@ UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
 MAX_UPLOAD_SIZE: int = int(os.getenv("MAX_UPLOAD_SIZE", "10485760"))  # 10MB in bytes
 ALLOWED_EXTENSIONS: list = [".pdf", ".docx", ".doc"]
 
+# Document Extraction (PDF/DOCX text extraction in the "extraction" process pool)
+EXTRACTION_USE_PROCESS_POOL: bool = os.getenv("EXTRACTION_USE_PROCESS_POOL", "true").lower() == "true"
+EXTRACTION_POOL_SIZE: int = int(os.getenv("EXTRACTION_POOL_SIZE", "0"))  # 0 = WORKER_POOL_SIZE
+EXTRACTION_PAGES_PER_TASK: int = int(os.getenv("EXTRACTION_PAGES_PER_TASK", "4"))  # PDF pages per worker task
+EXTRACTION_MAX_PAGES: int = int(os.getenv("EXTRACTION_MAX_PAGES", "50"))  # pages past this are skipped
+EXTRACTION_TIMEOUT_SECONDS: float = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "30"))  # per document
+# PyPDF2 text layer first; pdfplumber only when the fast text is sparse or garbled
+EXTRACTION_FAST_TIER_ENABLED: bool = os.getenv("EXTRACTION_FAST_TIER_ENABLED", "true").lower() == "true"
+EXTRACTION_FAST_MIN_CHARS_PER_PAGE: int = int(os.getenv("EXTRACTION_FAST_MIN_CHARS_PER_PAGE", "100"))
+EXTRACTION_FAST_MAX_GARBAGE_RATIO: float = float(os.getenv("EXTRACTION_FAST_MAX_GARBAGE_RATIO", "0.05"))
+# DocumentExtractor arguments (document_extraction.py reads no config; see configure_document_extractor)
+EXTRACTION_SETTINGS: dict = {
+    "max_pages": EXTRACTION_MAX_PAGES,
+    "timeout_seconds": EXTRACTION_TIMEOUT_SECONDS,
+    "pages_per_task": EXTRACTION_PAGES_PER_TASK,
+    "use_process_pool": EXTRACTION_USE_PROCESS_POOL,
+    "pool_workers": EXTRACTION_POOL_SIZE,
+    "fast_tier": EXTRACTION_FAST_TIER_ENABLED,
+    "fast_min_chars_per_page": EXTRACTION_FAST_MIN_CHARS_PER_PAGE,
+    "fast_max_garbage_ratio": EXTRACTION_FAST_MAX_GARBAGE_RATIO,
+}
+RESUME_DEDUP_ENABLED: bool = os.getenv("RESUME_DEDUP_ENABLED", "true").lower() == "true"  # reuse parses by SHA-256
+
+# Bulk resume ingestion (ZIP archive / directory onboarding in the "ingest" process pool)
+BULK_INGEST_MAX_ARCHIVE_SIZE: int = int(os.getenv("BULK_INGEST_MAX_ARCHIVE_SIZE", "524288000"))  # 500MB
+BULK_INGEST_BATCH_SIZE: int = int(os.getenv("BULK_INGEST_BATCH_SIZE", "100"))  # resumes per insert_many
+BULK_INGEST_POOL_SIZE: int = int(os.getenv("BULK_INGEST_POOL_SIZE", "0"))  # 0 = WORKER_POOL_SIZE
+
 # ATS Configuration
 DEFAULT_MINIMUM_ATS_SCORE: float = float(os.getenv("DEFAULT_MINIMUM_ATS_SCORE", "50.0"))
 SKILL_SIMILARITY_THRESHOLD: float = float(os.getenv("SKILL_SIMILARITY_THRESHOLD", "0.7"))
+SKILL_MATCH_CACHE_SIZE: int = int(os.getenv("SKILL_MATCH_CACHE_SIZE", "65536"))  # fuzzy skill-pair LRU entries
+JOB_PROFILE_CACHE_SIZE: int = int(os.getenv("JOB_PROFILE_CACHE_SIZE", "1024"))  # compiled job profiles kept in memory
+
+# ATS Result Memoization (keyed by resume fingerprint, job requirements hash, scoring version)
+ATS_MEMO_ENABLED: bool = os.getenv("ATS_MEMO_ENABLED", "true").lower() == "true"
+ATS_MEMO_CACHE_SIZE: int = int(os.getenv("ATS_MEMO_CACHE_SIZE", "4096"))  # in-process LRU entries
+ATS_MEMO_TTL_SECONDS: int = int(os.getenv("ATS_MEMO_TTL_SECONDS", str(7 * 24 * 3600)))  # Mongo ats_memo TTL
 
 # Scoring Weights (can be adjusted)
 SCORING_WEIGHTS: dict = {
@@ -78,6 +113,36 @@ QDRANT_API_KEY: Optional[str] = os.getenv("QDRANT_API_KEY")
 QDRANT_COLLECTION_JOBS: str = os.getenv("QDRANT_COLLECTION_JOBS", "jobs")
 QDRANT_COLLECTION_CANDIDATES: str = os.getenv("QDRANT_COLLECTION_CANDIDATES", "candidates")
 
+# Jobs reindex (/api/v1/vector/reindex/jobs): rows streamed, embedded and upserted per chunk
+VECTOR_REINDEX_CHUNK_SIZE: int = int(os.getenv("VECTOR_REINDEX_CHUNK_SIZE", "256"))
+
+# Candidate resume passages (vector/candidate_index.py): each resume section is embedded in
+# windows of at most this many words, consecutive windows sharing the overlap
+CANDIDATE_PASSAGE_MAX_WORDS: int = int(os.getenv("CANDIDATE_PASSAGE_MAX_WORDS", "200"))
+CANDIDATE_PASSAGE_OVERLAP_WORDS: int = int(os.getenv("CANDIDATE_PASSAGE_OVERLAP_WORDS", "40"))
+
+# Model Registry Configuration
+# Load sentence-transformers / text-generation models at startup instead of on first request
+MODEL_WARMUP: bool = os.getenv("MODEL_WARMUP", "false").lower() == "true"
+# Unload models nobody holds a lease on after this many idle seconds (0 = keep them loaded)
+MODEL_IDLE_UNLOAD_SECONDS: int = int(os.getenv("MODEL_IDLE_UNLOAD_SECONDS", "0"))
+
+# Embedding inference backend for vector/embedder.LocalEmbedder (Qdrant indexing and search):
+# "torch" (full-precision PyTorch) or "onnx-int8" (int8-quantized ONNX export run by ONNX Runtime,
+# created with `python quantize_embedder.py export`). Reindex Qdrant after switching.
+EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+EMBEDDING_ONNX_DIR: str = os.getenv("EMBEDDING_ONNX_DIR", "models/onnx")
+EMBEDDING_ONNX_QUANTIZATION: str = os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx2")  # avx2, avx512, avx512_vnni, arm64
+
+# Embedding micro-batcher (vector/batcher.py): concurrent embed requests share one encode
+EMBED_BATCH_MAX_SIZE: int = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))  # 1 = no batching
+EMBED_BATCH_MAX_WAIT_MS: float = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))  # collection window
+
+# Worker Pool Configuration (CPU-bound parsing / scoring)
+WORKER_POOL_SIZE: int = int(os.getenv("WORKER_POOL_SIZE", "0"))  # 0 = one worker per core
+WORKER_POOL_START_METHOD: str = os.getenv("WORKER_POOL_START_METHOD", "spawn")
+ATS_BATCH_WRITE_SIZE: int = int(os.getenv("ATS_BATCH_WRITE_SIZE", "500"))  # ats_results per insert_many
+
 # Feature Flags
 USE_LLM_CHAT: bool = os.getenv("USE_LLM_CHAT", "false").lower() == "true"
 USE_LLM_FEEDBACK: bool = os.getenv("USE_LLM_FEEDBACK", "false").lower() == "true"
@@ -88,3 +153,11 @@ USE_LLM_RESUME_ENRICH: bool = os.getenv("USE_LLM_RESUME_ENRICH", "false").lower(
 USE_LLM_RESUME_ENRICH_UPDATE_CANDIDATE: bool = (
     os.getenv("USE_LLM_RESUME_ENRICH_UPDATE_CANDIDATE", "false").lower() == "true"
 )
+# Resume enrichment runs in a background worker fed by resumes with enrichment_status "pending"
+LLM_ENRICH_CONCURRENCY: int = int(os.getenv("LLM_ENRICH_CONCURRENCY", "2"))  # Groq calls in flight
+LLM_ENRICH_REQUESTS_PER_MINUTE: int = int(os.getenv("LLM_ENRICH_REQUESTS_PER_MINUTE", "30"))  # 0 = unpaced
+LLM_ENRICH_BATCH_SIZE: int = int(os.getenv("LLM_ENRICH_BATCH_SIZE", "20"))  # resumes claimed per cycle
+LLM_ENRICH_POLL_SECONDS: float = float(os.getenv("LLM_ENRICH_POLL_SECONDS", "5"))
+LLM_ENRICH_MAX_ATTEMPTS: int = int(os.getenv("LLM_ENRICH_MAX_ATTEMPTS", "3"))
+LLM_ENRICH_RATE_LIMIT_BACKOFF_SECONDS: float = float(os.getenv("LLM_ENRICH_RATE_LIMIT_BACKOFF_SECONDS", "30"))
+LLM_ENRICH_CLAIM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_ENRICH_CLAIM_TIMEOUT_SECONDS", "600"))
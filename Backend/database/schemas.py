@@ -109,6 +109,13 @@ class CandidateResponse(BaseModel):
         from_attributes = True
 
 
+class SimilarCandidateResponse(BaseModel):
+    candidate: CandidateResponse
+    score: float  # cosine similarity of the best-matching resume passage
+    section: Optional[str]
+    passage: Optional[str]
+
+
 # Application Schemas
 class ApplicationStatus(str, Enum):
     PENDING = "pending"
@@ -226,6 +233,10 @@ class JobSearchRequest(BaseModel):
     query: str
     student_skills: List[str]
     top_k: int = Field(default=10, ge=1, le=50)
+    # Optional filters, applied before ranking
+    location: Optional[str] = None  # any part matches, e.g. "Pune" matches "Pune, Maharashtra"
+    company: Optional[str] = None  # exact name, case-insensitive
+    posted_within_days: Optional[int] = Field(default=None, ge=1)
 
 
 class JobSearchResponse(BaseModel):
@@ -0,0 +1,541 @@
+"""
+Document Extraction Module
+Text extraction for uploaded resumes (PDF, DOCX) in the "extraction" process pool, so
+pdfplumber never runs on the event loop or competes with request handling for the GIL.
+
+Large PDFs are split into page ranges that are extracted in parallel. Every document has
+a page budget (`max_pages`) and a wall-clock budget (`timeout_seconds`):
+pages past the budget are skipped (`truncated`), and when time runs out the pages that
+were extracted so far are returned (`timed_out`). The ranges are split into one task per
+worker, which opens the PDF once and extracts its ranges in order until the deadline; a
+task still busy past the deadline cannot be interrupted, so its result is discarded. A
+range that raises is recorded (`failed_pages`, `errors`) and the other ranges are still
+returned, as a partial result; only a document where every range failed raises.
+
+Each page range goes through two tiers: PyPDF2's plain text layer first, which is an order
+of magnitude cheaper than pdfplumber's layout analysis, and pdfplumber only when the fast
+text looks poor (too few characters per page, too many garbage characters). The tier that
+served each document is recorded on the result and in the metrics.
+
+DOCX files are read by streaming word/document.xml out of the zip through an incremental
+XML parser instead of building python-docx's object model: paragraph and table-cell text is
+emitted in document order and every finished block is dropped from the tree, so memory
+stays bounded by the largest paragraph rather than the document.
+
+Sources can be file paths, in-memory buffers (bytes, memoryview) or binary file objects
+such as the SpooledTemporaryFile behind a FastAPI UploadFile, so uploads never have to be
+written to disk first. Workers receive a path or the document bytes.
+
+Settings are DocumentExtractor arguments; the module reads no configuration, since the
+JD-Resume-Analyzer installs it without the backend's config.py. The backend hands its
+EXTRACTION_* settings to `get_document_extractor` through `configure_document_extractor`.
+"""
+
+import io
+import os
+import re
+import string
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, wait
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from xml.etree.ElementTree import iterparse
+
+from worker_pool import get_process_pool, pool_size
+
+
+FAST_TIER = "pypdf2"
+LAYOUT_TIER = "pdfplumber"
+MIXED_TIER = "mixed"
+DOCX_TIER = "docx-stream"
+# (min non-whitespace characters per page, max garbage ratio) PyPDF2's text must meet
+FAST_TIER_QUALITY = (100, 0.05)
+
+DOCX_BODY_PART = "word/document.xml"
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+# Run content that stands for a character (as python-docx's Run.text renders it)
+DOCX_RUN_CHARACTERS = {_W + "tab": "\t", _W + "ptab": "\t", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+# Block-level elements whose text is complete once they end (cleared from the tree then)
+_DOCX_BLOCKS = {_W + "p", _W + "tbl", _W + "sdt"}
+
+# How long past the deadline to wait for tasks that stopped at it to return their ranges
+RESULT_GRACE_SECONDS = 0.5
+
+# Unmapped glyphs as pdfminer/PyPDF2 render them, e.g. "(cid:72)"
+CID_PATTERN = re.compile(r"\(cid:\d+\)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# Anything that is not a letter, digit, whitespace or punctuation seen in real resumes
+GARBAGE_PATTERN = re.compile(
+    "[^\\w\\s" + re.escape(string.punctuation + "•·●▪■◦►✓✔–—‘’“”…©®°€£₹") + "]"
+)
+
+
+class ExtractionTimeout(ValueError):
+    """No text could be extracted within the document's time budget"""
+
+
+# A file path, an in-memory buffer, or a seekable binary file object
+DocumentSource = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, BinaryIO]
+
+
+def open_source(source: DocumentSource) -> Union[str, BinaryIO]:
+    """Path or rewound binary stream, the two inputs PyPDF2, pdfplumber and zipfile accept."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "read"):
+        source.seek(0)
+        return source
+    return os.fspath(source)
+
+
+def worker_payload(source: DocumentSource) -> Union[str, bytes]:
+    """Picklable form of a source for the worker processes: the path, or the bytes."""
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        source.seek(0)
+        return source.read()
+    return os.fspath(source)
+
+
+def source_name(source: DocumentSource, filename: Optional[str] = None) -> str:
+    if filename:
+        return filename
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    return "<in-memory document>"
+
+
+def text_quality(pages: List[str]) -> Tuple[float, float]:
+    """(non-whitespace characters per page, fraction of them that are garbage) of page texts"""
+    text = "".join(pages)
+    visible = len(WHITESPACE_PATTERN.sub("", text))
+    if not visible:
+        return 0.0, 1.0
+    garbage = len(GARBAGE_PATTERN.findall(text)) + sum(len(cid) for cid in CID_PATTERN.findall(text))
+    return visible / max(1, len(pages)), min(1.0, garbage / visible)
+
+
+def fast_text_is_usable(pages: List[str], quality: Tuple[int, float] = FAST_TIER_QUALITY) -> bool:
+    min_chars_per_page, max_garbage_ratio = quality
+    chars_per_page, garbage_ratio = text_quality(pages)
+    return chars_per_page >= min_chars_per_page and garbage_ratio <= max_garbage_ratio
+
+
+def pdf_page_count(source: DocumentSource) -> int:
+    """Page count from the catalog's /Pages /Count, without walking the page tree."""
+    try:
+        from PyPDF2 import PdfReader
+        reader = PdfReader(open_source(source))
+        try:
+            return int(reader.trailer["/Root"]["/Pages"]["/Count"])
+        except Exception:
+            return len(reader.pages)
+    except Exception:
+        # Let pdfplumber have a go at files PyPDF2 cannot open (and raise if it cannot either)
+        import pdfplumber
+        with pdfplumber.open(open_source(source)) as pdf:
+            return len(pdf.pages)
+
+
+class PdfPages:
+    """A PDF opened at most once per tier, serving the page ranges of one worker task"""
+
+    def __init__(self, source: Union[str, bytes]):
+        self.source = source
+        self._reader = None
+        self._plumber = None
+
+    def fast(self, start: int, stop: int) -> List[str]:
+        if self._reader is None:
+            from PyPDF2 import PdfReader
+            self._reader = PdfReader(open_source(self.source))
+        return [page.extract_text() or "" for page in self._reader.pages[start:stop]]
+
+    def layout(self, start: int, stop: int) -> List[str]:
+        if self._plumber is None:
+            import pdfplumber
+            self._plumber = pdfplumber.open(open_source(self.source))
+        return [page.extract_text() or "" for page in self._plumber.pages[start:stop]]
+
+    def close(self) -> None:
+        if self._plumber is not None:
+            self._plumber.close()
+
+
+def extract_pdf_pages(pdf: PdfPages, start: int, stop: int, fast_tier: bool = True,
+                      fast_quality: Tuple[int, float] = FAST_TIER_QUALITY) -> Tuple[str, List[str]]:
+    """
+    Text of pages [start, stop) of an opened PDF.
+
+    `fast_quality` is the (min characters per page, max garbage ratio) PyPDF2's text
+    must meet to be used.
+
+    Returns:
+        (tier, page texts): FAST_TIER when PyPDF2's text passed the quality check,
+        LAYOUT_TIER when pdfplumber had to be used
+    """
+    if fast_tier:
+        try:
+            pages = pdf.fast(start, stop)
+            if fast_text_is_usable(pages, fast_quality):
+                return FAST_TIER, pages
+        except Exception:
+            pass  # pdfplumber copes with some files PyPDF2 rejects
+    return LAYOUT_TIER, pdf.layout(start, stop)
+
+
+def extract_pdf_ranges(source: Union[str, bytes], ranges: List[Tuple[int, int]],
+                       fast_tier: bool = True, deadline: Optional[float] = None,
+                       fast_quality: Tuple[int, float] = FAST_TIER_QUALITY
+                       ) -> List[Tuple[int, int, Optional[str], Any]]:
+    """
+    Text of several page ranges of one PDF (runs in a worker process), opening it once.
+
+    Ranges are extracted in order; the ones not started by `deadline` (a time.time()
+    value, comparable across processes) are left out. A range that raises does not
+    lose the others.
+
+    Returns:
+        (start, stop, tier, page texts) per range, or (start, stop, None, error message)
+        for a range that failed
+    """
+    pdf = PdfPages(source)
+    outcomes = []
+    try:
+        for start, stop in ranges:
+            if deadline is not None and time.time() >= deadline:
+                break
+            try:
+                tier, pages = extract_pdf_pages(pdf, start, stop, fast_tier, fast_quality)
+            except Exception as e:
+                outcomes.append((start, stop, None, f"{type(e).__name__}: {e}"))
+            else:
+                outcomes.append((start, stop, tier, pages))
+    finally:
+        pdf.close()
+    return outcomes
+
+
+def iter_docx_paragraphs(source: DocumentSource) -> Iterator[str]:
+    """
+    Paragraph text of a DOCX body in document order, table cells included.
+
+    Streams word/document.xml with iterparse; every paragraph (a table cell holds one or
+    more) is yielded as soon as it ends and the finished elements are discarded. Text boxes
+    are yielded where they are anchored, and their VML fallback copies are skipped.
+    """
+    try:
+        archive = zipfile.ZipFile(open_source(source))
+    except zipfile.BadZipFile:
+        raise ValueError("Not a DOCX file (legacy .doc files are not supported)")
+    if DOCX_BODY_PART not in archive.namelist():
+        archive.close()
+        raise ValueError(f"Not a DOCX file ({DOCX_BODY_PART} is missing)")
+    with archive, archive.open(DOCX_BODY_PART) as part:
+        paragraphs: List[List[str]] = []  # text boxes nest paragraphs inside paragraphs
+        parents: List[Any] = []
+        skipping = 0
+        for event, element in iterparse(part, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                parents.append(element)
+                if tag == _MC_FALLBACK:
+                    skipping += 1
+                elif tag == _W + "p" and not skipping:
+                    paragraphs.append([])
+                continue
+
+            parents.pop()
+            if tag == _MC_FALLBACK:
+                skipping -= 1
+            elif skipping or not paragraphs:
+                pass
+            elif tag == _W + "t":
+                paragraphs[-1].append(element.text or "")
+            elif tag in DOCX_RUN_CHARACTERS:
+                paragraphs[-1].append(DOCX_RUN_CHARACTERS[tag])
+            elif tag == _W + "br":
+                # Page and column breaks carry no text
+                if element.get(_W + "type", "textWrapping") == "textWrapping":
+                    paragraphs[-1].append("\n")
+            elif tag == _W + "p":
+                yield "".join(paragraphs.pop())
+
+            if tag in _DOCX_BLOCKS or tag == _W + "r":
+                element.clear()
+                if parents and tag in _DOCX_BLOCKS:
+                    # Drop the finished block from its parent (the body, a cell, a text box)
+                    parents[-1].remove(element)
+
+
+def extract_docx_text(source: DocumentSource) -> str:
+    """Paragraph and table-cell text of a DOCX file (runs in a worker process)."""
+    return "\n".join(iter_docx_paragraphs(source))
+
+
+class ExtractionResult:
+    """Extracted text plus what was (not) covered by it"""
+
+    def __init__(self, text: str, pages_total: int = 0, pages_extracted: int = 0,
+                 truncated: bool = False, timed_out: bool = False, seconds: float = 0.0,
+                 tier: Optional[str] = None, failed_pages: int = 0,
+                 errors: Optional[List[str]] = None):
+        self.text = text
+        self.tier = tier
+        self.pages_total = pages_total
+        self.pages_extracted = pages_extracted
+        self.truncated = truncated
+        self.timed_out = timed_out
+        self.seconds = seconds
+        self.failed_pages = failed_pages  # pages of ranges that raised
+        self.errors = errors or []
+
+    @property
+    def partial(self) -> bool:
+        return self.truncated or self.timed_out or self.failed_pages > 0
+
+
+class ExtractionMetrics:
+    """Counters and recent timings of one extractor (thread-safe)"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._durations = deque(maxlen=window)
+        self.documents = 0
+        self.pages = 0
+        self.truncated = 0
+        self.timed_out = 0
+        self.failed = 0
+        self.failed_pages = 0
+        self.tiers: Dict[str, int] = {}
+        self.in_flight = 0
+        self.pending_tasks = 0
+
+    def task_submitted(self, future: Future) -> None:
+        with self._lock:
+            self.pending_tasks += 1
+        future.add_done_callback(self._task_done)
+
+    def _task_done(self, _future: Future) -> None:
+        with self._lock:
+            self.pending_tasks -= 1
+
+    def document_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def document_finished(self, result: Optional[ExtractionResult], seconds: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._durations.append(seconds)
+            if result is None:
+                self.failed += 1
+                return
+            self.documents += 1
+            self.pages += result.pages_extracted
+            self.truncated += int(result.truncated)
+            self.timed_out += int(result.timed_out)
+            self.failed_pages += result.failed_pages
+            if result.tier:
+                self.tiers[result.tier] = self.tiers.get(result.tier, 0) + 1
+
+    def snapshot(self, workers: int) -> Dict[str, Any]:
+        with self._lock:
+            durations = sorted(self._durations)
+            pending = self.pending_tasks
+            stats = {
+                "documents": self.documents,
+                "failed": self.failed,
+                "pages": self.pages,
+                "failed_pages": self.failed_pages,
+                "truncated": self.truncated,
+                "timed_out": self.timed_out,
+                "tiers": dict(self.tiers),
+                "in_flight": self.in_flight,
+            }
+
+        def pct(p: float) -> float:
+            return round(durations[min(len(durations) - 1, int(p * len(durations)))], 4) if durations else 0.0
+
+        stats.update({
+            "workers": workers,
+            "pending_tasks": pending,
+            # Tasks beyond one per worker are waiting in the pool's queue
+            "queue_depth": max(0, pending - workers),
+            "p50_seconds": pct(0.50),
+            "p95_seconds": pct(0.95),
+            "max_seconds": round(durations[-1], 4) if durations else 0.0,
+        })
+        return stats
+
+
+class DocumentExtractor:
+    """Budgeted PDF/DOCX text extraction, page-parallel in a process pool"""
+
+    def __init__(self, max_pages: int = 50,
+                 timeout_seconds: float = 30,
+                 pages_per_task: int = 4,
+                 use_process_pool: bool = True,
+                 pool_workers: int = 0,
+                 fast_tier: bool = True,
+                 fast_min_chars_per_page: int = FAST_TIER_QUALITY[0],
+                 fast_max_garbage_ratio: float = FAST_TIER_QUALITY[1]):
+        """
+        Args:
+            max_pages: Pages past this are skipped (0 = no limit)
+            timeout_seconds: Wall-clock budget per document
+            pages_per_task: PDF pages per range
+            use_process_pool: Extract in the "extraction" process pool (False = in this process)
+            pool_workers: Size of that pool (0 = the worker_pool default)
+            fast_tier: Try PyPDF2's text layer before pdfplumber
+            fast_min_chars_per_page, fast_max_garbage_ratio: Quality the fast text must meet
+        """
+        self.max_pages = max_pages
+        self.fast_tier = fast_tier
+        self.fast_quality = (fast_min_chars_per_page, fast_max_garbage_ratio)
+        self.pool_workers = pool_workers
+        self.timeout_seconds = timeout_seconds
+        self.pages_per_task = max(1, pages_per_task)
+        self.use_process_pool = use_process_pool
+        self.metrics = ExtractionMetrics()
+
+    def extract(self, source: DocumentSource, filename: Optional[str] = None) -> ExtractionResult:
+        """
+        Extract text from a PDF or DOCX document.
+
+        Args:
+            source: File path, bytes / memoryview, or binary file object
+            filename: Original file name; its extension selects the format (defaults to the path)
+        """
+        name = source_name(source, filename)
+        lower = name.lower()
+        if lower.endswith(".pdf"):
+            return self.extract_pdf(source, name)
+        if lower.endswith(".docx") or lower.endswith(".doc"):
+            return self.extract_docx(source, name)
+        raise ValueError(f"Unsupported file format: {name}")
+
+    def extract_pdf(self, source: DocumentSource, filename: Optional[str] = None) -> ExtractionResult:
+        name = source_name(source, filename)
+        return self._run(lambda deadline: self._extract_pdf(source, name, deadline))
+
+    def extract_docx(self, source: DocumentSource, filename: Optional[str] = None) -> ExtractionResult:
+        name = source_name(source, filename)
+        return self._run(lambda deadline: self._extract_docx(source, name, deadline))
+
+    def stats(self) -> Dict[str, Any]:
+        return self.metrics.snapshot(pool_size(self.pool_workers) if self.use_process_pool else 0)
+
+    def _pool(self):
+        return get_process_pool("extraction", self.pool_workers or None)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        future = self._pool().submit(fn, *args)
+        self.metrics.task_submitted(future)
+        return future
+
+    def _run(self, extract: Callable[[float], ExtractionResult]) -> ExtractionResult:
+        started = time.perf_counter()
+        self.metrics.document_started()
+        result = None
+        try:
+            result = extract(started + self.timeout_seconds)
+            result.seconds = time.perf_counter() - started
+            return result
+        finally:
+            self.metrics.document_finished(result, time.perf_counter() - started)
+
+    def _extract_pdf(self, source: DocumentSource, name: str, deadline: float) -> ExtractionResult:
+        pages_total = pdf_page_count(source)
+        page_limit = min(pages_total, self.max_pages) if self.max_pages else pages_total
+        ranges = [(start, min(start + self.pages_per_task, page_limit))
+                  for start in range(0, page_limit, self.pages_per_task)]
+        # Workers compare against wall-clock time; the deadline itself is a perf_counter value
+        worker_deadline = time.time() + max(0.0, deadline - time.perf_counter())
+
+        payload = worker_payload(source)
+        if self.use_process_pool and ranges:
+            # One task per worker, each opening the PDF once, rather than one per range
+            tasks = min(len(ranges), pool_size(self.pool_workers))
+            per_task = -(-len(ranges) // tasks)
+            chunks = [ranges[i:i + per_task] for i in range(0, len(ranges), per_task)]
+            futures = {self._submit(extract_pdf_ranges, payload, chunk, self.fast_tier, worker_deadline,
+                                    self.fast_quality): chunk
+                       for chunk in chunks}
+            done, not_done = wait(
+                futures, timeout=max(0.0, deadline - time.perf_counter()) + RESULT_GRACE_SECONDS
+            )
+            for future in not_done:
+                future.cancel()
+            outcomes = []
+            for future in done:
+                try:
+                    outcomes.extend(future.result())
+                except Exception as e:  # The task itself failed, e.g. its worker died
+                    outcomes.extend((start, stop, None, f"{type(e).__name__}: {e}")
+                                    for start, stop in futures[future])
+        else:
+            outcomes = extract_pdf_ranges(payload, ranges, self.fast_tier, worker_deadline, self.fast_quality)
+
+        texts = {start: (tier, pages) for start, _, tier, pages in outcomes if tier is not None}
+        failures = [(start, stop, error) for start, stop, tier, error in outcomes if tier is None]
+        if failures and not texts:
+            raise ValueError(f"Could not extract text from {name}: {failures[0][2]}")
+        pages = [page for start in sorted(texts) for page in texts[start][1]]
+        tiers = {tier for tier, _ in texts.values()}
+        timed_out = len(outcomes) < len(ranges)
+        if timed_out and not any(pages):
+            raise ExtractionTimeout(
+                f"No text extracted from {name} within {self.timeout_seconds:g}s"
+            )
+        return ExtractionResult(
+            text="".join(page + "\n" for page in pages if page),
+            pages_total=pages_total,
+            pages_extracted=len(pages),
+            truncated=page_limit < pages_total,
+            timed_out=timed_out,
+            tier=tiers.pop() if len(tiers) == 1 else (MIXED_TIER if tiers else None),
+            failed_pages=sum(stop - start for start, stop, _ in failures),
+            errors=[f"pages {start + 1}-{stop}: {error}" for start, stop, error in sorted(failures)],
+        )
+
+    def _extract_docx(self, source: DocumentSource, name: str, deadline: float) -> ExtractionResult:
+        if not self.use_process_pool:
+            return ExtractionResult(text=extract_docx_text(source), tier=DOCX_TIER)
+        future = self._submit(extract_docx_text, worker_payload(source))
+        done, _ = wait([future], timeout=max(0.0, deadline - time.perf_counter()))
+        if not done:
+            future.cancel()
+            raise ExtractionTimeout(
+                f"No text extracted from {name} within {self.timeout_seconds:g}s"
+            )
+        return ExtractionResult(text=future.result(), tier=DOCX_TIER)
+
+
+_extractor: Optional[DocumentExtractor] = None
+_extractor_settings: Dict[str, Any] = {}
+_extractor_lock = threading.Lock()
+
+
+def configure_document_extractor(**settings) -> None:
+    """DocumentExtractor arguments for the process-wide extractor (replaces an existing one)."""
+    global _extractor
+    with _extractor_lock:
+        _extractor_settings.update(settings)
+        _extractor = None
+
+
+def get_document_extractor() -> DocumentExtractor:
+    """Process-wide document extractor (shared metrics)."""
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = DocumentExtractor(**_extractor_settings)
+    return _extractor
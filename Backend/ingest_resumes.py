@@ -0,0 +1,64 @@
+"""
+Bulk resume ingestion CLI
+Run with: python ingest_resumes.py <archive.zip | directory> [--user-id 1] [--batch-size 100]
+
+Runs the same pipeline as POST /api/v1/resume/bulk (resume_ingest.ResumeIngestion):
+files are parsed in the "ingest" process pool, stored in MongoDB with insert_many and
+linked to candidates by email. The run is recorded as an ingest job, so its progress is
+also visible through GET /api/v1/resume/bulk/{job_id}.
+"""
+
+import argparse
+import os
+import sys
+
+from config import BULK_INGEST_BATCH_SIZE, WORKER_POOL_SIZE, WORKER_POOL_START_METHOD
+from database.mongodb import get_mongo_db
+from database.postgres import SessionLocal
+from resume_ingest import ResumeIngestion, create_ingest_job, get_ingest_job
+from worker_pool import configure_pools, shutdown_pools
+
+
+def print_progress(progress):
+    print(f"  {progress['processed']}/{progress['total']} processed, "
+          f"{progress['failed']} failed, {progress['linked']} linked "
+          f"({progress['resumes_per_second']:.1f} resumes/s)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="ZIP archive or directory of PDF/DOCX resumes")
+    parser.add_argument("--user-id", type=int, help="uploader recorded on resumes that match no candidate")
+    parser.add_argument("--batch-size", type=int, default=BULK_INGEST_BATCH_SIZE,
+                        help="resumes per MongoDB insert_many / candidate link update")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} does not exist")
+        return 1
+
+    configure_pools(WORKER_POOL_SIZE, WORKER_POOL_START_METHOD)
+    mongo_db = get_mongo_db()
+    db = SessionLocal()
+    job = create_ingest_job(mongo_db, args.user_id, os.path.abspath(args.source))
+    print(f"Ingest job {job['job_id']}: {args.source}")
+    try:
+        ResumeIngestion(mongo_db, db, job_id=job["job_id"], user_id=args.user_id,
+                        batch_size=args.batch_size, on_progress=print_progress).run(args.source)
+    except Exception as e:
+        print(f"Error: ingestion failed: {e}")
+        return 1
+    finally:
+        db.close()
+        shutdown_pools(wait=True)
+
+    job = get_ingest_job(mongo_db, job["job_id"])
+    print(f"\nDone in {job['elapsed_seconds']:.1f}s: {job['succeeded']} stored, {job['failed']} failed, "
+          f"{job['linked']} candidates linked ({job['resumes_per_second']:.1f} resumes/s)")
+    for error in job["errors"]:
+        print(f"  [X] {error['file']}: {error['error']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Job Profiles Module
+Compiled, cached view of a job's requirements for ATS scoring. Everything that depends
+only on the job (validated JobRequirement, compiled skill matcher, job description
+keywords, effective weights) is built once per job version instead of once per scored
+applicant.
+
+Profiles are keyed by (job id, requirements hash): a changed requirements_json always
+gets a new profile, and routers/jobs.update_job drops the stale one eagerly.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from config import JOB_PROFILE_CACHE_SIZE
+from models import JobRequirement
+from skill_matcher import CompiledSkillMatcher, get_skill_matcher
+
+
+JD_KEYWORD_LIMIT = 20
+JD_WORD_PATTERN = re.compile(r'\b[a-z]{4,}\b')
+COMMON_WORDS = {
+    'the', 'and', 'or', 'but', 'with', 'from', 'this', 'that',
+    'will', 'would', 'should', 'could', 'must', 'have', 'has',
+    'been', 'were', 'was', 'they', 'their', 'them', 'these', 'those'
+}
+DEFAULT_SKILL_THRESHOLD = 0.7
+
+
+def extract_jd_keywords(job_description: Optional[str], limit: int = JD_KEYWORD_LIMIT) -> List[str]:
+    """
+    Deterministic keyword list for a job description.
+
+    Words longer than four letters that are not stop words, most frequent first, ties
+    in order of first occurrence.
+    """
+    if not job_description:
+        return []
+    words = JD_WORD_PATTERN.findall(job_description.lower())
+    counts = Counter(word for word in words if word not in COMMON_WORDS and len(word) > 4)
+    # Counter keeps first-occurrence order and most_common() is a stable sort
+    return [word for word, _ in counts.most_common(limit)]
+
+
+def effective_weights(job_requirement: JobRequirement) -> Dict[str, float]:
+    """Component weights, adjusted for requirements the recruiter left unspecified"""
+    # Weight distribution (can be adjusted based on job requirements)
+    weights = {
+        'skill': 0.40,      # Skills are most important
+        'keyword': 0.25,    # Keyword matching is important for ATS
+        'experience': 0.20, # Experience matters
+        'education': 0.10,  # Education has some weight
+        'format': 0.05      # Format is important but not critical
+    }
+
+    # Adjust weights if certain requirements are not specified
+    if not job_requirement.required_skills and not job_requirement.preferred_skills:
+        # If no skills specified, reduce skill weight
+        weights['skill'] = 0.20
+        weights['keyword'] += 0.10
+        weights['experience'] += 0.10
+
+    if not job_requirement.years_of_experience:
+        weights['experience'] = 0.10
+        weights['skill'] += 0.05
+        weights['keyword'] += 0.05
+
+    if not job_requirement.education_level:
+        weights['education'] = 0.05
+        weights['skill'] += 0.025
+        weights['keyword'] += 0.025
+
+    return weights
+
+
+def requirements_hash(requirements: Mapping[str, Any]) -> str:
+    """Stable hash of a requirements dict (key order does not matter)."""
+    payload = json.dumps(requirements, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class CompiledJobProfile:
+    """Job-side scoring inputs, computed once per job version"""
+
+    def __init__(self, requirement: JobRequirement, job_id: Optional[int] = None,
+                 requirements_digest: Optional[str] = None,
+                 skill_threshold: float = DEFAULT_SKILL_THRESHOLD):
+        self.job_id = job_id
+        self.requirement = requirement
+        self.requirements_hash = requirements_digest or requirements_hash(
+            getattr(requirement, "model_dump", requirement.dict)()
+        )
+        self.skill_matcher: CompiledSkillMatcher = get_skill_matcher(
+            tuple(requirement.required_skills), tuple(requirement.preferred_skills), skill_threshold
+        )
+        self.jd_keywords: List[str] = extract_jd_keywords(requirement.job_description)
+        self.weights: Dict[str, float] = effective_weights(requirement)
+
+
+_profiles: "OrderedDict[Tuple[Optional[int], str], CompiledJobProfile]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def _cached_profile(job_id: Optional[int], requirements: Mapping[str, Any],
+                    requirement: Optional[JobRequirement] = None) -> CompiledJobProfile:
+    digest = requirements_hash(requirements)
+    key = (job_id, digest)
+    with _profiles_lock:
+        profile = _profiles.get(key)
+        if profile is not None:
+            _profiles.move_to_end(key)
+            return profile
+
+    # Validation and compilation happen outside the lock; a racing duplicate is harmless
+    if requirement is None:
+        requirement = JobRequirement(**requirements)
+    profile = CompiledJobProfile(requirement, job_id=job_id, requirements_digest=digest)
+    with _profiles_lock:
+        _profiles[key] = profile
+        while len(_profiles) > JOB_PROFILE_CACHE_SIZE:
+            _profiles.popitem(last=False)
+    return profile
+
+
+def get_job_profile(job: Any) -> CompiledJobProfile:
+    """
+    Compiled profile of a `Job` row.
+
+    Raises:
+        pydantic.ValidationError: if job.requirements_json is not a valid JobRequirement
+    """
+    return _cached_profile(job.id, job.requirements_json or {})
+
+
+def get_requirement_profile(job_requirement: Union[JobRequirement, Mapping[str, Any]]) -> CompiledJobProfile:
+    """Compiled profile of an ad hoc requirement (not tied to a stored job), cached by content."""
+    if isinstance(job_requirement, JobRequirement):
+        return _cached_profile(
+            None, getattr(job_requirement, "model_dump", job_requirement.dict)(), job_requirement
+        )
+    return _cached_profile(None, job_requirement)
+
+
+def invalidate_job_profile(job_id: int) -> None:
+    """Drop every cached profile of a job (called when the job is updated or deleted)."""
+    with _profiles_lock:
+        for key in [key for key in _profiles if key[0] == job_id]:
+            del _profiles[key]
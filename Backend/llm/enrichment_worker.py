@@ -0,0 +1,355 @@
+import hashlib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from tenacity import RetryError
+
+from config import (
+    GROQ_API_KEY,
+    LLM_ENRICH_BATCH_SIZE,
+    LLM_ENRICH_CLAIM_TIMEOUT_SECONDS,
+    LLM_ENRICH_CONCURRENCY,
+    LLM_ENRICH_MAX_ATTEMPTS,
+    LLM_ENRICH_POLL_SECONDS,
+    LLM_ENRICH_RATE_LIMIT_BACKOFF_SECONDS,
+    LLM_ENRICH_REQUESTS_PER_MINUTE,
+    USE_LLM_RESUME_ENRICH,
+    USE_LLM_RESUME_ENRICH_UPDATE_CANDIDATE,
+)
+from llm.resume_enricher import request_enrichment
+
+
+ENRICH_PENDING = "pending"
+ENRICH_RUNNING = "running"
+ENRICH_DONE = "done"
+ENRICH_FAILED = "failed"
+
+
+def enrichment_enabled() -> bool:
+    return USE_LLM_RESUME_ENRICH and bool(GROQ_API_KEY)
+
+
+def pending_enrichment() -> Dict[str, Any]:
+    """Fields that queue a new resume document for enrichment (empty when enrichment is off)."""
+    return {"enrichment_status": ENRICH_PENDING, "enrichment_attempts": 0} if enrichment_enabled() else {}
+
+
+def text_sha256(text: str) -> str:
+    """Dedup key of resumes submitted as text (uploads are keyed by their file's SHA-256)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def rate_limit_delay(error: Exception) -> Optional[float]:
+    """Seconds to back off if `error` is a Groq 429 (its retry-after header when present), else None."""
+    if isinstance(error, RetryError) and error.last_attempt.exception() is not None:
+        error = error.last_attempt.exception()
+    if getattr(error, "status_code", None) != 429:
+        return None
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return LLM_ENRICH_RATE_LIMIT_BACKOFF_SECONDS
+
+
+class RequestPacer:
+    """Spaces calls evenly to stay under a requests-per-minute budget, with pauses after 429s"""
+
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+
+    def acquire(self) -> None:
+        """Block until this caller's slot."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._paused_until)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def paused_for(self) -> float:
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+
+class EnrichmentWorker:
+    """
+    Background LLM enrichment of stored resumes.
+
+    Resume documents queued with pending_enrichment() are claimed in batches (one atomic
+    update_many with a claim token, so several API instances can share the queue). Each
+    batch is deduplicated by content hash, first against resumes that already carry an
+    enrichment, then within the batch, so identical resumes cost one Groq call. Calls run
+    LLM_ENRICH_CONCURRENCY at a time, paced to LLM_ENRICH_REQUESTS_PER_MINUTE; a 429 pauses
+    the pacer for the server's retry-after and puts the resumes back in the queue.
+
+    Results are written back with one bulk_write (resumes and resume_blobs), and normalized
+    skills are merged into Candidate.skills_json with one bulk UPDATE per batch.
+    """
+
+    def __init__(self, concurrency: int = LLM_ENRICH_CONCURRENCY,
+                 requests_per_minute: int = LLM_ENRICH_REQUESTS_PER_MINUTE,
+                 batch_size: int = LLM_ENRICH_BATCH_SIZE,
+                 enrich: Callable[[Dict[str, Any]], Dict[str, Any]] = request_enrichment):
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.pacer = RequestPacer(requests_per_minute)
+        self._enrich = enrich
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.mongo_db = None
+        self.session_factory = None
+        self.on_enriched: Optional[Callable[[int, str], None]] = None
+        self.counters = {"enriched": 0, "llm_calls": 0, "dedup_hits": 0, "rate_limited": 0,
+                         "errors": 0, "failed": 0}
+
+    def attach(self, mongo_db, session_factory=None,
+               on_enriched: Optional[Callable[[int, str], None]] = None) -> None:
+        """Set the stores (and an optional per-resume callback) without starting the thread."""
+        self.mongo_db = mongo_db
+        self.session_factory = session_factory
+        self.on_enriched = on_enriched
+
+    def start(self, mongo_db, session_factory=None,
+              on_enriched: Optional[Callable[[int, str], None]] = None) -> None:
+        """
+        Start the worker thread.
+
+        Args:
+            mongo_db: Database holding `resumes` and `resume_blobs`
+            session_factory: SQLAlchemy session factory for the candidate skills merge
+            on_enriched: Called with (user_id, resume_id) for every enriched resume
+        """
+        self.attach(mongo_db, session_factory, on_enriched)
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="enrich")
+            self._thread = threading.Thread(target=self._run, name="enrichment-worker", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def wake(self) -> None:
+        """Process the queue now instead of at the next poll."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = self.process_batch()
+            except Exception as e:
+                print(f"[LLM] Enrichment batch failed: {e}")
+                claimed = 0
+            if not claimed:
+                self._wake.wait(LLM_ENRICH_POLL_SECONDS)
+                self._wake.clear()
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += amount
+
+    def _claim(self) -> List[Dict[str, Any]]:
+        resumes = self.mongo_db.resumes
+        now = datetime.utcnow()
+        # Claims of a crashed worker go back to the queue
+        resumes.update_many(
+            {"enrichment_status": ENRICH_RUNNING,
+             "enrichment_claimed_at": {"$lt": now - timedelta(seconds=LLM_ENRICH_CLAIM_TIMEOUT_SECONDS)}},
+            {"$set": {"enrichment_status": ENRICH_PENDING}},
+        )
+        ids = [doc["_id"] for doc in resumes.find({"enrichment_status": ENRICH_PENDING}, {"_id": 1})
+               .sort("_id", 1).limit(self.batch_size)]
+        if not ids:
+            return []
+        token = str(uuid.uuid4())
+        resumes.update_many(
+            {"_id": {"$in": ids}, "enrichment_status": ENRICH_PENDING},
+            {"$set": {"enrichment_status": ENRICH_RUNNING, "enrichment_claim": token,
+                      "enrichment_claimed_at": now}},
+        )
+        return list(resumes.find(
+            {"enrichment_claim": token, "enrichment_status": ENRICH_RUNNING},
+            {"resume_id": 1, "user_id": 1, "content_sha256": 1, "parsed_data": 1, "enrichment_attempts": 1},
+        ))
+
+    def process_batch(self) -> int:
+        """Claim, enrich and write back one batch; returns the number of resumes claimed."""
+        docs = self._claim()
+        if not docs:
+            return 0
+
+        by_key: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in docs:
+            key = doc.get("content_sha256") or text_sha256((doc.get("parsed_data") or {}).get("raw_text", ""))
+            by_key.setdefault(key, []).append(doc)
+
+        # Reuse enrichments of identical resumes (earlier uploads, or this one's cached blob)
+        results: Dict[str, Dict[str, Any]] = {}
+        for stored in self.mongo_db.resumes.find(
+            {"content_sha256": {"$in": list(by_key)}, "parsed_data.enriched.normalized_skills": {"$exists": True}},
+            {"content_sha256": 1, "parsed_data.enriched": 1},
+        ):
+            results.setdefault(stored["content_sha256"], stored["parsed_data"]["enriched"])
+        self._count("dedup_hits", sum(len(by_key[key]) for key in results))
+
+        to_call = [key for key in by_key if key not in results]
+        fresh: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, Tuple[str, bool]] = {}
+        calls = {key: self._submit(by_key[key][0]["parsed_data"]) for key in to_call}
+        for key, result in calls.items():
+            try:
+                fresh[key] = result()
+                self._count("llm_calls")
+            except Exception as e:
+                delay = rate_limit_delay(e)
+                if delay is not None:
+                    self.pacer.pause(delay)
+                    self._count("rate_limited")
+                else:
+                    self._count("errors")
+                errors[key] = (str(e), delay is not None)
+        results.update(fresh)
+
+        self._write_back(by_key, results, fresh, errors)
+        return len(docs)
+
+    def _submit(self, parsed_data: Dict[str, Any]) -> Callable[[], Dict[str, Any]]:
+        """Start one paced Groq call; returns a function that waits for its result."""
+        def call() -> Dict[str, Any]:
+            self.pacer.acquire()
+            return self._enrich(parsed_data)
+
+        if self._executor is None:  # not started (tests, one-off runs): call inline
+            return call
+        return self._executor.submit(call).result
+
+    def _write_back(self, by_key: Dict[str, List[Dict[str, Any]]], results: Dict[str, Dict[str, Any]],
+                    fresh: Dict[str, Dict[str, Any]], errors: Dict[str, Tuple[str, bool]]) -> None:
+        now = datetime.utcnow()
+        resume_ops, blob_ops = [], []
+        skills_by_user: Dict[int, List[str]] = {}
+        enriched_docs = []
+        for key, docs in by_key.items():
+            for doc in docs:
+                if key in results:
+                    resume_ops.append(UpdateOne({"_id": doc["_id"]}, {
+                        "$set": {"parsed_data.enriched": results[key], "enrichment_status": ENRICH_DONE,
+                                 "enriched_at": now},
+                        "$unset": {"enrichment_claim": "", "enrichment_error": ""},
+                    }))
+                    enriched_docs.append(doc)
+                    if doc.get("user_id") is not None:
+                        skills_by_user.setdefault(doc["user_id"], []).extend(
+                            results[key].get("normalized_skills") or [])
+                    continue
+                message, rate_limited = errors[key]
+                # Rate-limited calls are retried without using up an attempt
+                attempts = (doc.get("enrichment_attempts") or 0) + (0 if rate_limited else 1)
+                failed = attempts >= LLM_ENRICH_MAX_ATTEMPTS
+                resume_ops.append(UpdateOne({"_id": doc["_id"]}, {
+                    "$set": {"enrichment_status": ENRICH_FAILED if failed else ENRICH_PENDING,
+                             "enrichment_attempts": attempts, "enrichment_error": message},
+                    "$unset": {"enrichment_claim": ""},
+                }))
+                self._count("failed", int(failed))
+            if key in fresh:
+                # Future uploads of the same file get the enrichment with the cached parse
+                blob_ops.append(UpdateOne({"_id": key}, {"$set": {"enriched": fresh[key]}}))
+
+        if resume_ops:
+            self.mongo_db.resumes.bulk_write(resume_ops, ordered=False)
+        if blob_ops:
+            self.mongo_db.resume_blobs.bulk_write(blob_ops, ordered=False)
+        if USE_LLM_RESUME_ENRICH_UPDATE_CANDIDATE and self.session_factory is not None:
+            merge_candidate_skills(self.session_factory, skills_by_user)
+        self._count("enriched", len(enriched_docs))
+        if self.on_enriched:
+            for doc in enriched_docs:
+                if doc.get("user_id") is not None:
+                    self.on_enriched(doc["user_id"], doc.get("resume_id"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Backlog (queued / in-progress / failed resumes) plus this process's counters."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.counters)
+        stats.update({
+            "running": self._thread is not None and self._thread.is_alive(),
+            "concurrency": self.concurrency,
+            "requests_per_minute": round(60.0 / self.pacer.interval) if self.pacer.interval else 0,
+            "paused_seconds": round(self.pacer.paused_for(), 1),
+        })
+        if self.mongo_db is not None:
+            counts = {row["_id"]: row["count"] for row in self.mongo_db.resumes.aggregate([
+                {"$match": {"enrichment_status": {"$in": [ENRICH_PENDING, ENRICH_RUNNING, ENRICH_FAILED]}}},
+                {"$group": {"_id": "$enrichment_status", "count": {"$sum": 1}}},
+            ])}
+            stats.update({
+                "backlog": counts.get(ENRICH_PENDING, 0),
+                "in_progress": counts.get(ENRICH_RUNNING, 0),
+                "failed_total": counts.get(ENRICH_FAILED, 0),
+            })
+        return stats
+
+
+def merge_candidate_skills(session_factory, skills_by_user: Dict[int, List[str]]) -> None:
+    """Merge normalized skills into Candidate.skills_json: one SELECT and one executemany UPDATE."""
+    from sqlalchemy import update
+    from database.models import Candidate
+
+    if not skills_by_user:
+        return
+    db = session_factory()
+    try:
+        rows = (
+            db.query(Candidate.id, Candidate.user_id, Candidate.skills_json)
+            .filter(Candidate.user_id.in_(list(skills_by_user)))
+            .all()
+        )
+        updates = []
+        for candidate_id, user_id, existing_skills in rows:
+            merged = sorted({s.strip() for s in ((existing_skills or []) + skills_by_user[user_id]) if s})
+            if merged != (existing_skills or []):
+                updates.append({"id": candidate_id, "skills_json": merged})
+        if updates:
+            db.execute(update(Candidate), updates)
+            db.commit()
+    finally:
+        db.close()
+
+
+def ensure_indexes(mongo_db) -> None:
+    """The worker polls resumes by enrichment status and claim token."""
+    mongo_db.resumes.create_index("enrichment_status", sparse=True)
+    mongo_db.resumes.create_index("enrichment_claim", sparse=True)
+
+
+_worker: Optional[EnrichmentWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_enrichment_worker() -> EnrichmentWorker:
+    """Process-wide enrichment worker."""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = EnrichmentWorker()
+    return _worker
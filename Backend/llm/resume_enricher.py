@@ -40,6 +40,33 @@ def _build_enrichment_prompt(parsed_data: Dict[str, Any]) -> str:
     )
 
 
+def request_enrichment(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One Groq completion enriching parsed resume data with normalized skills and meta information.
+
+    Unlike enrich_resume, errors (including rate limiting) are raised to the caller.
+    """
+    client = get_groq_client()
+    system_prompt = (
+        "You turn parsed resume data into a clean, compact JSON summary for an ATS system. "
+        "Always return valid JSON only."
+    )
+    user_prompt = _build_enrichment_prompt(parsed_data)
+    result = client.chat_json(system_prompt=system_prompt, user_prompt=user_prompt)
+
+    # Ensure expected keys exist
+    enriched: Dict[str, Any] = {
+        "normalized_skills": result.get("normalized_skills", []),
+        "inferred_role": result.get("inferred_role", "unknown"),
+        "seniority": result.get("seniority", "unknown"),
+        "summary": result.get("summary", ""),
+        "strengths": result.get("strengths", []),
+        "weaknesses": result.get("weaknesses", []),
+        "recommended_keywords": result.get("recommended_keywords", []),
+    }
+    return enriched
+
+
 def enrich_resume(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Use Groq to enrich parsed resume data with normalized skills and meta information.
@@ -50,27 +77,8 @@ def enrich_resume(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         return {}
 
     try:
-        client = get_groq_client()
-        system_prompt = (
-            "You turn parsed resume data into a clean, compact JSON summary for an ATS system. "
-            "Always return valid JSON only."
-        )
-        user_prompt = _build_enrichment_prompt(parsed_data)
-        result = client.chat_json(system_prompt=system_prompt, user_prompt=user_prompt)
-
-        # Ensure expected keys exist
-        enriched: Dict[str, Any] = {
-            "normalized_skills": result.get("normalized_skills", []),
-            "inferred_role": result.get("inferred_role", "unknown"),
-            "seniority": result.get("seniority", "unknown"),
-            "summary": result.get("summary", ""),
-            "strengths": result.get("strengths", []),
-            "weaknesses": result.get("weaknesses", []),
-            "recommended_keywords": result.get("recommended_keywords", []),
-        }
-        return enriched
+        return request_enrichment(parsed_data)
     except Exception as e:
         # Enrichment is optional; swallow errors and proceed without it
         print(f"[LLM] Resume enrichment failed: {e}")
         return {}
-
@@ -8,18 +8,35 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from datetime import datetime
 from sqlalchemy import text
+import asyncio
 import os
 
 from config import (
     APP_NAME, APP_VERSION, APP_DESCRIPTION,
-    CORS_ORIGINS, UPLOAD_DIR
+    CORS_ORIGINS, UPLOAD_DIR, MODEL_WARMUP, MODEL_IDLE_UNLOAD_SECONDS, ATS_MEMO_ENABLED, RESUME_DEDUP_ENABLED,
+    BULK_INGEST_MAX_ARCHIVE_SIZE, EXTRACTION_SETTINGS, WORKER_POOL_SIZE, WORKER_POOL_START_METHOD
 )
 from database.postgres import engine, Base
+from model_registry import get_model_registry, register_default_models
+from worker_pool import configure_pools, shutdown_pools
+from document_extraction import configure_document_extractor
+from upload_reader import UploadSizeLimitMiddleware
+from ats_memo import get_ats_memo
+from resume_blobs import ensure_indexes as ensure_resume_blob_indexes
+from resume_ingest import ensure_indexes as ensure_ingest_indexes
+from llm.enrichment_worker import enrichment_enabled, get_enrichment_worker
+from llm.enrichment_worker import ensure_indexes as ensure_enrichment_indexes
+from vector.batcher import embedding_batcher_stats, shutdown_embedding_batcher
+from vector.reindex import ensure_indexes as ensure_reindex_indexes
 # MongoDB client will be imported where needed to handle None case
 
 # Import routers
 from routers import auth, resume, ats, feedback, student, jobs, candidates, chat, vector, recruiter_llm, job_llm, analytics_llm, tpo, hr, badges, prep, aptitude, notifications, mentorship, events, messages, jd_analyzer
 
+# Process pools and document extraction take their settings from config.py
+configure_pools(WORKER_POOL_SIZE, WORKER_POOL_START_METHOD)
+configure_document_extractor(**EXTRACTION_SETTINGS)
+
 # Initialize FastAPI app
 app = FastAPI(
     title=APP_NAME,
@@ -29,6 +46,12 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Reject oversized uploads while they stream in (added first so CORS headers wrap the 413)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path_limits={f"{resume.router.prefix}/bulk": BULK_INGEST_MAX_ARCHIVE_SIZE},
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -63,6 +86,17 @@ app.include_router(messages.router)
 app.include_router(jd_analyzer.router)
 
 
+# Background task unloading idle models (MODEL_IDLE_UNLOAD_SECONDS)
+_model_unload_task = None
+
+
+async def _unload_idle_models():
+    while True:
+        await asyncio.sleep(max(MODEL_IDLE_UNLOAD_SECONDS / 4, 1))
+        for key in get_model_registry().unload_unused(MODEL_IDLE_UNLOAD_SECONDS):
+            print(f"Model unloaded after {MODEL_IDLE_UNLOAD_SECONDS}s idle: {key}")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database connections on startup"""
@@ -79,6 +113,63 @@ async def startup_event():
         print(f"Warning: Could not create database tables: {e}")
         print("You may need to run migrations manually: alembic upgrade head")
     
+    # Optionally load shared ML models before serving the first request
+    register_default_models()
+    if MODEL_WARMUP:
+        for key, error in get_model_registry().warm_up().items():
+            if error:
+                print(f"Warning: Could not warm up model {key}: {error}")
+            else:
+                print(f"Model warmed up: {key}")
+    if MODEL_IDLE_UNLOAD_SECONDS > 0:
+        global _model_unload_task
+        _model_unload_task = asyncio.create_task(_unload_idle_models())
+    
+    # Share memoized ATS results across workers and restarts through MongoDB
+    if ATS_MEMO_ENABLED:
+        try:
+            from database.mongodb import get_mongo_db
+            get_ats_memo().attach_store(get_mongo_db().ats_memo)
+        except Exception as e:
+            print(f"Warning: ATS memo running in-process only: {e}")
+    
+    # Resumes are looked up by content hash for upload deduplication
+    if RESUME_DEDUP_ENABLED:
+        try:
+            from database.mongodb import get_mongo_db
+            ensure_resume_blob_indexes(get_mongo_db())
+        except Exception as e:
+            print(f"Warning: Could not create resume_blobs indexes: {e}")
+    
+    # Bulk ingest jobs, asynchronous uploads and Qdrant reindexes are polled by id
+    try:
+        from database.mongodb import get_mongo_db
+        ensure_ingest_indexes(get_mongo_db())
+        get_mongo_db().resume_processing.create_index("processing_id", unique=True)
+        ensure_reindex_indexes(get_mongo_db())
+    except Exception as e:
+        print(f"Warning: Could not create ingest_jobs / resume_processing / reindex_jobs indexes: {e}")
+    
+    # Resume enrichment runs in a background worker, never inside upload requests
+    if enrichment_enabled():
+        try:
+            from database.mongodb import get_mongo_db
+            from database.postgres import SessionLocal
+            loop = asyncio.get_running_loop()
+
+            def on_enriched(user_id, resume_id):
+                # Called from the worker thread; notification queues live on the event loop
+                loop.call_soon_threadsafe(
+                    notifications.notify_user, user_id, {"type": "resume_enriched", "resume_id": resume_id}
+                )
+
+            mongo_db = get_mongo_db()
+            ensure_enrichment_indexes(mongo_db)
+            get_enrichment_worker().start(mongo_db, SessionLocal, on_enriched=on_enriched)
+            print("Resume enrichment worker started")
+        except Exception as e:
+            print(f"Warning: Resume enrichment worker not started: {e}")
+    
     print("="*60)
     print(f"{APP_NAME} - Starting Server")
     print("="*60)
@@ -89,6 +180,11 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close database connections on shutdown"""
+    if _model_unload_task is not None:
+        _model_unload_task.cancel()
+    get_enrichment_worker().stop()
+    shutdown_embedding_batcher()
+    shutdown_pools()
     if mongo_client is not None:
         try:
             mongo_client.close()
@@ -173,6 +269,18 @@ async def health_check():
     }
 
 
+@app.get("/health/models")
+async def models_health():
+    """Report models resident in the process-wide registry, their memory footprint and embedding batching"""
+    report = get_model_registry().memory_report()
+    return {
+        "models": report,
+        "total_memory_bytes": sum(entry["memory_bytes"] for entry in report),
+        "embedding_batcher": embedding_batcher_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     from config import API_HOST, API_PORT
@@ -0,0 +1,290 @@
+"""
+Model Registry Module
+Process-wide, lazily loaded and reference-counted store for heavyweight ML models
+(sentence-transformers encoders, Hugging Face pipelines) shared by every engine and router.
+
+Callers hold a model through a lease for as long as they use it:
+
+    with lease_sentence_transformer(model_name) as model:
+        model.encode(texts)
+
+A model without leases stays resident (later leases are free) until `unload_unused`
+drops it; with MODEL_IDLE_UNLOAD_SECONDS set, main.py does that for models idle that long.
+
+Sentence encoders have two inference backends: "torch" (the full-precision PyTorch model)
+and "onnx-int8" (the same model exported to ONNX with dynamic int8 quantization and run by
+ONNX Runtime on CPU; create it with `python quantize_embedder.py export`).
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config import EMBEDDING_BACKEND, EMBEDDING_ONNX_DIR, EMBEDDING_ONNX_QUANTIZATION
+
+
+DEFAULT_SENTENCE_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_TEXT_GENERATION_MODEL = "gpt2"
+
+TORCH_BACKEND = "torch"
+ONNX_INT8_BACKEND = "onnx-int8"
+EMBEDDING_BACKENDS = (TORCH_BACKEND, ONNX_INT8_BACKEND)
+
+
+class _ModelEntry:
+    """Bookkeeping for a single registered model"""
+
+    def __init__(self, key: str, loader: Callable[[], Any]):
+        self.key = key
+        self.loader = loader
+        self.model: Any = None
+        self.refcount = 0
+        self.last_used = time.monotonic()
+        self.load_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.lock = threading.Lock()
+
+
+class ModelLease:
+    """
+    One reference to a registry model, released exactly once.
+
+    Use it as a context manager (`with registry.lease(key) as model:`) or keep it and call
+    `release()` when done with `model`.
+    """
+
+    def __init__(self, registry: "ModelRegistry", key: str, model: Any):
+        self._registry = registry
+        self.key = key
+        self.model = model
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._registry.release(self.key)
+
+    def __enter__(self) -> Any:
+        return self.model
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class ModelRegistry:
+    """
+    Holds one instance of each model per process.
+
+    Models are loaded on first acquisition (under a per-model lock, so concurrent first
+    callers share one load and loading one model never blocks callers of another) and
+    kept resident until every lease is released and `unload_unused` is called.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _ModelEntry] = {}
+
+    def register(self, key: str, loader: Callable[[], Any]) -> None:
+        """Register a loader for a model key. Re-registering an existing key is a no-op."""
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = _ModelEntry(key, loader)
+
+    def acquire(self, key: str) -> Any:
+        """Return the model for `key`, loading it on first use, and take a reference to it."""
+        entry = self._get_entry(key)
+        with entry.lock:
+            if entry.model is None:
+                started = time.perf_counter()
+                try:
+                    entry.model = entry.loader()
+                except Exception as e:
+                    entry.error = str(e)
+                    raise
+                entry.error = None
+                entry.load_seconds = time.perf_counter() - started
+            entry.refcount += 1
+            return entry.model
+
+    def release(self, key: str) -> None:
+        """Drop one reference to a model. The model stays loaded until `unload_unused`."""
+        entry = self._get_entry(key)
+        with entry.lock:
+            if entry.refcount > 0:
+                entry.refcount -= 1
+            entry.last_used = time.monotonic()
+
+    def lease(self, key: str) -> ModelLease:
+        """Acquire the model for `key` as a lease (a context manager yielding the model)."""
+        return ModelLease(self, key, self.acquire(key))
+
+    def unload_unused(self, idle_seconds: float = 0) -> List[str]:
+        """
+        Unload every model without leases that has not been used for `idle_seconds`.
+        Returns the unloaded keys; the next lease loads a model again.
+        """
+        now = time.monotonic()
+        unloaded = []
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            with entry.lock:
+                if entry.model is not None and entry.refcount == 0 and now - entry.last_used >= idle_seconds:
+                    entry.model = None
+                    unloaded.append(entry.key)
+        return unloaded
+
+    def is_loaded(self, key: str) -> bool:
+        """Whether the model for `key` is currently resident."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry is not None and entry.model is not None
+
+    def warm_up(self, keys: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Load models ahead of the first request.
+
+        Warm-up loads do not keep a lease. Returns a mapping of key -> error message
+        (None when the model loaded successfully).
+        """
+        with self._lock:
+            targets = list(keys) if keys is not None else list(self._entries.keys())
+        results: Dict[str, Optional[str]] = {}
+        for key in targets:
+            try:
+                self.lease(key).release()
+                results[key] = None
+            except Exception as e:
+                results[key] = str(e)
+        return results
+
+    def memory_report(self) -> List[Dict[str, Any]]:
+        """Report registered models with their load state, leases and estimated memory footprint."""
+        with self._lock:
+            entries = list(self._entries.values())
+        report = []
+        for entry in entries:
+            report.append({
+                "key": entry.key,
+                "loaded": entry.model is not None,
+                "refcount": entry.refcount,
+                "load_seconds": round(entry.load_seconds, 3) if entry.load_seconds is not None else None,
+                "memory_bytes": _estimate_model_bytes(entry.model) if entry.model is not None else 0,
+                "error": entry.error,
+            })
+        return report
+
+    def _get_entry(self, key: str) -> _ModelEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(f"Model '{key}' is not registered")
+        return entry
+
+
+def _estimate_model_bytes(model: Any) -> int:
+    """Sum parameter and buffer sizes of a torch-backed model (or a pipeline wrapping one)."""
+    module = getattr(model, "model", model)  # transformers pipelines expose `.model`
+    total = 0
+    try:
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            total += tensor.numel() * tensor.element_size()
+    except Exception:
+        return 0
+    return total
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Accessor for the process-wide registry."""
+    return _registry
+
+
+def sentence_transformer_key(model_name: str, backend: str = TORCH_BACKEND) -> str:
+    key = f"sentence-transformer:{model_name}"
+    return key if backend == TORCH_BACKEND else f"{key}:{backend}"
+
+
+def text_generator_key(model_name: str) -> str:
+    return f"text-generation:{model_name}"
+
+
+def onnx_int8_dir(model_name: str) -> str:
+    """Directory holding the exported int8 ONNX version of `model_name`."""
+    return os.path.join(EMBEDDING_ONNX_DIR, model_name.replace("/", "__"))
+
+
+def onnx_int8_file(quantization: str = EMBEDDING_ONNX_QUANTIZATION) -> str:
+    """ONNX file (relative to the model directory) written by sentence-transformers' int8 export."""
+    return f"onnx/model_qint8_{quantization}.onnx"
+
+
+def register_sentence_transformer(model_name: str = DEFAULT_SENTENCE_MODEL,
+                                  backend: str = TORCH_BACKEND) -> str:
+    """Register a sentence-transformers encoder for an inference backend and return its registry key."""
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}' (expected one of {', '.join(EMBEDDING_BACKENDS)})")
+
+    def _load():
+        if backend == TORCH_BACKEND:
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(model_name)
+        model_dir = onnx_int8_dir(model_name)
+        file_name = onnx_int8_file()
+        if not os.path.exists(os.path.join(model_dir, file_name)):
+            raise FileNotFoundError(
+                f"No int8 ONNX export of {model_name} at {os.path.join(model_dir, file_name)}; "
+                f"run `python quantize_embedder.py export`"
+            )
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(
+            model_dir,
+            backend="onnx",
+            model_kwargs={"file_name": file_name, "provider": "CPUExecutionProvider"},
+        )
+
+    key = sentence_transformer_key(model_name, backend)
+    _registry.register(key, _load)
+    return key
+
+
+def register_text_generator(model_name: str = DEFAULT_TEXT_GENERATION_MODEL) -> str:
+    """Register a CPU text-generation pipeline and return its registry key."""
+    def _load():
+        from transformers import pipeline
+        return pipeline(
+            "text-generation",
+            model=model_name,
+            max_length=200,
+            device=-1  # CPU
+        )
+
+    key = text_generator_key(model_name)
+    _registry.register(key, _load)
+    return key
+
+
+def lease_sentence_transformer(model_name: str = DEFAULT_SENTENCE_MODEL,
+                               backend: str = TORCH_BACKEND) -> ModelLease:
+    """Lease the shared SentenceTransformer instance for `model_name` on `backend`."""
+    return _registry.lease(register_sentence_transformer(model_name, backend))
+
+
+def lease_text_generator(model_name: str = DEFAULT_TEXT_GENERATION_MODEL) -> ModelLease:
+    """Lease the shared text-generation pipeline for `model_name`."""
+    return _registry.lease(register_text_generator(model_name))
+
+
+def register_default_models() -> List[str]:
+    """Register the models used by the student engine and vector search."""
+    keys = [
+        register_sentence_transformer(DEFAULT_SENTENCE_MODEL),
+        register_text_generator(DEFAULT_TEXT_GENERATION_MODEL),
+    ]
+    if EMBEDDING_BACKEND != TORCH_BACKEND:
+        # vector/embedder.LocalEmbedder runs on the configured backend
+        keys.append(register_sentence_transformer(DEFAULT_SENTENCE_MODEL, EMBEDDING_BACKEND))
+    return keys
@@ -25,7 +25,11 @@ class ResumeData(BaseModel):
     experience: List[Dict] = []
     certifications: List[str] = []
     projects: List[Dict] = []
+    section_offsets: Dict[str, List[List[int]]] = Field(
+        default_factory=dict, description="[start, end) offsets into raw_text by section label (see resume_sections)"
+    )
     raw_text: str = ""
+    features: Optional[Dict] = Field(None, exclude=True, description="Precomputed feature record (see resume_features)")
 
 
 class ATSResult(BaseModel):
@@ -0,0 +1,171 @@
+"""
+Quantized embedding backend tool
+Run with: python quantize_embedder.py export [--model all-MiniLM-L6-v2] [--quantization avx2]
+          python quantize_embedder.py validate [--source synthetic|db] [--top-k 10]
+
+export:   exports the sentence-transformers model to ONNX and writes its dynamic int8
+          quantization to EMBEDDING_ONNX_DIR/<model>/onnx/model_qint8_<quantization>.onnx,
+          the file the "onnx-int8" backend (EMBEDDING_BACKEND) loads.
+validate: embeds the job corpus and a set of student queries with both backends and reports
+          how closely the int8 model agrees with PyTorch: per-text cosine similarity between
+          the two vectors, and the overlap of each query's top-k jobs. Exits with status 1
+          when the agreement is below --min-cosine / --min-overlap.
+
+Needs sentence-transformers>=3.2 with the ONNX extras (optimum[onnxruntime]).
+"""
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List
+
+import numpy as np
+
+from config import EMBEDDING_ONNX_QUANTIZATION
+from model_registry import (
+    DEFAULT_SENTENCE_MODEL,
+    ONNX_INT8_BACKEND,
+    TORCH_BACKEND,
+    lease_sentence_transformer,
+    onnx_int8_dir,
+    onnx_int8_file,
+)
+from vector.job_index import job_search_text, job_to_search_dict, top_k_indices
+
+
+def compare_backends(reference_jobs: np.ndarray, candidate_jobs: np.ndarray,
+                     reference_queries: np.ndarray, candidate_queries: np.ndarray,
+                     top_k: int = 10) -> Dict[str, Any]:
+    """
+    Agreement of a candidate backend with the reference backend.
+
+    All inputs are L2-normalized embedding matrices; row i of a candidate matrix embeds
+    the same text as row i of the matching reference matrix.
+
+    Returns:
+        Cosine similarity between the two embeddings of each text (mean / min / 5th
+        percentile, jobs and queries together), mean overlap of the top-k jobs per query,
+        and the share of queries whose best job is the same
+    """
+    cosines = np.concatenate([
+        np.einsum("ij,ij->i", reference_jobs, candidate_jobs),
+        np.einsum("ij,ij->i", reference_queries, candidate_queries),
+    ])
+    k = min(top_k, reference_jobs.shape[0])
+    overlaps, same_top1 = [], 0
+    for reference_query, candidate_query in zip(reference_queries, candidate_queries):
+        expected = top_k_indices(reference_jobs @ reference_query, k)
+        actual = top_k_indices(candidate_jobs @ candidate_query, k)
+        if k:
+            overlaps.append(len(set(expected.tolist()) & set(actual.tolist())) / k)
+            same_top1 += int(expected[0] == actual[0])
+    queries = max(1, len(overlaps))
+    return {
+        "texts": int(cosines.shape[0]),
+        "cosine_mean": float(cosines.mean()) if cosines.size else 1.0,
+        "cosine_min": float(cosines.min()) if cosines.size else 1.0,
+        "cosine_p5": float(np.percentile(cosines, 5)) if cosines.size else 1.0,
+        "top_k": k,
+        "top_k_overlap": float(sum(overlaps) / queries) if overlaps else 1.0,
+        "top1_agreement": same_top1 / queries,
+    }
+
+
+def load_corpus(source: str, jobs: int, queries: int, seed: int):
+    """(job texts, query texts) from the synthetic benchmark corpus or the jobs table"""
+    from benchmarks.corpus import generate_corpus
+
+    corpus = generate_corpus(resumes=0, jobs=jobs, queries=queries, seed=seed)
+    query_texts = [query["query"] for query in corpus["queries"]]
+    if source == "db":
+        from database.models import Job
+        from database.postgres import SessionLocal
+
+        db = SessionLocal()
+        try:
+            job_dicts = [job_to_search_dict(job) for job in db.query(Job).all()]
+        finally:
+            db.close()
+    else:
+        job_dicts = [
+            {"id": job["id"], "title": job["title"], "description": job["description"],
+             "requirements": ", ".join(job["requirements"]["required_skills"])}
+            for job in corpus["jobs"]
+        ]
+    return [job_search_text(job) for job in job_dicts], query_texts
+
+
+def encode(model, texts: List[str]) -> np.ndarray:
+    return np.asarray(model.encode(texts, normalize_embeddings=True, batch_size=32), dtype=np.float32)
+
+
+def export(model_name: str, quantization: str) -> str:
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    output_dir = onnx_int8_dir(model_name)
+    # The ONNX backend exports the fp32 graph (onnx/model.onnx) on load; saving it also writes
+    # the tokenizer and pooling config the quantized model is loaded with
+    model = SentenceTransformer(model_name, backend="onnx")
+    model.save_pretrained(output_dir)
+    export_dynamic_quantized_onnx_model(model, quantization, output_dir)
+    return os.path.join(output_dir, onnx_int8_file(quantization))
+
+
+def validate(args) -> int:
+    job_texts, query_texts = load_corpus(args.source, args.jobs, args.queries, args.seed)
+    if not job_texts:
+        print("Error: no jobs to compare")
+        return 1
+    print(f"Comparing {ONNX_INT8_BACKEND} with {TORCH_BACKEND} on {len(job_texts)} jobs "
+          f"and {len(query_texts)} queries ({args.source})")
+
+    embeddings = {}
+    for backend in (TORCH_BACKEND, ONNX_INT8_BACKEND):
+        with lease_sentence_transformer(args.model, backend) as model:
+            embeddings[backend] = (encode(model, job_texts), encode(model, query_texts))
+    torch_jobs, torch_queries = embeddings[TORCH_BACKEND]
+    int8_jobs, int8_queries = embeddings[ONNX_INT8_BACKEND]
+    report = compare_backends(torch_jobs, int8_jobs, torch_queries, int8_queries, top_k=args.top_k)
+
+    print(f"  cosine (int8 vs fp32): mean {report['cosine_mean']:.4f}, "
+          f"p5 {report['cosine_p5']:.4f}, min {report['cosine_min']:.4f}")
+    print(f"  top-{report['top_k']} overlap: {report['top_k_overlap']:.3f}, "
+          f"same best job: {report['top1_agreement']:.3f}")
+    passed = report["cosine_mean"] >= args.min_cosine and report["top_k_overlap"] >= args.min_overlap
+    print(f"\n[{'OK' if passed else 'X'}] thresholds: mean cosine >= {args.min_cosine}, "
+          f"top-k overlap >= {args.min_overlap}")
+    return 0 if passed else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--model", default=DEFAULT_SENTENCE_MODEL)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="write the int8 ONNX model")
+    export_parser.add_argument("--quantization", default=EMBEDDING_ONNX_QUANTIZATION,
+                               choices=["arm64", "avx2", "avx512", "avx512_vnni"],
+                               help="target instruction set of the quantized kernels")
+
+    validate_parser = commands.add_parser("validate", help="compare the int8 backend with PyTorch")
+    validate_parser.add_argument("--source", choices=["synthetic", "db"], default="synthetic",
+                                 help="synthetic benchmark jobs or the jobs table")
+    validate_parser.add_argument("--jobs", type=int, default=200, help="synthetic jobs")
+    validate_parser.add_argument("--queries", type=int, default=100)
+    validate_parser.add_argument("--top-k", type=int, default=10)
+    validate_parser.add_argument("--min-cosine", type=float, default=0.98)
+    validate_parser.add_argument("--min-overlap", type=float, default=0.8)
+    validate_parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        path = export(args.model, args.quantization)
+        print(f"Wrote {path}")
+        if args.quantization != EMBEDDING_ONNX_QUANTIZATION:
+            print(f"Set EMBEDDING_ONNX_QUANTIZATION={args.quantization} to load it")
+        return 0
+    return validate(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Resume Blobs Module
+Content-addressed cache of parsed resumes in the MongoDB `resume_blobs` collection.
+
+Uploads are identified by the SHA-256 of their bytes. When the same file has been parsed
+before (by any user), its stored parsed_data, feature record and LLM enrichment are
+reused instead of re-running extraction, the regex extractors and enrich_resume. Blobs
+written by an older PARSER_VERSION are ignored and overwritten on the next upload.
+"""
+
+import hashlib
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from document_extraction import DocumentSource
+from resume_features import compute_resume_features, features_are_current
+from resume_parser import PARSER_VERSION
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def content_sha256(source: DocumentSource) -> str:
+    """SHA-256 of a document's bytes (file objects are read in chunks and rewound)."""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif hasattr(source, "read"):
+        source.seek(0)
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        source.seek(0)
+    else:
+        with open(os.fspath(source), "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResumeBlobCache:
+    """Lookups and writes against `resume_blobs`, with per-process hit counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def lookup(self, collection, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored parse of a file, or None.
+
+        Returns:
+            Dictionary with 'parsed_data', 'features' (recomputed if stale) and 'enriched'
+        """
+        try:
+            blob = collection.find_one(
+                {"_id": content_hash, "parser_version": PARSER_VERSION},
+                {"parsed_data": 1, "features": 1, "enriched": 1}
+            )
+        except Exception:
+            blob = None
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            if blob is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        features = blob.get("features")
+        if not features_are_current(features):
+            features = compute_resume_features(blob["parsed_data"])
+            self.record_features(collection, content_hash, features)
+        return {"parsed_data": blob["parsed_data"], "features": features, "enriched": blob.get("enriched")}
+
+    def record_features(self, collection, content_hash: str, features: Dict) -> None:
+        try:
+            collection.update_one({"_id": content_hash}, {"$set": {"features": features}})
+        except Exception:
+            with self._lock:
+                self.errors += 1
+
+    def record_upload(self, collection, content_hash: str, parsed_data: Optional[Dict] = None,
+                      features: Optional[Dict] = None, enriched: Optional[Dict] = None,
+                      size: Optional[int] = None) -> None:
+        """Count an upload of a file and store whichever parse results are given (best effort)."""
+        now = datetime.utcnow()
+        fields: Dict[str, Any] = {"last_seen_at": now}
+        if parsed_data is not None:
+            fields.update({"parsed_data": parsed_data, "parser_version": PARSER_VERSION})
+        if features is not None:
+            fields["features"] = features
+        if enriched is not None:
+            fields["enriched"] = enriched
+        if size is not None:
+            fields["size"] = size
+        try:
+            collection.update_one(
+                {"_id": content_hash},
+                {"$set": fields, "$inc": {"upload_count": 1}, "$setOnInsert": {"created_at": now}},
+                upsert=True
+            )
+        except Exception:
+            with self._lock:
+                self.errors += 1
+
+    def stats(self, collection=None) -> Dict[str, Any]:
+        """This process's hit rate, plus collection-wide dedup figures when a collection is given."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats: Dict[str, Any] = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        if collection is not None:
+            totals = list(collection.aggregate([
+                {"$group": {"_id": None, "blobs": {"$sum": 1}, "uploads": {"$sum": "$upload_count"}}}
+            ]))
+            blobs = totals[0]["blobs"] if totals else 0
+            uploads = totals[0]["uploads"] if totals else 0
+            stats.update({
+                "stored_blobs": blobs,
+                "total_uploads": uploads,
+                "duplicate_uploads": uploads - blobs,
+                "dedup_rate": round((uploads - blobs) / uploads, 4) if uploads else 0.0,
+            })
+        return stats
+
+
+def ensure_indexes(mongo_db) -> None:
+    """Index resumes by content hash (resume_blobs is keyed by it already)."""
+    mongo_db.resumes.create_index("content_sha256")
+
+
+_cache: Optional[ResumeBlobCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_resume_blob_cache() -> ResumeBlobCache:
+    """Process-wide resume blob cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResumeBlobCache()
+    return _cache
@@ -0,0 +1,116 @@
+"""
+Resume Features Module
+Compact, versioned feature record computed once when a resume is parsed and stored next
+to `parsed_data`, so the ATS engine does not re-lowercase and re-scan the raw text for
+every evaluation.
+
+Bump FEATURE_VERSION whenever the computation below changes; stored records with an
+older version are recomputed lazily by the ATS engine.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+from models import ResumeData
+from skill_matcher import normalize_skill
+
+
+FEATURE_VERSION = 2
+
+# Education hierarchy used by the ATS education score (dict order matters there)
+EDUCATION_HIERARCHY: Dict[str, int] = {
+    'phd': 5, 'doctorate': 5,
+    'master': 4, 'm.sc': 4, 'm.tech': 4, 'mba': 4, 'm.e': 4,
+    'bachelor': 3, 'b.sc': 3, 'b.tech': 3, 'b.e': 3, 'b.a': 3,
+    'diploma': 2, 'certificate': 1
+}
+
+YEARS_PATTERN = re.compile(r'(\d+\.?\d*)\s*(?:years?|yrs?|year)', re.IGNORECASE)
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STANDARD_SECTIONS = ('education', 'experience', 'skill')
+
+
+def max_years_in_text(text: str) -> float:
+    """Largest "N years" / "N yrs" figure mentioned in the text (0 if none)."""
+    total_years = 0.0
+    for match in YEARS_PATTERN.findall(text):
+        try:
+            total_years = max(total_years, float(match))
+        except ValueError:
+            continue
+    return total_years
+
+
+def education_rank(education: List[Dict]) -> int:
+    """Highest education level found in the parsed education entries (0 if unknown)."""
+    education_text = ' '.join([str(edu) for edu in education]).lower()
+    level = 0
+    for key, rank in EDUCATION_HIERARCHY.items():
+        if key in education_text:
+            level = max(level, rank)
+    return level
+
+
+def compute_resume_features(resume: Union[ResumeData, Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the feature record for a parsed resume.
+
+    Args:
+        resume: ResumeData or the `parsed_data` dict produced by ResumeParser
+
+    Returns:
+        JSON-serializable dictionary tagged with FEATURE_VERSION
+    """
+    if isinstance(resume, ResumeData):
+        resume = {
+            'name': resume.name, 'email': resume.email, 'phone': resume.phone,
+            'skills': resume.skills, 'education': resume.education,
+            'experience': resume.experience, 'raw_text': resume.raw_text,
+        }
+    raw_text = resume.get('raw_text') or ''
+    text_lower = raw_text.lower()
+    skills = resume.get('skills') or []
+    experience = resume.get('experience') or []
+
+    max_years = max_years_in_text(raw_text)
+    for exp in experience:
+        if exp.get('duration'):
+            max_years = max(max_years, max_years_in_text(str(exp['duration'])))
+
+    # Hash of every parsed field the ATS engine reads: identical fingerprints score identically
+    fingerprint_source = json.dumps(
+        [FEATURE_VERSION, resume.get('name'), resume.get('email'), resume.get('phone'),
+         skills, resume.get('education') or [], experience, raw_text],
+        sort_keys=True, default=str
+    )
+
+    return {
+        'version': FEATURE_VERSION,
+        'fingerprint': hashlib.sha1(fingerprint_source.encode('utf-8')).hexdigest(),
+        'skills': list(dict.fromkeys(normalize_skill(skill) for skill in skills)),
+        'skill_count': len(skills),
+        'tokens': sorted(set(TOKEN_PATTERN.findall(text_lower))),
+        'max_years': max_years,
+        'education_rank': education_rank(resume.get('education') or []),
+        'has_name': bool(resume.get('name')),
+        'has_email': bool(resume.get('email')),
+        'has_phone': bool(resume.get('phone')),
+        'has_education': bool(resume.get('education')),
+        'has_experience': bool(experience),
+        'has_standard_sections': any(section in text_lower for section in STANDARD_SECTIONS),
+        'text_length': len(raw_text),
+    }
+
+
+def features_are_current(features: Optional[Mapping[str, Any]]) -> bool:
+    return bool(features) and features.get('version') == FEATURE_VERSION
+
+
+def resume_data_from_doc(resume_doc: Mapping[str, Any]) -> ResumeData:
+    """ResumeData for a stored resume document, carrying its stored feature record."""
+    parsed_data = dict(resume_doc.get("parsed_data") or {})
+    if resume_doc.get("features") is not None:
+        parsed_data["features"] = resume_doc["features"]
+    return ResumeData(**parsed_data)
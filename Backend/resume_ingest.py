@@ -0,0 +1,331 @@
+"""
+Resume Ingest Module
+Bulk ingestion of resume files for placement-drive onboarding: a ZIP archive or a
+directory of PDF/DOCX resumes is parsed in the "ingest" process pool and written to
+MongoDB in `insert_many` batches. Candidates whose email matches a parsed resume are
+found with one SELECT per batch and get `Candidate.resume_id` set with one bulk UPDATE
+once the batch is stored. When LLM enrichment is on, the stored resumes are queued for
+the enrichment worker.
+
+Progress is kept in an `ingest_jobs` document (processed / succeeded / failed / linked,
+resumes per second, the first errors), so the API and the CLI report the same thing.
+
+Only the worker entry point runs in the pool, and this module imports no database or
+FastAPI code at module level, so spawning a worker loads just the parser and extractor.
+"""
+
+import os
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from config import (
+    ALLOWED_EXTENSIONS,
+    BULK_INGEST_BATCH_SIZE,
+    BULK_INGEST_POOL_SIZE,
+    EXTRACTION_SETTINGS,
+    MAX_UPLOAD_SIZE,
+)
+from document_extraction import DocumentExtractor
+from resume_blobs import content_sha256
+from resume_parser import PARSER_VERSION, ResumeParser
+from worker_pool import get_process_pool, pool_size
+
+
+INGEST_QUEUED = "queued"
+INGEST_RUNNING = "running"
+INGEST_COMPLETED = "completed"
+INGEST_FAILED = "failed"
+
+# Errors kept on the job document; the counters still cover every failure
+MAX_REPORTED_ERRORS = 100
+# Files submitted to the pool ahead of the results, per worker (bounds memory for archives)
+SUBMIT_AHEAD_PER_WORKER = 2
+
+
+def _is_resume_name(name: str) -> bool:
+    base = os.path.basename(name)
+    return (os.path.splitext(base)[1].lower() in ALLOWED_EXTENSIONS
+            and not base.startswith((".", "~$")) and "__MACOSX/" not in name)
+
+
+class ResumeFiles:
+    """Resume files of a ZIP archive or a directory tree, read one at a time"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._archive: Optional[zipfile.ZipFile] = None
+        self.sizes: Dict[str, int] = {}
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file_name in sorted(files):
+                    full_path = os.path.join(root, file_name)
+                    name = os.path.relpath(full_path, path).replace(os.sep, "/")
+                    if _is_resume_name(name):
+                        self.sizes[name] = os.path.getsize(full_path)
+        else:
+            try:
+                self._archive = zipfile.ZipFile(path)
+            except zipfile.BadZipFile:
+                raise ValueError(f"Not a ZIP archive or directory: {path}")
+            for info in self._archive.infolist():
+                if not info.is_dir() and _is_resume_name(info.filename):
+                    self.sizes[info.filename] = info.file_size
+        self.names: List[str] = list(self.sizes)
+
+    def payload(self, name: str) -> Union[str, bytes]:
+        """What a worker receives for one file: its path, or the archive member's bytes."""
+        if self.sizes[name] > MAX_UPLOAD_SIZE:
+            raise ValueError(f"File too large ({self.sizes[name]} bytes, maximum {MAX_UPLOAD_SIZE})")
+        if self._archive is None:
+            return os.path.join(self.path, name)
+        with self._archive.open(name) as member:
+            # The declared size can lie; never read more than the limit
+            data = member.read(MAX_UPLOAD_SIZE + 1)
+        if len(data) > MAX_UPLOAD_SIZE:
+            raise ValueError(f"File too large (maximum {MAX_UPLOAD_SIZE} bytes)")
+        return data
+
+    def close(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+
+    def __enter__(self) -> "ResumeFiles":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_extractor: Optional[DocumentExtractor] = None
+_resume_parser: Optional[ResumeParser] = None
+
+
+def parse_resume_file(payload: Union[str, bytes], filename: str) -> Dict[str, Any]:
+    """
+    Extract and parse one resume (runs in a worker process).
+
+    Returns:
+        Dictionary with 'parsed_data', 'features' and 'content_sha256'
+    """
+    global _extractor, _resume_parser
+    if _extractor is None:
+        # Already inside a worker: extract pages in this process instead of a nested pool
+        _extractor = DocumentExtractor(**dict(EXTRACTION_SETTINGS, use_process_pool=False))
+        _resume_parser = ResumeParser()
+    text = _extractor.extract(payload, filename).text
+    if not text.strip():
+        raise ValueError("No text could be extracted")
+    parsed_data = _resume_parser.parse(resume_text=text)
+    features = parsed_data.pop("features", None)
+    return {"parsed_data": parsed_data, "features": features, "content_sha256": content_sha256(payload)}
+
+
+def create_ingest_job(mongo_db, user_id: Optional[int], source: str) -> Dict[str, Any]:
+    """Insert a queued ingest job and return its document (without the Mongo _id)."""
+    job = {
+        "job_id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "source": source,
+        "status": INGEST_QUEUED,
+        "total": 0,
+        "processed": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "linked": 0,
+        "resumes_per_second": 0.0,
+        "errors": [],
+        "created_at": datetime.utcnow(),
+        "started_at": None,
+        "finished_at": None,
+    }
+    mongo_db.ingest_jobs.insert_one(dict(job))
+    return job
+
+
+def get_ingest_job(mongo_db, job_id: str) -> Optional[Dict[str, Any]]:
+    return mongo_db.ingest_jobs.find_one({"job_id": job_id}, {"_id": 0})
+
+
+def ensure_indexes(mongo_db) -> None:
+    """Indexes for job status lookups and for finding the resumes of a job."""
+    mongo_db.ingest_jobs.create_index("job_id", unique=True)
+    mongo_db.resumes.create_index("ingest_job_id", sparse=True)
+
+
+def find_candidates(db, emails: List[str]) -> Dict[str, Tuple[int, int]]:
+    """(candidate id, user id) by lowercased email, with one case-insensitive SELECT."""
+    # Imported here so spawned ingest workers never load the database layer
+    from sqlalchemy import func
+    from database.models import Candidate
+
+    if not emails:
+        return {}
+    rows = (
+        db.query(Candidate.id, Candidate.user_id, Candidate.email)
+        .filter(func.lower(Candidate.email).in_(emails))
+        .all()
+    )
+    return {email.lower(): (candidate_id, user_id) for candidate_id, user_id, email in rows}
+
+
+def link_candidates(db, resume_ids: Dict[int, str]) -> None:
+    """Set Candidate.resume_id for many candidates with one executemany UPDATE by primary key."""
+    from sqlalchemy import update
+    from database.models import Candidate
+
+    if resume_ids:
+        db.execute(update(Candidate), [
+            {"id": candidate_id, "resume_id": resume_id} for candidate_id, resume_id in resume_ids.items()
+        ])
+        db.commit()
+
+
+class ResumeIngestion:
+    """One bulk ingestion run, reporting progress to an `ingest_jobs` document"""
+
+    def __init__(self, mongo_db, db, job_id: Optional[str] = None, user_id: Optional[int] = None,
+                 batch_size: int = BULK_INGEST_BATCH_SIZE,
+                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 on_linked: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        self.mongo_db = mongo_db
+        self.db = db
+        self.job_id = job_id
+        self.user_id = user_id
+        self.batch_size = max(1, batch_size)
+        self.on_progress = on_progress
+        # Called with the resumes linked in each batch (candidate_id, user_id, resume_id, text)
+        self.on_linked = on_linked
+        self.progress: Dict[str, Any] = {
+            "total": 0, "processed": 0, "succeeded": 0, "failed": 0, "linked": 0,
+            "resumes_per_second": 0.0,
+        }
+        self.errors: List[Dict[str, str]] = []
+        self._batch: List[Tuple[str, Dict[str, Any]]] = []
+        self._new_errors: List[Dict[str, str]] = []
+        self._started = 0.0
+
+    def run(self, path: str) -> Dict[str, Any]:
+        """Ingest every resume under `path` (ZIP archive or directory); returns the final progress."""
+        self._started = time.perf_counter()
+        self._update_job({"status": INGEST_RUNNING, "started_at": datetime.utcnow()})
+        try:
+            with ResumeFiles(path) as files:
+                self.progress["total"] = len(files.names)
+                self._update_job(dict(self.progress))
+                self._ingest(files)
+        except Exception as e:
+            self._update_job({"status": INGEST_FAILED, "error": str(e), "finished_at": datetime.utcnow()})
+            raise
+        self._update_job({"status": INGEST_COMPLETED, "finished_at": datetime.utcnow(),
+                          "elapsed_seconds": round(time.perf_counter() - self._started, 3)})
+        return dict(self.progress)
+
+    def _ingest(self, files: ResumeFiles) -> None:
+        pool = get_process_pool("ingest", BULK_INGEST_POOL_SIZE or None)
+        ahead = pool_size(BULK_INGEST_POOL_SIZE) * SUBMIT_AHEAD_PER_WORKER
+        names = iter(files.names)
+        pending: Dict[Future, str] = {}
+
+        def submit_more() -> None:
+            while len(pending) < ahead:
+                name = next(names, None)
+                if name is None:
+                    return
+                try:
+                    pending[pool.submit(parse_resume_file, files.payload(name), name)] = name
+                except Exception as e:
+                    self._failed(name, e)
+
+        submit_more()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    self._batch.append((name, future.result()))
+                except Exception as e:
+                    self._failed(name, e)
+            submit_more()
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+        self._flush()
+
+    def _failed(self, name: str, error: Exception) -> None:
+        self.progress["failed"] += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            entry = {"file": name, "error": str(error)}
+            self.errors.append(entry)
+            self._new_errors.append(entry)
+
+    def _flush(self) -> None:
+        """Write the parsed batch with one insert_many, link candidates, report progress."""
+        # Imported here so spawned ingest workers do not load the Groq client
+        from llm.enrichment_worker import get_enrichment_worker, pending_enrichment
+
+        batch, self._batch = self._batch, []
+        if batch:
+            queue_fields = pending_enrichment()
+            resume_ids = [str(uuid.uuid4()) for _ in batch]
+            by_email = {}
+            for resume_id, (_, parsed) in zip(resume_ids, batch):
+                email = parsed["parsed_data"].get("email")
+                if email:
+                    by_email[email.lower()] = resume_id  # the last file of an email wins
+            candidates = find_candidates(self.db, list(by_email))
+
+            now = datetime.utcnow()
+            docs = []
+            for resume_id, (name, parsed) in zip(resume_ids, batch):
+                email = (parsed["parsed_data"].get("email") or "").lower()
+                candidate = candidates.get(email) if by_email.get(email) == resume_id else None
+                docs.append({
+                    "resume_id": resume_id,
+                    # Linked resumes belong to the student, so they can read them like an upload
+                    "user_id": candidate[1] if candidate else self.user_id,
+                    "filename": os.path.basename(name),
+                    "content_sha256": parsed["content_sha256"],
+                    "raw_text": parsed["parsed_data"].get("raw_text", ""),
+                    "parsed_data": parsed["parsed_data"],
+                    "features": parsed["features"],
+                    "parser_version": PARSER_VERSION,
+                    "ingest_job_id": self.job_id,
+                    "created_at": now,
+                    **queue_fields,
+                })
+            self.mongo_db.resumes.insert_many(docs, ordered=False)
+            if queue_fields:
+                get_enrichment_worker().wake()
+            # Only after the resumes exist, so no candidate points at a missing document
+            link_candidates(self.db, {
+                candidate_id: by_email[email] for email, (candidate_id, _) in candidates.items()
+            })
+            if self.on_linked and candidates:
+                texts = {doc["resume_id"]: doc["raw_text"] for doc in docs}
+                self.on_linked([
+                    {"candidate_id": candidate_id, "user_id": user_id,
+                     "resume_id": by_email[email], "text": texts[by_email[email]]}
+                    for email, (candidate_id, user_id) in candidates.items()
+                ])
+            self.progress["succeeded"] += len(docs)
+            self.progress["linked"] += len(candidates)
+
+        self.progress["processed"] = self.progress["succeeded"] + self.progress["failed"]
+        elapsed = time.perf_counter() - self._started
+        self.progress["resumes_per_second"] = round(self.progress["processed"] / elapsed, 2) if elapsed else 0.0
+        self._update_job(dict(self.progress))
+        if self.on_progress:
+            self.on_progress(dict(self.progress))
+
+    def _update_job(self, fields: Dict[str, Any]) -> None:
+        if self.job_id is None:
+            return
+        update: Dict[str, Any] = {"$set": fields}
+        if self._new_errors:
+            update["$push"] = {"errors": {"$each": self._new_errors}}
+            self._new_errors = []
+        self.mongo_db.ingest_jobs.update_one({"job_id": self.job_id}, update)
@@ -4,9 +4,36 @@ Extracts structured information from resume files (PDF, DOCX) or raw text
 """
 
 import re
-import pdfplumber
-from docx import Document
 from typing import Dict, List, Optional
+from document_extraction import DocumentSource, get_document_extractor, source_name
+from keyword_scanner import get_keyword_scanner
+from resume_features import compute_resume_features
+from resume_sections import ResumeSections, segment_resume
+
+
+# Bump whenever parse() output changes; cached parses in resume_blobs are keyed on it
+PARSER_VERSION = 4
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERNS = [
+    re.compile(r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    re.compile(r'\+?\d{10,12}'),
+    re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}')
+]
+NAME_SPECIAL_CHARS = re.compile(r'[^\w\s\-]')
+LIST_SEPARATORS = re.compile(r'[,;|\n]')
+CERT_SEPARATORS = re.compile(r'[,;\n]')
+PROJECT_SEPARATORS = re.compile(r'(?:\n{2,}|\d+\.|\-)')
+DEGREE_PATTERN = re.compile(
+    r'(bachelor|master|phd|doctorate|b\.?s\.?c\.?|m\.?s\.?c\.?|b\.?e\.?|m\.?e\.?|b\.?tech|m\.?tech)',
+    re.IGNORECASE
+)
+INSTITUTION_PATTERN = re.compile(r'([A-Z][a-zA-Z\s&]+(?:University|College|Institute|School))')
+JOB_TITLE_PATTERN = re.compile(
+    r'(?:software engineer|developer|intern|analyst|manager|engineer|designer|consultant|specialist)',
+    re.IGNORECASE
+)
+DURATION_PATTERN = re.compile(r'(?<![\d.])(\d{1,2}(?:\.\d+)?[\+\s]*(?:years?|months?|yrs?))', re.IGNORECASE)
 
 
 class ResumeParser:
@@ -22,125 +49,117 @@ class ResumeParser:
             'tools': ['git', 'github', 'jira', 'agile', 'scrum', 'linux', 'unix']
         }
     
-    def parse(self, file_path: Optional[str] = None, resume_text: Optional[str] = None) -> Dict:
+    def parse(self, file_path: Optional[str] = None, resume_text: Optional[str] = None,
+              file_data: Optional[DocumentSource] = None, filename: Optional[str] = None) -> Dict:
         """
         Main parsing function that extracts information from resume
         
         Args:
             file_path: Path to resume file (PDF or DOCX)
             resume_text: Raw text content of resume
+            file_data: Resume file contents as bytes / memoryview or a binary file object
+                (e.g. UploadFile.file), read without a temporary file
+            filename: Original file name of file_data (its extension selects the format)
             
         Returns:
-            Dictionary with parsed resume data
+            Dictionary with parsed resume data, including a versioned 'features' record
+            that callers persist next to parsed_data
         """
         if file_path:
             text = self._extract_text_from_file(file_path)
+        elif file_data is not None:
+            text = self._extract_text_from_file(file_data, filename)
         elif resume_text:
             text = resume_text
         else:
-            raise ValueError("Either file_path or resume_text must be provided")
+            raise ValueError("Either file_path, file_data or resume_text must be provided")
         
-        # Extract various components
+        # One scan splits the text into sections; each extractor reads only its own slice
+        sections = segment_resume(text)
         parsed_data = {
             'name': self._extract_name(text),
             'email': self._extract_email(text),
             'phone': self._extract_phone(text),
-            'skills': self._extract_skills(text),
-            'education': self._extract_education(text),
-            'experience': self._extract_experience(text),
-            'certifications': self._extract_certifications(text),
-            'projects': self._extract_projects(text),
+            'skills': self._extract_skills(text, sections),
+            'education': self._extract_education(text, sections),
+            'experience': self._extract_experience(text, sections),
+            'certifications': self._extract_certifications(text, sections),
+            'projects': self._extract_projects(text, sections),
+            'section_offsets': sections.to_offsets(),  # into raw_text, not a second copy of it
             'raw_text': text
         }
+        parsed_data['features'] = compute_resume_features(parsed_data)
         
         return parsed_data
     
-    def _extract_text_from_file(self, file_path: str) -> str:
-        """Extract text from PDF or DOCX file"""
-        file_path_lower = file_path.lower()
+    def _extract_text_from_file(self, source: DocumentSource, filename: Optional[str] = None) -> str:
+        """Extract text from PDF or DOCX file (a path, or in-memory contents plus their filename)"""
+        name = source_name(source, filename)
+        file_path_lower = name.lower()
         
         if file_path_lower.endswith('.pdf'):
-            return self._extract_from_pdf(file_path)
+            return self._extract_from_pdf(source)
         elif file_path_lower.endswith('.docx') or file_path_lower.endswith('.doc'):
-            return self._extract_from_docx(file_path)
+            return self._extract_from_docx(source)
         else:
-            raise ValueError(f"Unsupported file format: {file_path}")
+            raise ValueError(f"Unsupported file format: {name}")
     
-    def _extract_from_pdf(self, file_path: str) -> str:
+    def _extract_from_pdf(self, source: DocumentSource) -> str:
         """Extract text from PDF file"""
-        text = ""
+        # Page-parallel in the extraction process pool, within the page and time budgets
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            return get_document_extractor().extract_pdf(source).text
         except Exception as e:
             raise ValueError(f"Error reading PDF file: {str(e)}")
-        return text
     
-    def _extract_from_docx(self, file_path: str) -> str:
+    def _extract_from_docx(self, source: DocumentSource) -> str:
         """Extract text from DOCX file"""
         try:
-            doc = Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
+            return get_document_extractor().extract_docx(source).text
         except Exception as e:
             raise ValueError(f"Error reading DOCX file: {str(e)}")
     
     def _extract_name(self, text: str) -> Optional[str]:
         """Extract candidate name (usually first line or near contact info)"""
-        lines = text.split('\n')[:10]  # Check first 10 lines
+        lines = text.split('\n', 10)[:10]  # Check first 10 lines
         for line in lines:
             line = line.strip()
             # Skip if looks like email, phone, or URL
             if '@' in line or 'phone' in line.lower() or 'http' in line.lower():
                 continue
             # If line has 2-4 words and no special chars, likely name
-            if 2 <= len(line.split()) <= 4 and not re.search(r'[^\w\s\-]', line):
+            if 2 <= len(line.split()) <= 4 and not NAME_SPECIAL_CHARS.search(line):
                 return line
         return None
     
     def _extract_email(self, text: str) -> Optional[str]:
         """Extract email address"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else None
+        match = EMAIL_PATTERN.search(text)
+        return match.group(0) if match else None
     
     def _extract_phone(self, text: str) -> Optional[str]:
         """Extract phone number"""
-        phone_patterns = [
-            r'\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-            r'\+?\d{10,12}',
-            r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'
-        ]
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                return matches[0]
+        for pattern in PHONE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(0)
         return None
     
-    def _extract_skills(self, text: str) -> List[str]:
+    def _extract_skills(self, text: str, sections: Optional[ResumeSections] = None) -> List[str]:
         """Extract skills from resume text"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        # Extract from skill keywords dictionary
+        sections = sections or segment_resume(text)
+        # Extract from skill keywords dictionary (substring matches, compiled once per dictionary)
         all_skills = []
         for category, skills in self.skill_keywords.items():
             all_skills.extend(skills)
         
-        for skill in all_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
+        found_skills = list(get_keyword_scanner(tuple(all_skills), whole_words=False).find(text))
         
         # Look for "Skills:" section
-        skills_section_pattern = r'(?:skills?|technical skills?|proficiency):\s*([^\n]+(?:\n[^\n]+){0,10})'
-        match = re.search(skills_section_pattern, text, re.IGNORECASE)
-        if match:
-            skills_text = match.group(1)
+        skills_text = sections.block('skills', 10)
+        if skills_text:
             # Split by commas, semicolons, or newlines
-            skills_list = re.split(r'[,;|\n]', skills_text)
+            skills_list = LIST_SEPARATORS.split(skills_text)
             for skill in skills_list:
                 skill = skill.strip().strip('-•*').strip()
                 if skill and len(skill) > 1:
@@ -149,22 +168,17 @@ class ResumeParser:
         # Remove duplicates and return
         return list(set(found_skills))
     
-    def _extract_education(self, text: str) -> List[Dict]:
+    def _extract_education(self, text: str, sections: Optional[ResumeSections] = None) -> List[Dict]:
         """Extract education information"""
+        sections = sections or segment_resume(text)
         education = []
-        education_keywords = ['bachelor', 'master', 'phd', 'doctorate', 'degree', 'diploma', 
-                             'university', 'college', 'institute', 'education']
         
         # Look for education section
-        education_section_pattern = r'(?:education|academic|qualification):\s*([^\n]+(?:\n[^\n]+){0,15})'
-        match = re.search(education_section_pattern, text, re.IGNORECASE)
-        
-        if match:
-            edu_text = match.group(1)
+        edu_text = sections.block('education', 15)
+        if edu_text:
             # Try to extract degree and institution
-            degree_pattern = r'(bachelor|master|phd|doctorate|b\.?s\.?c\.?|m\.?s\.?c\.?|b\.?e\.?|m\.?e\.?|b\.?tech|m\.?tech)'
-            degrees = re.findall(degree_pattern, edu_text, re.IGNORECASE)
-            institutions = re.findall(r'([A-Z][a-zA-Z\s&]+(?:University|College|Institute|School))', edu_text)
+            degrees = DEGREE_PATTERN.findall(edu_text)
+            institutions = INSTITUTION_PATTERN.findall(edu_text)
             
             for i, degree in enumerate(degrees):
                 edu_dict = {
@@ -176,24 +190,19 @@ class ResumeParser:
         
         return education
     
-    def _extract_experience(self, text: str) -> List[Dict]:
+    def _extract_experience(self, text: str, sections: Optional[ResumeSections] = None) -> List[Dict]:
         """Extract work experience information"""
+        sections = sections or segment_resume(text)
         experience = []
-        exp_keywords = ['experience', 'employment', 'work history', 'career']
         
         # Look for experience section
-        exp_section_pattern = r'(?:experience|work history|employment|career):\s*([^\n]+(?:\n[^\n]+){0,30})'
-        match = re.search(exp_section_pattern, text, re.IGNORECASE)
-        
-        if match:
-            exp_text = match.group(1)
+        exp_text = sections.block('experience', 30)
+        if exp_text:
             # Extract job titles (lines with common job title patterns)
-            title_pattern = r'(?:software engineer|developer|intern|analyst|manager|engineer|designer|consultant|specialist)'
-            titles = re.findall(title_pattern, exp_text, re.IGNORECASE)
+            titles = JOB_TITLE_PATTERN.findall(exp_text)
             
             # Extract years (experience duration)
-            year_pattern = r'(\d{1,2}[\+\s]*(?:years?|months?|yrs?))'
-            durations = re.findall(year_pattern, exp_text, re.IGNORECASE)
+            durations = DURATION_PATTERN.findall(exp_text)
             
             for i, title in enumerate(titles):
                 exp_dict = {
@@ -205,15 +214,14 @@ class ResumeParser:
         
         return experience
     
-    def _extract_certifications(self, text: str) -> List[str]:
+    def _extract_certifications(self, text: str, sections: Optional[ResumeSections] = None) -> List[str]:
         """Extract certifications"""
+        sections = sections or segment_resume(text)
         certifications = []
-        cert_pattern = r'(?:certification|certified|certificate):\s*([^\n]+(?:\n[^\n]+){0,5})'
-        match = re.search(cert_pattern, text, re.IGNORECASE)
+        cert_text = sections.block('certifications', 5)
         
-        if match:
-            cert_text = match.group(1)
-            certs = re.split(r'[,;\n]', cert_text)
+        if cert_text:
+            certs = CERT_SEPARATORS.split(cert_text)
             for cert in certs:
                 cert = cert.strip().strip('-•*').strip()
                 if cert:
@@ -221,21 +229,18 @@ class ResumeParser:
         
         return certifications
     
-    def _extract_projects(self, text: str) -> List[Dict]:
+    def _extract_projects(self, text: str, sections: Optional[ResumeSections] = None) -> List[Dict]:
         """Extract project information"""
+        sections = sections or segment_resume(text)
         projects = []
-        project_pattern = r'(?:project|portfolio):\s*([^\n]+(?:\n[^\n]+){0,10})'
-        match = re.search(project_pattern, text, re.IGNORECASE)
+        project_text = sections.block('projects', 10)
         
-        if match:
-            project_text = match.group(1)
+        if project_text:
             # Split projects by common delimiters
-            project_list = re.split(r'(?:\n{2,}|\d+\.|\-)', project_text)
+            project_list = PROJECT_SEPARATORS.split(project_text)
             for proj in project_list:
                 proj = proj.strip()
                 if proj and len(proj) > 10:
                     projects.append({'title': proj[:100], 'description': proj})
         
         return projects[:5]  # Limit to 5 projects
-
-
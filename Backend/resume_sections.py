@@ -0,0 +1,128 @@
+"""
+Resume Sections Module
+Segments resume text into labelled sections (contact, skills, education, experience,
+projects, certifications) with one precompiled scan, so each ResumeParser extractor
+works on its own slice instead of searching the whole text.
+
+A section header is a line starting with a heading followed by a colon ("Skills: ...",
+"Technical Skills:", "Relevant Work Experience:") or a line holding only the heading
+("EDUCATION", "Work Experience"). A section runs until the next header; the text before
+the first header is the contact section.
+
+Parsed resumes store only the section offsets into raw_text (`to_offsets`), not the section
+texts; `ResumeSections.from_offsets` restores the sections of a stored resume without a scan.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+CONTACT = "contact"
+SECTION_HEADINGS: Dict[str, str] = {
+    "skills": r"skills?|proficienc(?:y|ies)|competenc(?:y|ies)",
+    "education": r"education|academics?|qualifications?",
+    "experience": r"experience|work[ \t]+history|employment|career",
+    "projects": r"projects?|portfolio",
+    "certifications": r"certifications?|certified|certificates?",
+}
+SECTION_LABELS: Tuple[str, ...] = (CONTACT,) + tuple(SECTION_HEADINGS)
+
+_ANY_HEADING = "|".join(f"(?:{pattern})" for pattern in SECTION_HEADINGS.values())
+# Qualifiers allowed in front of a heading that stands alone on its line
+_BARE_QUALIFIERS = r"technical|work|professional|academic|key|core|relevant|personal|soft"
+
+HEADER_PATTERN = re.compile(
+    r"^[ \t]*(?:"
+    rf"(?:[A-Za-z&/]+[ \t]+){{0,3}}?(?P<inline>{_ANY_HEADING})[ \t]*:"
+    rf"|(?:(?:{_BARE_QUALIFIERS})[ \t]+)?(?P<bare>{_ANY_HEADING})[ \t]*$"
+    r")",
+    re.IGNORECASE | re.MULTILINE,
+)
+_HEADING_LABELS = [
+    (label, re.compile(pattern, re.IGNORECASE)) for label, pattern in SECTION_HEADINGS.items()
+]
+
+
+def _label_for(heading: str) -> str:
+    for label, pattern in _HEADING_LABELS:
+        if pattern.fullmatch(heading):
+            return label
+    raise ValueError(f"Unknown section heading: {heading}")
+
+
+class ResumeSections:
+    """Section boundaries of one resume text (offsets into the original string)"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.spans: List[Tuple[str, int, int]] = []
+        contact_end = len(text)
+        previous: Optional[Tuple[str, int]] = None
+        for match in HEADER_PATTERN.finditer(text):
+            if previous is None:
+                contact_end = match.start()
+            else:
+                self.spans.append((previous[0], previous[1], match.start()))
+            previous = (_label_for(match.group("inline") or match.group("bare")), match.end())
+        if previous is not None:
+            self.spans.append((previous[0], previous[1], len(text)))
+        self.spans.insert(0, (CONTACT, 0, contact_end))
+
+    @classmethod
+    def from_offsets(cls, text: str, offsets: Dict[str, List[List[int]]]) -> "ResumeSections":
+        """Sections of a stored resume from its raw_text and stored `to_offsets()` output."""
+        sections = cls.__new__(cls)
+        sections.text = text
+        sections.spans = sorted(
+            ((label, start, end) for label, spans in offsets.items() for start, end in spans),
+            key=lambda span: span[1],
+        )
+        return sections
+
+    def labels(self) -> List[str]:
+        """Labels present, in document order (without duplicates)."""
+        return list(dict.fromkeys(label for label, start, end in self.spans if self.text[start:end].strip()))
+
+    def get(self, label: str) -> str:
+        """Content of the first section with this label ('' if there is none)."""
+        for span_label, start, end in self.spans:
+            if span_label == label:
+                return self.text[start:end]
+        return ""
+
+    def block(self, label: str, max_extra_lines: int) -> Optional[str]:
+        """
+        First paragraph of a section: its first non-blank line plus up to max_extra_lines
+        following lines, stopping at a blank line. None if the section is missing or empty.
+        """
+        content = self.get(label).lstrip()
+        if not content:
+            return None
+        lines = content.split("\n", max_extra_lines + 1)[:max_extra_lines + 1]
+        block = [lines[0]]
+        for line in lines[1:]:
+            if not line:
+                break
+            block.append(line)
+        return "\n".join(block)
+
+    def to_offsets(self) -> Dict[str, List[List[int]]]:
+        """[start, end) offsets of the non-empty sections per label, in document order."""
+        offsets: Dict[str, List[List[int]]] = {}
+        for label, start, end in self.spans:
+            if self.text[start:end].strip():
+                offsets.setdefault(label, []).append([start, end])
+        return offsets
+
+    def to_dict(self) -> Dict[str, str]:
+        """Stripped text per label; repeated sections of a label are joined by a blank line."""
+        sections: Dict[str, List[str]] = {}
+        for label, start, end in self.spans:
+            content = self.text[start:end].strip()
+            if content:
+                sections.setdefault(label, []).append(content)
+        return {label: "\n\n".join(parts) for label, parts in sections.items()}
+
+
+def segment_resume(text: str) -> ResumeSections:
+    return ResumeSections(text)
@@ -1,9 +1,15 @@
 """ATS engine router"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from typing import Any, Dict, Iterator, List, Optional
+import asyncio
+import json
 import uuid
+from concurrent.futures.process import BrokenProcessPool
+from pymongo.errors import BulkWriteError, PyMongoError
 from database.postgres import get_db
 from database.mongodb import get_mongo_db
 from database.models import User, Job, Application, Evaluation, Candidate, ApplicationStatus
@@ -11,8 +17,14 @@ from database.schemas import ATSScoreRequest, ATSScoreResponse, EvaluationRespon
 from models import JobRequirement, ResumeData
 from pydantic import BaseModel
 from ats_engine import ATSEngine
+from ats_batch import score_batch_item
+from ats_memo import get_ats_memo
+from job_profiles import get_job_profile
+from config import ATS_BATCH_WRITE_SIZE
+from resume_features import resume_data_from_doc
 from resume_parser import ResumeParser
 from auth.dependencies import get_current_active_user
+from worker_pool import get_process_pool, replace_broken_pool
 
 router = APIRouter(prefix="/api/v1/ats", tags=["ATS"])
 
@@ -49,8 +61,7 @@ async def score_resume(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Resume not found"
                 )
-            parsed_data = resume_doc.get("parsed_data", {})
-            resume_data = ResumeData(**parsed_data)
+            resume_data = resume_data_from_doc(resume_doc)
         elif request.resume_text:
             parsed_data = resume_parser.parse(resume_text=request.resume_text)
             resume_data = ResumeData(**parsed_data)
@@ -125,22 +136,160 @@ async def get_evaluation(
     return evaluation
 
 
+def _score_response_dict(ats_result: Dict[str, Any]) -> Dict[str, Any]:
+    response = ATSScoreResponse(
+        evaluation_id=0,
+        ats_score=ats_result["ats_score"],
+        passed=ats_result["passed"],
+        skill_match_score=ats_result["skill_match_score"],
+        education_score=ats_result["education_score"],
+        experience_score=ats_result["experience_score"],
+        keyword_match_score=ats_result["keyword_match_score"],
+        format_score=ats_result["format_score"],
+        matched_skills=ats_result["matched_skills"],
+        missing_skills=ats_result["missing_skills"]
+    )
+    return response.dict()
+
+
 @router.post("/batch-score")
 async def batch_score(
     requests: List[ATSScoreRequest],
+    stream: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Score multiple resumes"""
-    results = []
-    for request in requests:
+    """
+    Score multiple resumes.
+
+    Stored resumes are fetched with one MongoDB query, parsing and scoring run in the
+    shared process pool, and results are written to `ats_results` with `insert_many`.
+    A failing item is reported as {"error": ...} without aborting the batch; a scored
+    item whose result could not be stored gets a "save_error". An item lost to a dead
+    worker is retried once on a fresh pool. With `stream=true` the response is NDJSON:
+    one {"index", ...} line per item as it completes, then a summary line listing the
+    save errors.
+    """
+    mongo_db = get_mongo_db()
+    resume_ids = list({request.resume_id for request in requests if request.resume_id})
+    by_reference = {}
+    if resume_ids:
+        by_reference, _ = _query_resume_docs(mongo_db, resume_ids)
+
+    pool = get_process_pool("ats")
+    loop = asyncio.get_running_loop()
+
+    def submit(*args) -> asyncio.Future:
+        nonlocal pool
         try:
-            result = await score_resume(request, current_user, db)
-            results.append(result.dict())
-        except Exception as e:
-            results.append({"error": str(e)})
-    
-    return {"results": results, "total": len(results)}
+            return loop.run_in_executor(pool, score_batch_item, *args)
+        except BrokenProcessPool:
+            # A worker died during an earlier request; start over with a fresh pool
+            pool = replace_broken_pool("ats", pool)
+            return loop.run_in_executor(pool, score_batch_item, *args)
+
+    errors: Dict[int, str] = {}
+    pending = {}
+    item_args = {}
+    for index, request in enumerate(requests):
+        if request.resume_id:
+            resume_doc = by_reference.get(request.resume_id)
+            if not resume_doc:
+                errors[index] = "Resume not found"
+                continue
+            parsed_data = dict(resume_doc.get("parsed_data") or {}, features=resume_doc.get("features"))
+            resume_text = None
+        elif request.resume_text:
+            parsed_data, resume_text = None, request.resume_text
+        else:
+            errors[index] = "Either resume_id or resume_text must be provided"
+            continue
+        item_args[index] = (parsed_data, resume_text, request.job_requirement)
+        pending[submit(*item_args[index])] = index
+
+    pending_docs: List[Dict[str, Any]] = []
+    pending_indexes: List[int] = []
+    save_errors: Dict[int, str] = {}
+
+    def flush_results() -> None:
+        """Write the buffered result docs; items that could not be stored go to save_errors."""
+        if not pending_docs:
+            return
+        try:
+            mongo_db.ats_results.insert_many(pending_docs, ordered=False)
+        except BulkWriteError as e:
+            # ordered=False: every document without a write error was inserted
+            for write_error in e.details.get("writeErrors", []):
+                index = pending_indexes[write_error["index"]]
+                save_errors[index] = f"Error saving result: {write_error.get('errmsg')}"
+        except PyMongoError as e:
+            for index in pending_indexes:
+                save_errors[index] = f"Error saving result: {str(e)}"
+        pending_docs.clear()
+        pending_indexes.clear()
+
+    async def results_in_completion_order():
+        """Yield (index, response-or-error) as workers finish, writing result docs in batches."""
+        for index, message in errors.items():
+            yield index, {"error": message}
+        remaining = set(pending)
+        retried = set()
+        while remaining:
+            done, remaining = await asyncio.wait(remaining, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                index = pending[future]
+                try:
+                    scored = future.result()
+                except BrokenProcessPool as e:
+                    if index in retried:
+                        yield index, {"error": f"Error scoring resume: {str(e)}"}
+                        continue
+                    # The item was lost with its worker: run it once more on a fresh pool
+                    retried.add(index)
+                    retry = submit(*item_args[index])
+                    pending[retry] = index
+                    remaining.add(retry)
+                    continue
+                except Exception as e:
+                    yield index, {"error": f"Error scoring resume: {str(e)}"}
+                    continue
+                pending_docs.append({
+                    "result_id": str(uuid.uuid4()),
+                    "user_id": current_user.id,
+                    "ats_result": scored["ats_result"],
+                    "resume_data": scored["resume_data"],
+                    "job_requirement": scored["job_requirement"]
+                })
+                pending_indexes.append(index)
+                yield index, _score_response_dict(scored["ats_result"])
+            if len(pending_docs) >= ATS_BATCH_WRITE_SIZE:
+                await run_in_threadpool(flush_results)
+        await run_in_threadpool(flush_results)
+
+    if stream:
+        async def ndjson():
+            failed = 0
+            async for index, item in results_in_completion_order():
+                failed += "error" in item
+                yield json.dumps({"index": index, **item}) + "\n"
+            # Lines for scored items were sent before their batch was written
+            yield json.dumps({
+                "done": True,
+                "total": len(requests),
+                "errors": failed,
+                "save_errors": [
+                    {"index": index, "error": message} for index, message in sorted(save_errors.items())
+                ]
+            }) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    async for index, item in results_in_completion_order():
+        results[index] = item
+    for index, message in save_errors.items():
+        results[index]["save_error"] = message
+    return {"results": results, "total": len(results), "save_errors": len(save_errors)}
 
 
 def create_evaluation_for_application(application: Application, db: Session) -> Optional[Evaluation]:
@@ -176,7 +325,9 @@ def create_evaluation_for_application(application: Application, db: Session) ->
         
         # If still not found, try to find by user_id as a fallback
         if not resume_doc:
-            resume_doc = mongo_db.resumes.find_one({"user_id": candidate.user_id})
+            resume_doc = mongo_db.resumes.find_one(
+                {"user_id": candidate.user_id}, sort=[("_id", -1)]
+            )
         
         if not resume_doc:
             return None
@@ -185,16 +336,17 @@ def create_evaluation_for_application(application: Application, db: Session) ->
         if not parsed_data:
             return None
         
-        resume_data = ResumeData(**parsed_data)
+        resume_data = resume_data_from_doc(resume_doc)
         
         # Get job requirements
         if not job.requirements_json:
             return None
         
-        job_requirement = JobRequirement(**job.requirements_json)
+        job_profile = get_job_profile(job)
+        job_requirement = job_profile.requirement
         
         # Score resume
-        ats_result = ats_engine.score_resume(resume_data, job_requirement)
+        ats_result = ats_engine.score_resume(resume_data, job_profile)
         
         # Create evaluation
         evaluation = Evaluation(
@@ -242,6 +394,213 @@ def create_evaluation_for_application(application: Application, db: Session) ->
         return None
 
 
+def _query_resume_docs(mongo_db, resume_ids: List[str], user_ids: List[int] = ()):
+    """
+    Fetch resume documents for many references with a single `$or`/`$in` query.
+
+    Returns (by_reference, by_user_id). `by_reference` maps a resume reference to its
+    document, preferring a `resume_id` field match over a MongoDB `_id` match (the same
+    precedence as the single-resume lookup).
+    """
+    from bson import ObjectId
+    from bson.errors import InvalidId
+
+    object_ids = []
+    for resume_id in resume_ids:
+        try:
+            object_ids.append(ObjectId(resume_id))
+        except (InvalidId, TypeError):
+            pass
+
+    clauses = [{"resume_id": {"$in": list(resume_ids)}}]
+    if user_ids:
+        clauses.append({"user_id": {"$in": list(user_ids)}})
+    if object_ids:
+        clauses.append({"_id": {"$in": object_ids}})
+    projection = {"resume_id": 1, "user_id": 1, "parsed_data": 1, "features": 1}
+
+    by_resume_id: Dict[str, Dict[str, Any]] = {}
+    by_object_id: Dict[str, Dict[str, Any]] = {}
+    by_user_id: Dict[int, Dict[str, Any]] = {}
+    # Newest first, so the user_id fallback picks the latest upload like the single lookups
+    for doc in mongo_db.resumes.find({"$or": clauses}, projection).sort("_id", -1):
+        if doc.get("resume_id") is not None:
+            by_resume_id.setdefault(doc["resume_id"], doc)
+        by_object_id.setdefault(str(doc["_id"]), doc)
+        if doc.get("user_id") is not None:
+            by_user_id.setdefault(doc["user_id"], doc)
+
+    return {**by_object_id, **by_resume_id}, by_user_id
+
+
+def _bulk_load_resume_docs(mongo_db, candidates: List[Candidate]) -> Dict[int, Dict[str, Any]]:
+    """
+    Resolve the resume document of many candidates with a single Mongo query.
+
+    Same precedence as the per-candidate lookup: `resume_id` field, then MongoDB `_id`,
+    then the candidate's `user_id` as a fallback.
+    """
+    resume_ids = [c.resume_id for c in candidates if c.resume_id]
+    by_reference, by_user_id = _query_resume_docs(
+        mongo_db, resume_ids, [c.user_id for c in candidates]
+    )
+
+    docs = {}
+    for candidate in candidates:
+        doc = None
+        if candidate.resume_id:
+            doc = by_reference.get(candidate.resume_id)
+        if doc is None:
+            doc = by_user_id.get(candidate.user_id)
+        if doc is not None:
+            docs[candidate.id] = doc
+    return docs
+
+
+def _ranking_entry(application: Application, ats_result: Dict[str, Any]) -> Dict[str, Any]:
+    candidate = application.candidate
+    return {
+        "application_id": application.id,
+        "candidate_id": candidate.id,
+        "candidate_name": candidate.name,
+        "ats_score": ats_result["ats_score"],
+        "passed": ats_result["passed"],
+        "skill_match_score": ats_result["skill_match_score"],
+        "education_score": ats_result["education_score"],
+        "experience_score": ats_result["experience_score"],
+        "keyword_match_score": ats_result["keyword_match_score"],
+        "format_score": ats_result["format_score"],
+        "matched_skills": ats_result["matched_skills"],
+        "missing_skills": ats_result["missing_skills"],
+    }
+
+
+@router.post("/jobs/{job_id}/rank")
+async def rank_applicants(
+    job_id: int,
+    top_k: int = Query(10, ge=1, le=500),
+    stream: bool = False,
+    progress_every: int = Query(200, ge=1),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Rank all applicants of a job by ATS score and return the top K.
+
+    Resumes are loaded with one bulk MongoDB query and scored against the job's cached
+    compiled profile; applicants that cannot reach the current K-th score are pruned
+    before they are fully scored. With `stream=true` the response is NDJSON, with a
+    partial ranking every `progress_every` applicants followed by the final ranking.
+    """
+    if current_user.role.value not in ["recruiter", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only recruiters and admins can rank applicants"
+        )
+
+    def load():
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+        if not job.requirements_json:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Job does not have requirements defined"
+            )
+        applications = (
+            db.query(Application)
+            .options(joinedload(Application.candidate))
+            .filter(Application.job_id == job_id)
+            .all()
+        )
+        candidates = [app.candidate for app in applications if app.candidate is not None]
+        resume_docs = _bulk_load_resume_docs(get_mongo_db(), candidates) if candidates else {}
+        return get_job_profile(job), applications, resume_docs
+
+    # Applications and every applicant's resume are loaded off the event loop, like the scoring
+    job_profile, applications, resume_docs = await run_in_threadpool(load)
+    applications_by_id = {app.id: app for app in applications}
+    unscorable = sum(
+        1 for app in applications
+        if not (resume_docs.get(app.candidate_id) or {}).get("parsed_data")
+    )
+
+    def resumes() -> Iterator:
+        for app in applications:
+            resume_doc = resume_docs.get(app.candidate_id) or {}
+            if resume_doc.get("parsed_data"):
+                try:
+                    resume_data = resume_data_from_doc(resume_doc)
+                except Exception:
+                    continue  # Malformed parsed_data should not abort the whole ranking
+                yield app.id, resume_data
+
+    def to_payload(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "total_applications": len(applications),
+            "unscorable": unscorable,
+            "processed": snapshot["processed"],
+            "scored": snapshot["scored"],
+            "pruned": snapshot["pruned"],
+            "failed": snapshot["failed"],
+            "errors": [
+                {"application_id": item["key"], "error": item["error"]}
+                for item in snapshot["errors"]
+            ],
+            "done": snapshot["done"],
+            "ranking": [
+                _ranking_entry(applications_by_id[item["key"]], item["result"])
+                for item in snapshot["ranking"]
+            ],
+        }
+
+    if stream:
+        def ndjson() -> Iterator[str]:
+            try:
+                for snapshot in ats_engine.rank_resumes(
+                    resumes(), job_profile, top_k=top_k, progress_every=progress_every
+                ):
+                    yield json.dumps(to_payload(snapshot)) + "\n"
+            except Exception as e:
+                # Headers are already sent, so the failure is reported as the last line
+                yield json.dumps({
+                    "job_id": job_id,
+                    "done": True,
+                    "error": f"Error ranking applicants: {str(e)}"
+                }) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    def rank() -> Dict[str, Any]:
+        *_, final = ats_engine.rank_resumes(resumes(), job_profile, top_k=top_k)
+        return to_payload(final)
+
+    try:
+        return await run_in_threadpool(rank)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error ranking applicants: {str(e)}"
+        )
+
+
+@router.get("/memo/stats")
+async def get_memo_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Hit/miss counters of the ATS result memo (admin only)"""
+    if current_user.role.value != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view ATS memo statistics"
+        )
+    return get_ats_memo().stats()
+
+
 class CreateEvaluationRequest(BaseModel):
     candidate_id: int
     job_id: int
@@ -317,7 +676,9 @@ async def create_evaluation(
         
         # If still not found, try to find by user_id as a fallback
         if not resume_doc:
-            resume_doc = mongo_db.resumes.find_one({"user_id": candidate.user_id})
+            resume_doc = mongo_db.resumes.find_one(
+                {"user_id": candidate.user_id}, sort=[("_id", -1)]
+            )
         
         if not resume_doc:
             raise HTTPException(
@@ -332,7 +693,7 @@ async def create_evaluation(
                 detail="Resume document found but parsed_data is missing or empty"
             )
         
-        resume_data = ResumeData(**parsed_data)
+        resume_data = resume_data_from_doc(resume_doc)
         
         # Get job requirements
         if not job.requirements_json:
@@ -341,10 +702,11 @@ async def create_evaluation(
                 detail="Job does not have requirements defined"
             )
         
-        job_requirement = JobRequirement(**job.requirements_json)
+        job_profile = get_job_profile(job)
+        job_requirement = job_profile.requirement
         
         # Score resume
-        ats_result = ats_engine.score_resume(resume_data, job_requirement)
+        ats_result = ats_engine.score_resume(resume_data, job_profile)
         
         # Create evaluation
         evaluation = Evaluation(
@@ -1,18 +1,17 @@
 """JD Analyzer router - resume vs job description skill gap analysis."""
 
-import os
-import sys
-import tempfile
 import importlib.util
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional
 
 from auth.dependencies import get_current_active_user
 from database.models import User
 from database.mongodb import get_mongo_db
+from upload_reader import open_upload
 
 # Allow importing from Backend/JD-Resume-Analyzer when running from Backend
 _backend_dir = Path(__file__).resolve().parent.parent
@@ -26,7 +25,7 @@ _job_descriptions_path = _jd_analyzer_dir / "job_descriptions.py"
 spec = importlib.util.spec_from_file_location("jd_resume_parser", _resume_parser_path)
 resume_parser_module = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(resume_parser_module)
-extract_text_from_resume = resume_parser_module.extract_text_from_resume
+extract_text_from_upload = resume_parser_module.extract_text_from_upload
 
 spec = importlib.util.spec_from_file_location("jd_skill_analyzer", _skill_analyzer_path)
 skill_analyzer_module = importlib.util.module_from_spec(spec)
@@ -97,22 +96,28 @@ def _get_jd_text(jd_name: Optional[str], jd_text: Optional[str]) -> str:
     )
 
 
+def _extract_upload_text(file_data, filename: str) -> str:
+    """Extract text from an uploaded resume held in memory (runs in a worker thread)."""
+    try:
+        text = extract_text_from_upload(file_data, filename)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not extract text from resume file: {str(e)}"
+        )
+    if text and text.strip():
+        return text.strip()
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Provide one of: resume_text, resume_id, or resume file upload"
+    )
+
+
 def _ensure_resume_text(
     resume_text: Optional[str],
     resume_id: Optional[str],
-    resume_file_path: Optional[str],
 ) -> str:
-    """Get resume text from one of: resume_text, resume_id, or file path."""
-    if resume_file_path and os.path.exists(resume_file_path):
-        try:
-            text = extract_text_from_resume(resume_file_path)
-            if text and text.strip():
-                return text.strip()
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Could not extract text from resume file: {str(e)}"
-            )
+    """Get resume text from one of: resume_text or resume_id."""
     if resume_text and resume_text.strip():
         return resume_text.strip()
     if resume_id:
@@ -147,7 +152,7 @@ async def analyze(
     Returns matching/missing skills and match percentage.
     """
     jd_text = _get_jd_text(request.jd_name, request.jd_text)
-    resume_text = _ensure_resume_text(request.resume_text, request.resume_id, None)
+    resume_text = _ensure_resume_text(request.resume_text, request.resume_id)
 
     try:
         analysis_result = analyze_missing_skills(resume_text, jd_text)
@@ -182,13 +187,10 @@ async def analyze_upload(
             detail="Unsupported file type. Use PDF, DOCX, DOC, or TXT."
         )
 
-    tmp_path = None
+    # Size-checked in chunks and read straight from the spooled upload (no temp file)
+    upload = await open_upload(file)
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        resume_text = _ensure_resume_text(None, None, tmp_path)
+        resume_text = await run_in_threadpool(_extract_upload_text, upload, file.filename or f"resume{suffix}")
     except HTTPException:
         raise
     except Exception as e:
@@ -196,12 +198,6 @@ async def analyze_upload(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing resume file: {str(e)}"
         )
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
 
     try:
         analysis_result = analyze_missing_skills(resume_text, jd_text_resolved)
@@ -1,71 +1,64 @@
 """Job management router"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
 
 from database.postgres import get_db
 from database.mongodb import get_mongo_db
-from database.models import User, Job, Application
-from database.schemas import JobCreate, JobUpdate, JobResponse
+from database.models import User, Job, Application, Candidate
+from database.schemas import JobCreate, JobUpdate, JobResponse, SimilarCandidateResponse
 from auth.dependencies import get_current_active_user
-from config import USE_QDRANT_MATCHING, QDRANT_COLLECTION_JOBS
-from vector.embedder import get_embedder
-from vector.qdrant_client import ensure_collections, upsert_points
+from config import QDRANT_COLLECTION_JOBS, USE_QDRANT_MATCHING
+from vector.batcher import get_embedding_batcher
+from vector.candidate_index import similar_candidates
+from vector.qdrant_client import delete_points, ensure_collections
+from vector.reindex import sync_job_points
+from vector.job_index import update_job_in_indexes, remove_job_from_indexes
+from job_profiles import invalidate_job_profile
 
 router = APIRouter(prefix="/api/v1/jobs", tags=["Jobs"])
 
 
-def _build_job_vector_text_and_payload(job: Job) -> tuple[str, dict]:
-    """Construct the text representation and payload for a job for vector search."""
-    requirements = job.requirements_json or {}
-    required_skills = requirements.get("required_skills") or []
-    job_description = requirements.get("job_description") or ""
+def _index_job_in_qdrant(job: Job) -> None:
+    """
+    Index or update a single job in the Qdrant collection.
 
-    text_parts = [
-        job.title or "",
-        job.company or "",
-        job.description or "",
-        job_description or "",
-        ", ".join(required_skills),
-    ]
-    full_text = " ".join(part for part in text_parts if part)
+    The job is only embedded again when its text changed; other edits patch the payload.
+    """
+    if not USE_QDRANT_MATCHING:
+        return
 
-    payload = {
-        "job_id": job.id,
-        "title": job.title,
-        "company": job.company,
-        "location": job.location,
-        "salary": job.salary,
-        "required_skills": required_skills,
-        "created_at": job.created_at.isoformat() if job.created_at else None,
-    }
-    return full_text, payload
+    try:
+        embedder = get_embedding_batcher()
+        ensure_collections(embedder.dimension)
+        sync_job_points([job], embedder)
+    except Exception as e:
+        # Indexing failures should not break core job flows
+        print(f"[QDRANT] Failed to index job {job.id}: {e}")
 
 
-def _index_job_in_qdrant(job: Job) -> None:
-    """Index or update a single job in the Qdrant collection."""
+def _remove_job_from_qdrant(job_id: int) -> None:
+    """Delete a deleted job's point, so filtered searches do not return it."""
     if not USE_QDRANT_MATCHING:
         return
 
     try:
-        embedder = get_embedder()
-        text, payload = _build_job_vector_text_and_payload(job)
-        if not text:
-            return
+        delete_points(QDRANT_COLLECTION_JOBS, [job_id])
+    except Exception as e:
+        # The next reindex deletes points whose job is gone
+        print(f"[QDRANT] Failed to remove job {job_id}: {e}")
 
-        vector = embedder.embed_text(text)
-        ensure_collections(embedder.dimension)
-        upsert_points(
-            collection=QDRANT_COLLECTION_JOBS,
-            ids=[str(job.id)],
-            vectors=[vector],
-            payloads=[payload],
-        )
+
+def _refresh_job_search_index(job: Job) -> None:
+    """Keep the in-memory job embedding index used by student search in sync."""
+    try:
+        update_job_in_indexes(job)
     except Exception as e:
-        # Indexing failures should not break core job flows
-        print(f"[QDRANT] Failed to index job {job.id}: {e}")
+        # A stale row is re-encoded on the next search, so never fail the request
+        print(f"[JOB INDEX] Failed to refresh job {job.id}: {e}")
 
 
 @router.get("", response_model=List[JobResponse])
@@ -150,7 +143,9 @@ async def create_job(
     db.refresh(new_job)
 
     # Best-effort index in Qdrant for semantic search
-    _index_job_in_qdrant(new_job)
+    # (in the thread pool, so waiting on the shared embedding batch never blocks the event loop)
+    await run_in_threadpool(_index_job_in_qdrant, new_job)
+    await run_in_threadpool(_refresh_job_search_index, new_job)
 
     return new_job
 
@@ -189,6 +184,71 @@ async def get_job(
     return JobResponse(**job_dict)
 
 
+def _search_similar_candidates(job: Job, top_k: int):
+    embedder = get_embedding_batcher()
+    ensure_collections(embedder.dimension)
+    return similar_candidates(job, embedder, top_k=top_k)
+
+
+@router.get("/{job_id}/similar-candidates", response_model=List[SimilarCandidateResponse])
+async def get_similar_candidates(
+    job_id: int,
+    top_k: int = Query(default=10, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Candidates whose resumes are most similar to this job (semantic search in Qdrant).
+
+    The job's vector is matched against every indexed resume passage; a candidate scores
+    as its best passage, which is returned with the section it came from.
+    """
+    if current_user.role.value not in ["recruiter", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only recruiters and admins can search candidates"
+        )
+
+    if not USE_QDRANT_MATCHING:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Qdrant matching is disabled. Enable USE_QDRANT_MATCHING to use this endpoint."
+        )
+
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    try:
+        matches = await run_in_threadpool(_search_similar_candidates, job, top_k)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Vector search unavailable: {str(e)}"
+        )
+
+    # One query for all matched candidates; points of deleted candidates are dropped
+    candidates = {
+        candidate.id: candidate
+        for candidate in db.query(Candidate).filter(
+            Candidate.id.in_([match["candidate_id"] for match in matches])
+        ).all()
+    } if matches else {}
+    return [
+        SimilarCandidateResponse(
+            candidate=candidates[match["candidate_id"]],
+            score=match["score"],
+            section=match["section"],
+            passage=match["passage"],
+        )
+        for match in matches
+        if match["candidate_id"] in candidates
+    ]
+
+
 @router.put("/{job_id}", response_model=JobResponse)
 async def update_job(
     job_id: int,
@@ -232,7 +292,10 @@ async def update_job(
     db.refresh(job)
 
     # Best-effort re-index in Qdrant when job changes
-    _index_job_in_qdrant(job)
+    await run_in_threadpool(_index_job_in_qdrant, job)
+    await run_in_threadpool(_refresh_job_search_index, job)
+    # Scoring profiles are keyed by requirements hash; drop the stale one right away
+    invalidate_job_profile(job.id)
 
     return job
 
@@ -261,5 +324,8 @@ async def delete_job(
     
     db.delete(job)
     db.commit()
+    await run_in_threadpool(_remove_job_from_qdrant, job_id)
+    remove_job_from_indexes(job_id)
+    invalidate_job_profile(job_id)
     
     return None
@@ -1,33 +1,86 @@
 """Resume parser router"""
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, File, UploadFile, Form
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from datetime import datetime
 import os
+import shutil
+import tempfile
 import uuid
+import zipfile
 
-from database.postgres import get_db
+from database.postgres import SessionLocal, get_db
 from database.mongodb import get_mongo_db
 from database.schemas import ResumeParseRequest, ResumeParseResponse
 from resume_parser import ResumeParser
+from document_extraction import DocumentSource, get_document_extractor
 from auth.dependencies import get_current_active_user
-from database.models import User, Candidate
+from database.models import Candidate, User
 from config import (
-    UPLOAD_DIR,
     ALLOWED_EXTENSIONS,
-    USE_LLM_RESUME_ENRICH,
-    USE_LLM_RESUME_ENRICH_UPDATE_CANDIDATE,
+    BULK_INGEST_MAX_ARCHIVE_SIZE,
+    RESUME_DEDUP_ENABLED,
+    USE_QDRANT_MATCHING,
 )
-from llm.resume_enricher import enrich_resume
+from llm.enrichment_worker import get_enrichment_worker, pending_enrichment, text_sha256
+from upload_reader import open_upload
+from resume_blobs import content_sha256, get_resume_blob_cache
+from resume_ingest import ResumeIngestion, create_ingest_job, get_ingest_job
+from routers.notifications import notify_user
+from vector.batcher import get_embedding_batcher
+from vector.candidate_index import sync_candidate_points
+from vector.qdrant_client import ensure_collections
 
 router = APIRouter(prefix="/api/v1/resume", tags=["Resume"])
 
 # Initialize parser
 resume_parser = ResumeParser()
 
-# Create uploads directory if it doesn't exist
-if not os.path.exists(UPLOAD_DIR):
-    os.makedirs(UPLOAD_DIR)
+# Asynchronous upload (POST /upload/async) statuses and the stages reported on the way
+PROCESSING_QUEUED = "queued"
+PROCESSING_RUNNING = "processing"
+PROCESSING_COMPLETED = "completed"
+PROCESSING_FAILED = "failed"
+PROCESSING_STAGE_STARTED = "started"
+PROCESSING_STAGE_PARSED = "parsed"
+PROCESSING_STAGE_ENRICHED = "enriched"
+PROCESSING_STAGE_STORED = "stored"
+
+
+def _index_candidate_resumes(resumes: List[Dict[str, Any]]) -> None:
+    """
+    Embed the resume passages of candidates into the Qdrant candidates collection.
+
+    Each entry holds candidate_id, user_id, resume_id and text; unchanged resumes are skipped.
+    """
+    if not USE_QDRANT_MATCHING or not resumes:
+        return
+
+    try:
+        embedder = get_embedding_batcher()
+        ensure_collections(embedder.dimension)
+        sync_candidate_points(resumes, embedder)
+    except Exception as e:
+        # Indexing failures should not break resume flows
+        print(f"[QDRANT] Failed to index {len(resumes)} candidate resume(s): {e}")
+
+
+def _index_resume_for_user(user_id: int, resume_id: str, text: str) -> None:
+    """Index a student's new resume for their candidate profile (if they have one)."""
+    if not USE_QDRANT_MATCHING:
+        return
+
+    db = SessionLocal()
+    try:
+        candidate_id = db.query(Candidate.id).filter(Candidate.user_id == user_id).scalar()
+    finally:
+        db.close()
+    if candidate_id is not None:
+        _index_candidate_resumes([
+            {"candidate_id": candidate_id, "user_id": user_id, "resume_id": resume_id, "text": text}
+        ])
 
 
 @router.post("/parse", response_model=ResumeParseResponse)
@@ -46,36 +99,28 @@ async def parse_resume(
     try:
         # Parse resume
         parsed_data = resume_parser.parse(resume_text=request.resume_text)
+        features = parsed_data.pop("features", None)
 
-        # Optional LLM-based enrichment
-        if USE_LLM_RESUME_ENRICH:
-            enriched = enrich_resume(parsed_data)
-            if enriched:
-                parsed_data["enriched"] = enriched
-
-                # Optionally merge normalized skills into candidate profile
-                if USE_LLM_RESUME_ENRICH_UPDATE_CANDIDATE:
-                    normalized_skills = enriched.get("normalized_skills") or []
-                    if normalized_skills:
-                        candidate = db.query(Candidate).filter(Candidate.user_id == current_user.id).first()
-                        if candidate:
-                            existing_skills = candidate.skills_json or []
-                            merged = sorted({s.strip() for s in (existing_skills + normalized_skills) if s})
-                            candidate.skills_json = merged
-                            db.commit()
-        # Store in MongoDB
+        # Store in MongoDB; LLM enrichment (if enabled) happens later in the enrichment worker
         mongo_db = get_mongo_db()
         resume_id = str(uuid.uuid4())
         
         resume_doc = {
             "resume_id": resume_id,
             "user_id": current_user.id,
+            # Hash of the submitted text: identical resumes are enriched once
+            "content_sha256": text_sha256(request.resume_text),
             "raw_text": parsed_data.get("raw_text", ""),
             "parsed_data": parsed_data,
-            "created_at": str(uuid.uuid4())  # Use timestamp in production
+            "features": features,
+            "created_at": str(uuid.uuid4()),  # Use timestamp in production
+            **pending_enrichment()
         }
         
         mongo_db.resumes.insert_one(resume_doc)
+        if resume_doc.get("enrichment_status"):
+            get_enrichment_worker().wake()
+        await run_in_threadpool(_index_resume_for_user, current_user.id, resume_id, resume_doc["raw_text"])
         
         return ResumeParseResponse(
             resume_id=resume_id,
@@ -89,6 +134,87 @@ async def parse_resume(
         )
 
 
+def _validate_extension(filename: Optional[str]) -> None:
+    file_extension = os.path.splitext(filename)[1].lower() if filename else ""
+    if file_extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+
+
+async def _process_upload(
+    source: DocumentSource,
+    filename: str,
+    size: Optional[int],
+    user_id: int,
+    resume_id: str,
+    on_stage: Optional[Callable[..., Awaitable[None]]] = None
+) -> Dict[str, Any]:
+    """
+    Upload pipeline shared by the synchronous and the asynchronous upload: dedup lookup,
+    parsing, the resume insert and queueing for enrichment. Blocking stages run in the thread
+    pool; `on_stage(stage, **details)` is awaited after each one.
+
+    Returns:
+        parsed_data as stored on the resume document
+    """
+    async def stage_done(stage: str, **details) -> None:
+        if on_stage:
+            await on_stage(stage, **details)
+
+    mongo_db = get_mongo_db()
+    blob_cache = get_resume_blob_cache()
+
+    # Identical files (from any user) are parsed and enriched once, keyed by SHA-256
+    content_hash = await run_in_threadpool(content_sha256, source)
+    cached = None
+    if RESUME_DEDUP_ENABLED:
+        cached = await run_in_threadpool(blob_cache.lookup, mongo_db.resume_blobs, content_hash)
+    if cached:
+        parsed_data, features, enriched = cached["parsed_data"], cached["features"], cached["enriched"]
+        blob_update = {}
+    else:
+        # Parse resume off the event loop (extraction itself runs in the process pool)
+        parsed_data = await run_in_threadpool(
+            resume_parser.parse, file_data=source, filename=filename
+        )
+        features = parsed_data.pop("features", None)
+        enriched = None
+        blob_update = {"parsed_data": dict(parsed_data), "features": features, "size": size}
+    await stage_done(PROCESSING_STAGE_PARSED, cached=bool(cached))
+
+    # LLM enrichment never runs in the request: a cached enrichment of the same file is
+    # returned at once, otherwise the stored resume is queued for the enrichment worker
+    queue_fields = pending_enrichment()
+    if queue_fields and enriched:
+        parsed_data["enriched"] = enriched
+        await stage_done(PROCESSING_STAGE_ENRICHED, cached=True)
+
+    if RESUME_DEDUP_ENABLED:
+        await run_in_threadpool(blob_cache.record_upload, mongo_db.resume_blobs, content_hash, **blob_update)
+
+    # Store in MongoDB
+    resume_doc = {
+        "resume_id": resume_id,
+        "user_id": user_id,
+        "filename": filename,
+        "content_sha256": content_hash,
+        "raw_text": parsed_data.get("raw_text", ""),
+        "parsed_data": parsed_data,
+        "features": features,
+        "created_at": str(uuid.uuid4()),  # Use timestamp in production
+        # Queued even with a cached enrichment: the worker merges its skills into the candidate
+        **queue_fields
+    }
+    await run_in_threadpool(mongo_db.resumes.insert_one, resume_doc)
+    if queue_fields:
+        get_enrichment_worker().wake()
+    await run_in_threadpool(_index_resume_for_user, user_id, resume_id, resume_doc["raw_text"])
+    await stage_done(PROCESSING_STAGE_STORED, resume_id=resume_id, enrichment_queued=bool(queue_fields))
+    return parsed_data
+
+
 @router.post("/upload", response_model=ResumeParseResponse)
 async def upload_resume(
     file: UploadFile = File(...),
@@ -96,57 +222,14 @@ async def upload_resume(
     db: Session = Depends(get_db)
 ):
     """Upload and parse resume file"""
-    # Validate file extension
-    file_extension = os.path.splitext(file.filename)[1].lower() if file.filename else ""
-    if file_extension not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
+    _validate_extension(file.filename)
     
-    # Save file temporarily
+    # Size-checked in chunks; parsed straight from the spooled upload, never written to disk
+    upload = await open_upload(file)
     resume_id = str(uuid.uuid4())
-    file_path = os.path.join(UPLOAD_DIR, f"{resume_id}{file_extension}")
     
     try:
-        # Save uploaded file
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # Parse resume
-        parsed_data = resume_parser.parse(file_path=file_path)
-
-        # Optional LLM-based enrichment
-        if USE_LLM_RESUME_ENRICH:
-            enriched = enrich_resume(parsed_data)
-            if enriched:
-                parsed_data["enriched"] = enriched
-
-                # Optionally merge normalized skills into candidate profile
-                if USE_LLM_RESUME_ENRICH_UPDATE_CANDIDATE:
-                    normalized_skills = enriched.get("normalized_skills") or []
-                    if normalized_skills:
-                        candidate = db.query(Candidate).filter(Candidate.user_id == current_user.id).first()
-                        if candidate:
-                            existing_skills = candidate.skills_json or []
-                            merged = sorted({s.strip() for s in (existing_skills + normalized_skills) if s})
-                            candidate.skills_json = merged
-                            db.commit()
-
-        # Store in MongoDB
-        mongo_db = get_mongo_db()
-        resume_doc = {
-            "resume_id": resume_id,
-            "user_id": current_user.id,
-            "filename": file.filename,
-            "raw_text": parsed_data.get("raw_text", ""),
-            "parsed_data": parsed_data,
-            "created_at": str(uuid.uuid4())  # Use timestamp in production
-        }
-        
-        mongo_db.resumes.insert_one(resume_doc)
-        
+        parsed_data = await _process_upload(upload, file.filename, file.size, current_user.id, resume_id)
         return ResumeParseResponse(
             resume_id=resume_id,
             parsed_data=parsed_data,
@@ -157,13 +240,223 @@ async def upload_resume(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing resume: {str(e)}"
         )
+
+
+async def _process_upload_in_background(processing_id: str, data: bytes, filename: str, user_id: int) -> None:
+    """Background task of an asynchronous upload: run the pipeline, report every stage."""
+    mongo_db = None
+
+    def notify(stage: str, status_value: str, **details) -> None:
+        # On the event loop: the notification queues are not thread-safe
+        notify_user(user_id, {
+            "type": "resume_processing", "processing_id": processing_id,
+            "status": status_value, "stage": stage, **details,
+        })
+
+    async def report(stage: str, status_value: str = PROCESSING_RUNNING, **details) -> None:
+        fields = {"status": status_value, "stage": stage, **details}
+        if status_value in (PROCESSING_COMPLETED, PROCESSING_FAILED):
+            fields["finished_at"] = datetime.utcnow()
+        await run_in_threadpool(
+            mongo_db.resume_processing.update_one,
+            {"processing_id": processing_id},
+            {"$set": fields, "$push": {"stages": {"stage": stage, "at": datetime.utcnow(), **details}}},
+        )
+        notify(stage, status_value, **details)
+
+    try:
+        mongo_db = get_mongo_db()
+        await report(PROCESSING_STAGE_STARTED)
+        resume_id = str(uuid.uuid4())
+        await _process_upload(data, filename, len(data), user_id, resume_id, on_stage=report)
+        await report(PROCESSING_COMPLETED, PROCESSING_COMPLETED, resume_id=resume_id)
+    except Exception as e:
+        error = f"Error processing resume: {str(e)}"
+        try:
+            if mongo_db is None:
+                mongo_db = get_mongo_db()
+            await report(PROCESSING_FAILED, PROCESSING_FAILED, error=error)
+        except Exception as report_error:
+            # The status store itself is unavailable; the user is still told
+            print(f"Warning: could not record the failure of resume processing {processing_id}: {report_error}")
+            notify(PROCESSING_FAILED, PROCESSING_FAILED, error=error)
+
+
+@router.post("/upload/async", status_code=status.HTTP_202_ACCEPTED)
+async def upload_resume_async(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Upload a resume and process it in the background.
+
+    Responds 202 with a processing id as soon as the file is received. Parsing and storage
+    happen afterwards; each completed stage is pushed to the user's notification stream
+    (type "resume_processing") and recorded on GET /processing/{processing_id}, which also
+    carries the resume_id once stored. LLM enrichment follows in the enrichment worker
+    (a "resume_enriched" notification).
+    """
+    _validate_extension(file.filename)
+    upload = await open_upload(file)
+    # The upload is closed with the request; the background task keeps its own copy
+    data = await run_in_threadpool(upload.read)
+
+    processing_id = str(uuid.uuid4())
+    processing_doc = {
+        "processing_id": processing_id,
+        "user_id": current_user.id,
+        "filename": file.filename,
+        "status": PROCESSING_QUEUED,
+        "stage": None,
+        "stages": [],
+        "resume_id": None,
+        "created_at": datetime.utcnow(),
+        "finished_at": None,
+    }
+    await run_in_threadpool(get_mongo_db().resume_processing.insert_one, dict(processing_doc))
+    background_tasks.add_task(_process_upload_in_background, processing_id, data, file.filename, current_user.id)
+    return {
+        "processing_id": processing_id,
+        "status": PROCESSING_QUEUED,
+        "status_url": f"{router.prefix}/processing/{processing_id}",
+    }
+
+
+@router.get("/processing/{processing_id}")
+async def get_processing_status(
+    processing_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Status of an asynchronous upload: current stage, completed stages, resume_id or error"""
+    processing_doc = await run_in_threadpool(
+        get_mongo_db().resume_processing.find_one, {"processing_id": processing_id}, {"_id": 0}
+    )
+    if not processing_doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Processing job not found"
+        )
+    if processing_doc.get("user_id") != current_user.id and current_user.role.value != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this processing job"
+        )
+    return processing_doc
+
+
+def require_tpo_or_admin(current_user: User) -> None:
+    if current_user.role.value not in ["tpo", "admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only TPO and admins can bulk-ingest resumes"
+        )
+
+
+def _run_bulk_ingest(archive_path: str, job_id: str, user_id: int) -> None:
+    """Background task: ingest a saved archive with its own database session."""
+    db = SessionLocal()
+    try:
+        ResumeIngestion(get_mongo_db(), db, job_id=job_id, user_id=user_id,
+                        on_linked=_index_candidate_resumes).run(archive_path)
+    except Exception as e:
+        # The failure is recorded on the job document as well
+        print(f"Bulk ingest job {job_id} failed: {e}")
     finally:
-        # Clean up uploaded file
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
+        db.close()
+        os.remove(archive_path)
+
+
+@router.post("/bulk", status_code=status.HTTP_202_ACCEPTED)
+async def bulk_upload_resumes(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Bulk-ingest a ZIP archive of PDF/DOCX resumes (TPO or admin).
+
+    Returns the queued ingest job at once; files are parsed in parallel workers, stored in
+    batches and linked to candidates by email. Poll GET /bulk/{job_id} for progress.
+    """
+    require_tpo_or_admin(current_user)
+    if not (file.filename or "").lower().endswith(".zip"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bulk ingestion expects a .zip archive of resumes"
+        )
+    upload = await open_upload(file, max_size=BULK_INGEST_MAX_ARCHIVE_SIZE)
+    if not zipfile.is_zipfile(upload):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File is not a valid ZIP archive"
+        )
+
+    # The upload is closed with the request; the background job reads its own copy
+    fd, archive_path = tempfile.mkstemp(suffix=".zip")
+    with os.fdopen(fd, "wb") as archive:
+        upload.seek(0)
+        await run_in_threadpool(shutil.copyfileobj, upload, archive)
+
+    job = create_ingest_job(get_mongo_db(), current_user.id, file.filename)
+    background_tasks.add_task(_run_bulk_ingest, archive_path, job["job_id"], current_user.id)
+    return job
+
+
+@router.get("/bulk/{job_id}")
+async def get_bulk_ingest_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Progress of a bulk ingest job: counts, resumes per second and the first errors"""
+    require_tpo_or_admin(current_user)
+    job = get_ingest_job(get_mongo_db(), job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ingest job not found"
+        )
+    return job
+
+
+@router.get("/enrichment/stats")
+async def get_enrichment_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Backlog and throughput of the background LLM enrichment worker (admin only)"""
+    if current_user.role.value != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view enrichment statistics"
+        )
+    return await run_in_threadpool(get_enrichment_worker().stats)
+
+
+@router.get("/dedup/stats")
+async def get_dedup_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Hit rate of the parsed-resume dedup cache and duplicate uploads overall (admin only)"""
+    if current_user.role.value != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view resume dedup statistics"
+        )
+    # The duplicate-upload count is an aggregate over resume_blobs
+    return await run_in_threadpool(get_resume_blob_cache().stats, get_mongo_db().resume_blobs)
+
+
+@router.get("/extraction/metrics")
+async def get_extraction_metrics(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Queue depth, budget hits and timings of resume text extraction (admin only)"""
+    if current_user.role.value != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view extraction metrics"
+        )
+    return get_document_extractor().stats()
 
 
 @router.get("/{resume_id}", response_model=ResumeParseResponse)
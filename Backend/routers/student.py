@@ -1,6 +1,7 @@
 """Student engine router"""
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -13,10 +14,11 @@ from database.schemas import (
     RejectionInterpretRequest, RejectionInterpretResponse,
     StudentApplicationResponse
 )
-from student_engine import CampusConnectStudentEngine
+from student_engine import get_student_engine
 from auth.dependencies import get_current_active_user
 from config import USE_QDRANT_MATCHING, QDRANT_COLLECTION_JOBS, USE_LLM_FEEDBACK
-from vector.embedder import get_embedder
+from vector.batcher import get_embedding_batcher
+from vector.job_index import extract_query_skills, job_search_filter, job_to_search_dict
 from vector.qdrant_client import search as qdrant_search, ensure_collections
 from qdrant_client.http import models as qm
 from llm.student_feedback import (
@@ -26,8 +28,52 @@ from llm.student_feedback import (
 
 router = APIRouter(prefix="/api/v1/student", tags=["Student"])
 
-# Initialize student engine
-student_engine = CampusConnectStudentEngine()
+# Shared student engine (models come from the process-wide registry)
+student_engine = get_student_engine()
+
+
+def _search_jobs_in_qdrant(db: Session, request: JobSearchRequest, query_vec: List[float],
+                           dimension: int) -> List[dict]:
+    """Filtered Qdrant search plus the job rows of the hits (blocking: run in the thread pool)."""
+    ensure_collections(dimension)
+
+    # Skills named in the query, location, company and recency are filtered inside
+    # Qdrant, so the top_k hits are exactly the results (no filtering afterwards)
+    scored_points = qdrant_search(
+        collection=QDRANT_COLLECTION_JOBS,
+        query_vector=query_vec,
+        top_k=request.top_k,
+        filter_=job_search_filter(
+            query_skills=extract_query_skills(request.query),
+            location=request.location,
+            company=request.company,
+            posted_within_days=request.posted_within_days,
+        ),
+    )
+
+    if not scored_points:
+        return []
+
+    # Fetch corresponding jobs from DB
+    job_ids = [int(point.payload.get("job_id")) for point in scored_points if point.payload.get("job_id") is not None]
+    if not job_ids:
+        return []
+
+    jobs = db.query(Job).filter(Job.id.in_(job_ids)).all()
+    jobs_by_id = {job.id: job for job in jobs}
+
+    # Keep Qdrant's order and scores; only the application status is computed here
+    scored_jobs = []
+    for point in scored_points:
+        job_id = point.payload.get("job_id")
+        if job_id is None:
+            continue
+        job = jobs_by_id.get(int(job_id))
+        if not job:
+            continue
+        scored_jobs.append((job_to_search_dict(job), float(point.score)))
+
+    return student_engine.match_results(scored_jobs, request.student_skills)
 
 
 @router.post("/jobs/search", response_model=List[JobSearchResponse])
@@ -38,87 +84,21 @@ async def search_jobs(
 ):
     """Natural language job search"""
     try:
-        # If Qdrant matching is disabled, fall back to existing in-memory search
+        # Both paths apply the same filters (vector.job_index.job_search_filter) before ranking
         if not USE_QDRANT_MATCHING:
-            jobs = db.query(Job).all()
-
-            jobs_list = []
-            for job in jobs:
-                requirements = job.requirements_json or {}
-                jobs_list.append({
-                    "id": job.id,
-                    "title": job.title,
-                    "company": job.company,
-                    "location": job.location,
-                    "salary": job.salary,
-                    "description": job.description or "",
-                    "requirements": requirements.get("job_description", "") or
-                                  f"{', '.join(requirements.get('required_skills', []))}"
-                })
-
-            results = student_engine.search_jobs(
-                student_query=request.query,
-                jobs=jobs_list,
-                student_skills=request.student_skills,
-                top_k=request.top_k
+            # Persistent job index: no per-search table scan, only the top_k jobs are loaded
+            results = await run_in_threadpool(
+                student_engine.search_jobs_in_db, db, request.query, request.student_skills, request.top_k,
+                location=request.location, company=request.company,
+                posted_within_days=request.posted_within_days,
             )
         else:
             # Qdrant-backed semantic search
-            embedder = get_embedder()
-            ensure_collections(embedder.dimension)
-            query_vec = embedder.embed_text(request.query)
+            # Shares one encode with other concurrent searches and job indexing
+            embedder = get_embedding_batcher()
+            query_vec = await embedder.embed(request.query)
+            results = await run_in_threadpool(_search_jobs_in_qdrant, db, request, query_vec, embedder.dimension)
 
-            scored_points = qdrant_search(
-                collection=QDRANT_COLLECTION_JOBS,
-                query_vector=query_vec,
-                top_k=request.top_k,
-                filter_=None,
-            )
-
-            if not scored_points:
-                return []
-
-            # Fetch corresponding jobs from DB
-            job_ids = [int(point.payload.get("job_id")) for point in scored_points if point.payload.get("job_id") is not None]
-            if not job_ids:
-                return []
-
-            jobs = db.query(Job).filter(Job.id.in_(job_ids)).all()
-            jobs_by_id = {job.id: job for job in jobs}
-
-            # Rebuild job dicts in the order of Qdrant scores
-            jobs_list = []
-            for point in scored_points:
-                job_id = point.payload.get("job_id")
-                if job_id is None:
-                    continue
-                job = jobs_by_id.get(int(job_id))
-                if not job:
-                    continue
-
-                requirements = job.requirements_json or {}
-                jobs_list.append({
-                    "id": job.id,
-                    "title": job.title,
-                    "company": job.company,
-                    "location": job.location,
-                    "salary": job.salary,
-                    "description": job.description or "",
-                    "requirements": requirements.get("job_description", "") or
-                                  f"{', '.join(requirements.get('required_skills', []))}"
-                })
-
-            if not jobs_list:
-                return []
-
-            # Reuse existing job matching logic to determine application status
-            results = student_engine.search_jobs(
-                student_query=request.query,
-                jobs=jobs_list,
-                student_skills=request.student_skills,
-                top_k=request.top_k
-            )
-        
         # Convert to response format
         response_list = []
         for result in results:
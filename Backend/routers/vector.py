@@ -1,29 +1,53 @@
 """Vector indexing and reindexing router (Qdrant)."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from datetime import datetime
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
 from auth.dependencies import get_current_active_user
-from config import QDRANT_COLLECTION_JOBS, USE_QDRANT_MATCHING
-from database.models import Job, User
-from database.postgres import get_db
-from vector.embedder import get_embedder
-from vector.qdrant_client import ensure_collections, upsert_points
+from config import USE_QDRANT_MATCHING
+from database.models import User
+from database.mongodb import get_mongo_db
+from database.postgres import SessionLocal
+from vector.batcher import get_embedding_batcher
+from vector.qdrant_client import ensure_collections
+from vector.reindex import (
+    REINDEX_FAILED,
+    REINDEX_QUEUED,
+    REINDEX_RUNNING,
+    JobReindex,
+    claim_for_resume,
+    create_reindex_job,
+    get_reindex_job,
+    is_resumable,
+    latest_reindex_job,
+)
 
 
 router = APIRouter(prefix="/api/v1/vector", tags=["Vector"])
 
 
-@router.post("/reindex/jobs")
-async def reindex_jobs(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
-):
-    """
-    Reindex all jobs into Qdrant.
+def _run_reindex(reindex_id: str, force: bool) -> None:
+    """Background task: stream the jobs table into Qdrant with its own database session."""
+    mongo_db = get_mongo_db()
+    db = SessionLocal()
+    try:
+        embedder = get_embedding_batcher()
+        ensure_collections(embedder.dimension)
+        JobReindex(mongo_db, db, embedder, reindex_id=reindex_id, force=force).run()
+    except Exception as e:
+        # Recorded on the reindex job as well; a later POST resumes from its checkpoint
+        print(f"[QDRANT] Reindex {reindex_id} failed: {e}")
+        mongo_db.reindex_jobs.update_one(
+            {"reindex_id": reindex_id},
+            {"$set": {"status": REINDEX_FAILED, "error": str(e), "updated_at": datetime.utcnow()}},
+        )
+    finally:
+        db.close()
 
-    Admin-only endpoint, used for initial backfill or maintenance.
-    """
+
+def _require_admin_with_qdrant(current_user: User) -> None:
     if not USE_QDRANT_MATCHING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -36,55 +60,60 @@ async def reindex_jobs(
             detail="Only admins can trigger reindexing.",
         )
 
-    jobs = db.query(Job).all()
-    if not jobs:
-        return {"indexed": 0}
-
-    embedder = get_embedder()
-    ensure_collections(embedder.dimension)
-
-    ids = []
-    vectors = []
-    payloads = []
-
-    for job in jobs:
-        requirements = job.requirements_json or {}
-        required_skills = requirements.get("required_skills") or []
-        job_description = requirements.get("job_description") or ""
-
-        text_parts = [
-            job.title or "",
-            job.company or "",
-            job.description or "",
-            job_description or "",
-            ", ".join(required_skills),
-        ]
-        full_text = " ".join(part for part in text_parts if part)
-        if not full_text:
-            continue
-
-        vec = embedder.embed_text(full_text)
-        ids.append(str(job.id))
-        vectors.append(vec)
-        payloads.append(
-            {
-                "job_id": job.id,
-                "title": job.title,
-                "company": job.company,
-                "location": job.location,
-                "salary": job.salary,
-                "required_skills": required_skills,
-                "created_at": job.created_at.isoformat() if job.created_at else None,
-            }
-        )
 
-    if ids:
-        upsert_points(
-            collection=QDRANT_COLLECTION_JOBS,
-            ids=ids,
-            vectors=vectors,
-            payloads=payloads,
+@router.post("/reindex/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def reindex_jobs(
+    background_tasks: BackgroundTasks,
+    resume: bool = True,
+    force: bool = False,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Reindex all jobs into Qdrant in the background.
+
+    Admin-only endpoint, used for initial backfill or maintenance. Returns the reindex job
+    at once; jobs are streamed from PostgreSQL, embedded and upserted chunk by chunk, with
+    a checkpoint after each chunk. Jobs whose text hash and embedding model match their
+    stored point are not embedded again (counted as skipped; pass force=true to re-embed
+    everything). If the previous reindex failed or was interrupted, it is resumed from
+    its checkpoint (pass resume=false to start over). Poll GET /reindex/jobs/{reindex_id}
+    for progress.
+    """
+    _require_admin_with_qdrant(current_user)
+
+    mongo_db = get_mongo_db()
+    latest = await run_in_threadpool(latest_reindex_job, mongo_db)
+    if latest and latest["status"] in (REINDEX_QUEUED, REINDEX_RUNNING) and not is_resumable(latest):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Reindex {latest['reindex_id']} is already running",
         )
 
-    return {"indexed": len(ids)}
+    if resume and latest and is_resumable(latest):
+        if not await run_in_threadpool(claim_for_resume, mongo_db, latest):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Reindex {latest['reindex_id']} was resumed by another request",
+            )
+        job = await run_in_threadpool(get_reindex_job, mongo_db, latest["reindex_id"])
+    else:
+        job = await run_in_threadpool(create_reindex_job, mongo_db, current_user.id, force)
+
+    background_tasks.add_task(_run_reindex, job["reindex_id"], job.get("force", False))
+    return job
 
+
+@router.get("/reindex/jobs/{reindex_id}")
+async def get_reindex_status(
+    reindex_id: str,
+    current_user: User = Depends(get_current_active_user),
+):
+    """Progress of a reindex: processed / embedded / skipped jobs, checkpoint and jobs per second"""
+    _require_admin_with_qdrant(current_user)
+    job = await run_in_threadpool(get_reindex_job, get_mongo_db(), reindex_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reindex job not found",
+        )
+    return job
@@ -103,6 +103,7 @@ def seed_users_and_candidates(db):
                 resume_doc = {
                     "user_id": user.id,
                     "parsed_data": parsed_resume,
+                    "features": parsed_resume.pop("features", None),
                     "raw_text": resume_text,
                     "created_at": datetime.utcnow()
                 }
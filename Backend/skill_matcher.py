@@ -0,0 +1,124 @@
+"""
+Skill Matcher Module
+Compiled skill matching for the ATS engine: job-side skills are normalized and indexed
+by character trigrams once per job requirement, so scoring a resume no longer runs a
+SequenceMatcher for every (job skill x resume skill) pair.
+
+Matching semantics are identical to the original pairwise loop: a job skill is matched
+by a resume skill when either string contains the other, or when
+SequenceMatcher(None, job_skill, resume_skill).ratio() >= threshold.
+"""
+
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, Sequence, Set, Tuple
+
+from config import SKILL_MATCH_CACHE_SIZE
+
+
+def normalize_skill(skill: str) -> str:
+    """Canonical form used for comparisons (same as the ATS engine has always used)."""
+    return skill.lower().strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@lru_cache(maxsize=SKILL_MATCH_CACHE_SIZE)
+def skill_similarity(job_skill: str, resume_skill: str) -> float:
+    """SequenceMatcher ratio for a normalized skill pair, memoized in a bounded LRU."""
+    return SequenceMatcher(None, job_skill, resume_skill).ratio()
+
+
+class CompiledSkillMatcher:
+    """Required/preferred skills of one job requirement, pre-normalized and trigram-indexed"""
+
+    def __init__(self, required_skills: Sequence[str], preferred_skills: Sequence[str],
+                 threshold: float = 0.7):
+        self.threshold = threshold
+        self.required = [normalize_skill(skill) for skill in required_skills]
+        self.preferred = [normalize_skill(skill) for skill in preferred_skills]
+
+        # Unique job-side skills; required and preferred share one index
+        self.skills: List[str] = list(dict.fromkeys(self.required + self.preferred))
+        self._lengths = [len(skill) for skill in self.skills]
+        self._char_counts = [Counter(skill) for skill in self.skills]
+        self._skill_trigrams = [_trigrams(skill) for skill in self.skills]
+        self._short_skills = [i for i, skill in enumerate(self.skills) if len(skill) < 3]
+        self._trigram_index: Dict[str, Set[int]] = {}
+        for i, grams in enumerate(self._skill_trigrams):
+            for gram in grams:
+                self._trigram_index.setdefault(gram, set()).add(i)
+
+    def match(self, resume_skills: Sequence[str]) -> Tuple[List[bool], List[bool]]:
+        """Return per-position matched flags for the required and preferred lists."""
+        matched = self._matched_skill_indices(resume_skills)
+        position = {skill: i for i, skill in enumerate(self.skills)}
+        required_flags = [position[skill] in matched for skill in self.required]
+        preferred_flags = [position[skill] in matched for skill in self.preferred]
+        return required_flags, preferred_flags
+
+    def _matched_skill_indices(self, resume_skills: Sequence[str]) -> Set[int]:
+        matched: Set[int] = set()
+        total = len(self.skills)
+        for resume_skill in dict.fromkeys(normalize_skill(skill) for skill in resume_skills):
+            if len(matched) == total:
+                break
+            if not resume_skill:
+                # "" is contained in every job skill
+                return set(range(total))
+            matched |= self._containment_matches(resume_skill)
+            self._fuzzy_matches(resume_skill, matched)
+        return matched
+
+    def _containment_matches(self, resume_skill: str) -> Set[int]:
+        """Job skills that contain, or are contained in, the resume skill."""
+        found: Set[int] = set()
+        resume_grams = _trigrams(resume_skill)
+
+        # resume skill inside job skill: every trigram of the resume skill must be indexed
+        if resume_grams:
+            postings = sorted((self._trigram_index.get(gram, set()) for gram in resume_grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings[0] else set()
+            found.update(i for i in candidates if resume_skill in self.skills[i])
+        else:
+            found.update(i for i, skill in enumerate(self.skills) if resume_skill in skill)
+
+        # job skill inside resume skill: all of the job skill's trigrams occur in the resume skill
+        hits: Dict[int, int] = {}
+        for gram in resume_grams:
+            for i in self._trigram_index.get(gram, ()):
+                hits[i] = hits.get(i, 0) + 1
+        for i, count in hits.items():
+            if count == len(self._skill_trigrams[i]) and self.skills[i] in resume_skill:
+                found.add(i)
+        found.update(i for i in self._short_skills if self.skills[i] in resume_skill)
+        return found
+
+    def _fuzzy_matches(self, resume_skill: str, matched: Set[int]) -> None:
+        """Add job skills whose SequenceMatcher ratio reaches the threshold."""
+        resume_length = len(resume_skill)
+        resume_counts = None
+        for i, skill in enumerate(self.skills):
+            if i in matched:
+                continue
+            length_sum = self._lengths[i] + resume_length
+            # Upper bounds on ratio(): length only, then shared characters (as quick_ratio)
+            if 2.0 * min(self._lengths[i], resume_length) / length_sum < self.threshold:
+                continue
+            if resume_counts is None:
+                resume_counts = Counter(resume_skill)
+            shared = sum((self._char_counts[i] & resume_counts).values())
+            if 2.0 * shared / length_sum < self.threshold:
+                continue
+            if skill_similarity(skill, resume_skill) >= self.threshold:
+                matched.add(i)
+
+
+@lru_cache(maxsize=256)
+def get_skill_matcher(required_skills: Tuple[str, ...], preferred_skills: Tuple[str, ...],
+                      threshold: float = 0.7) -> CompiledSkillMatcher:
+    """Compiled matcher for a job's skill lists, built once per distinct requirement."""
+    return CompiledSkillMatcher(required_skills, preferred_skills, threshold)
@@ -9,14 +9,23 @@ This engine helps students:
 - Understand rejection reasons
 """
 
-from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
-from transformers import pipeline
 import numpy as np
 import re
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 import json
 
+from model_registry import ModelLease, lease_sentence_transformer, register_text_generator
+from vector.job_index import (
+    extract_query_skills,
+    get_job_index,
+    job_search_text,
+    job_to_search_dict,
+    refresh_job_index,
+    top_k_indices,
+)
+
 
 class StudentJobMatchingEngine:
     """
@@ -32,7 +41,11 @@ class StudentJobMatchingEngine:
             model_name: Sentence transformer model for embeddings
         """
         print("Loading AI Job Matching Engine...")
-        self.model = SentenceTransformer(model_name)
+        # Shared with vector/embedder.py through the process-wide model registry; leased per search
+        self.model_name = model_name
+        lease_sentence_transformer(model_name).release()
+        # Job embeddings kept across searches, updated incrementally (see vector/job_index.py)
+        self.job_index = get_job_index(model_name)
         print("✓ Matching Engine Ready!")
     
     def search_jobs(self, 
@@ -79,28 +92,56 @@ class StudentJobMatchingEngine:
         if not jobs:
             return []
         
-        # Encode student query for semantic search
-        query_embedding = self.model.encode(student_query, normalize_embeddings=True)
-        
-        # Prepare job texts for encoding
-        job_texts = []
-        for job in jobs:
-            job_text = f"{job.get('title', '')} {job.get('description', '')} {job.get('requirements', '')}"
-            job_texts.append(job_text)
-        
-        # Encode all jobs
-        job_embeddings = self.model.encode(job_texts, normalize_embeddings=True)
-        
-        # Calculate semantic similarity
-        similarities = cosine_similarity([query_embedding], job_embeddings)[0]
+        with lease_sentence_transformer(self.model_name) as model:
+            # Encode student query for semantic search
+            query_embedding = model.encode(student_query, normalize_embeddings=True)
+            
+            if all(job.get('id') is not None for job in jobs):
+                # Persistent index: only new/changed jobs are encoded, the rest is one matrix-vector product
+                similarities = self.job_index.score_jobs(
+                    np.asarray(query_embedding, dtype=np.float32), jobs
+                )
+            else:
+                # Ad-hoc jobs without ids cannot be cached; encode them directly
+                job_texts = [job_search_text(job) for job in jobs]
+                job_embeddings = model.encode(job_texts, normalize_embeddings=True)
+                similarities = cosine_similarity([query_embedding], job_embeddings)[0]
         
         # Get top matches
-        top_indices = np.argsort(similarities)[::-1][:top_k]
-        
+        top_indices = top_k_indices(similarities, top_k)
+        return self.match_results([(jobs[idx], float(similarities[idx])) for idx in top_indices],
+                                  student_skills)
+
+    def rank_indexed_jobs(self, student_query: str, top_k: int = 10,
+                          **filters) -> List[Tuple[Any, float]]:
+        """
+        (job id, cosine similarity) of the best `top_k` jobs in the persistent job index,
+        keeping only jobs that mention a skill named in the query (as `search_jobs` does).
+        The index must be current (see vector.job_index.refresh_job_index).
+
+        Args:
+            filters: location, company and posted_within_days, as in JobEmbeddingIndex.search
+        """
+        query_skills = self._extract_skills_from_query(student_query)
+        query_embedding = self.job_index.encode_query(student_query)
+        hits = self.job_index.search(query_embedding, top_k, query_skills=query_skills, **filters)
+        return [(hit["job_id"], hit["score"]) for hit in hits]
+
+    def match_results(self,
+                      scored_jobs: List[Tuple[Dict[str, Any], float]],
+                      student_skills: List[str]) -> List[Dict[str, Any]]:
+        """
+        Build search results for jobs already ranked by semantic similarity (this engine's
+        own ranking, or Qdrant's filtered search): match score, application status and
+        missing skills, in the given order.
+
+        Args:
+            scored_jobs: (job dictionary, cosine similarity) pairs, best first
+            student_skills: List of student's skills
+        """
         results = []
-        for idx in top_indices:
-            job = jobs[idx]
-            match_score = float(similarities[idx]) * 100
+        for idx, (job, similarity) in enumerate(scored_jobs):
+            match_score = similarity * 100
             
             # Extract required skills from job requirements
             required_skills = self._extract_skills(job.get('requirements', ''))
@@ -134,33 +175,8 @@ class StudentJobMatchingEngine:
         Extract specific skills/technologies mentioned in the user's query.
         This helps filter jobs to only show those that actually require the mentioned skills.
         """
-        if not query:
-            return []
-        
-        # Common tech skills to look for in queries
-        skill_keywords = [
-            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust',
-            'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'Spring Boot',
-            'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis',
-            'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP',
-            'REST API', 'GraphQL', 'Microservices',
-            'TensorFlow', 'PyTorch', 'Machine Learning', 'Deep Learning',
-            'Git', 'CI/CD', 'Linux', 'DevOps',
-            'Pandas', 'NumPy', 'Data Analysis', 'Excel',
-            'Backend', 'Frontend', 'Full Stack', 'Full-Stack'
-        ]
-        
-        found_skills = []
-        query_lower = query.lower()
-        
-        # Check for each skill keyword
-        for skill in skill_keywords:
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, query_lower):
-                found_skills.append(skill)
-        
-        return found_skills
+        # Shared with the Qdrant job payloads, so filtering there keeps the same matches
+        return extract_query_skills(query)
     
     def _extract_skills(self, requirements_text: str) -> List[str]:
         """
@@ -391,16 +407,8 @@ class ResumeFeedbackEngine:
         """Initialize resume feedback engine."""
         print("Loading Resume Feedback Engine...")
         # Use a lightweight text generation model for MVP
-        try:
-            self.generator = pipeline(
-                "text-generation",
-                model="gpt2",  # Lightweight for MVP
-                max_length=200,
-                device=-1  # CPU
-            )
-        except Exception as e:
-            print(f"Note: Using fallback feedback generation (model loading issue: {e})")
-            self.generator = None
+        # Lightweight model for MVP, leased from the model registry (lease_text_generator) while generating
+        self.generator_key = register_text_generator("gpt2")
         print("✓ Resume Feedback Engine Ready!")
     
     def generate_feedback(self,
@@ -796,6 +804,13 @@ class CampusConnectStudentEngine:
         print("\n✅ All engines loaded successfully!")
         print("="*50 + "\n")
     
+    def lease_models(self) -> ModelLease:
+        """
+        Hold the engine's sentence encoder for a multi-step operation (e.g. one chat message),
+        so it cannot be unloaded between steps. Use as `with engine.lease_models(): ...`.
+        """
+        return lease_sentence_transformer(self.job_matcher.model_name)
+    
     def search_jobs(self, 
                     student_query: str,
                     jobs: List[Dict[str, Any]],
@@ -820,6 +835,42 @@ class CampusConnectStudentEngine:
             List of job matches with application_status, missing_skills, and messages
         """
         return self.job_matcher.search_jobs(student_query, jobs, student_skills, top_k)
+
+    def search_jobs_in_db(self,
+                          db,
+                          student_query: str,
+                          student_skills: List[str],
+                          top_k: int = 10,
+                          location: Optional[str] = None,
+                          company: Optional[str] = None,
+                          posted_within_days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search the jobs table through the persistent job index: the index is refreshed with
+        jobs saved since the last search, ranked (and filtered by location, company and
+        recency, as the Qdrant search does) without touching the other rows, and only the
+        top_k jobs are loaded from the database.
+        """
+        from database.models import Job
+
+        refresh_job_index(self.job_matcher.job_index, db)
+        hits = self.job_matcher.rank_indexed_jobs(
+            student_query, top_k, location=location, company=company, posted_within_days=posted_within_days
+        )
+        if not hits:
+            return []
+        jobs_by_id = {
+            job.id: job for job in db.query(Job).filter(Job.id.in_([job_id for job_id, _ in hits])).all()
+        }
+        return self.match_results(
+            [(job_to_search_dict(jobs_by_id[job_id]), score) for job_id, score in hits if job_id in jobs_by_id],
+            student_skills,
+        )
+
+    def match_results(self,
+                      scored_jobs: List[Tuple[Dict[str, Any], float]],
+                      student_skills: List[str]) -> List[Dict[str, Any]]:
+        """Results (status, missing skills, message) for jobs ranked elsewhere, e.g. by Qdrant."""
+        return self.job_matcher.match_results(scored_jobs, student_skills)
     
     def analyze_skill_gap(self,
                           student_skills: List[str],
@@ -860,3 +911,17 @@ class CampusConnectStudentEngine:
         return self.rejection_interpreter.interpret_rejection(
             rejection_feedback, job_title, student_skills
         )
+
+
+_student_engine: Optional[CampusConnectStudentEngine] = None
+_student_engine_lock = threading.Lock()
+
+
+def get_student_engine() -> CampusConnectStudentEngine:
+    """Process-wide student engine shared by routers and chat orchestrators."""
+    global _student_engine
+    if _student_engine is None:
+        with _student_engine_lock:
+            if _student_engine is None:
+                _student_engine = CampusConnectStudentEngine()
+    return _student_engine
@@ -0,0 +1,140 @@
+"""
+Tests for ATS batch scoring: per-item errors, result writes and worker pool recovery
+Run with: python test_ats_batch.py
+"""
+
+import asyncio
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from database.schemas import ATSScoreRequest
+from routers import ats
+
+
+JOB = {"job_title": "Backend Developer", "required_skills": ["Python", "SQL"], "keywords": ["api"]}
+RESUME_TEXT = "Asha Verma\nasha@example.com\n+91 98765 43210\nSkills: Python, SQL, Django\nBuilt api services"
+USER = SimpleNamespace(id=7)
+
+
+class Cursor(list):
+    def sort(self, key, direction):
+        return self
+
+
+class FakeResumes:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        wanted = set(query["$or"][0]["resume_id"]["$in"])
+        return Cursor(doc for doc in self.docs if doc["resume_id"] in wanted)
+
+
+class FakeResults:
+    """ats_results collection failing like MongoDB: some documents, or the whole write"""
+
+    def __init__(self, fail_positions=(), down=False):
+        self.docs, self.fail_positions, self.down = [], set(fail_positions), down
+
+    def insert_many(self, docs, ordered=True):
+        if self.down:
+            raise AutoReconnect("connection refused")
+        errors = []
+        for position, doc in enumerate(docs):
+            if position in self.fail_positions:
+                errors.append({"index": position, "code": 11000, "errmsg": "duplicate key"})
+            else:
+                self.docs.append(doc)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(docs) - len(errors)})
+
+
+class DyingPool:
+    """Pool whose worker dies under the first item; afterwards it is broken for new submits"""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        if self.submitted > 1:
+            raise BrokenProcessPool("A process in the process pool was terminated abruptly")
+        future = Future()
+        future.set_exception(BrokenProcessPool("A process in the process pool was terminated abruptly"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def run_batch(requests, results_collection, pool=None, stream=False):
+    parsed = {"name": "Ravi", "email": "ravi@example.com", "skills": ["Python"], "raw_text": "Ravi\nSkills: Python"}
+    stored = {"_id": "5f0c", "resume_id": "r1", "parsed_data": parsed}
+    mongo = SimpleNamespace(resumes=FakeResumes([stored]), ats_results=results_collection)
+    executor = ThreadPoolExecutor(max_workers=2)
+    replaced = []
+    original = ats.get_mongo_db, ats.get_process_pool, ats.replace_broken_pool
+    ats.get_mongo_db = lambda: mongo
+    ats.get_process_pool = lambda name: pool or executor
+    ats.replace_broken_pool = lambda name, broken: replaced.append(broken) or executor
+
+    async def call():
+        response = await ats.batch_score([ATSScoreRequest(job_requirement=JOB, **r) for r in requests],
+                                         stream=stream, current_user=USER, db=None)
+        if not stream:
+            return response
+        return [json.loads(line) async for line in response.body_iterator]
+
+    try:
+        return asyncio.run(call()), replaced
+    finally:
+        ats.get_mongo_db, ats.get_process_pool, ats.replace_broken_pool = original
+        executor.shutdown()
+
+
+def test_mixed_batch():
+    print("Testing a batch with failing items and a partly failed write...")
+    requests = [{"resume_text": RESUME_TEXT}, {}, {"resume_id": "missing"}, {"resume_id": "r1"}]
+    collection = FakeResults(fail_positions=[1])
+    response, _ = run_batch(requests, collection)
+    results = response["results"]
+    assert results[1] == {"error": "Either resume_id or resume_text must be provided"}
+    assert results[2] == {"error": "Resume not found"}
+    assert results[0]["ats_score"] > results[3]["ats_score"] > 0
+    # The second written document hit a write error; the other one was stored
+    assert len(collection.docs) == 1 and response["save_errors"] == 1
+    unsaved = [i for i, result in enumerate(results) if "save_error" in result]
+    assert len(unsaved) == 1 and "duplicate key" in results[unsaved[0]]["save_error"]
+    print("[OK] Bad items reported, scores returned, the unsaved result flagged")
+
+
+def test_failed_flush_is_reported_in_stream():
+    print("Testing a result write that fails entirely...")
+    lines, _ = run_batch([{"resume_text": RESUME_TEXT}, {"resume_id": "r1"}], FakeResults(down=True), stream=True)
+    items, summary = lines[:-1], lines[-1]
+    assert sorted(line["index"] for line in items) == [0, 1] and all("ats_score" in line for line in items)
+    assert summary["done"] and summary["errors"] == 0
+    assert [error["index"] for error in summary["save_errors"]] == [0, 1]
+    assert "connection refused" in summary["save_errors"][0]["error"]
+    print("[OK] Scores streamed, the failed write listed in the summary")
+
+
+def test_broken_pool_is_replaced():
+    print("Testing recovery from a dead worker...")
+    pool, collection = DyingPool(), FakeResults()
+    response, replaced = run_batch([{"resume_text": RESUME_TEXT}] * 3, collection, pool=pool)
+    assert replaced and all(result is pool for result in replaced)
+    assert all("ats_score" in result for result in response["results"])  # the lost item was retried
+    assert len(collection.docs) == 3
+    print("[OK] Broken pool replaced and the lost item scored on the new one")
+
+
+if __name__ == "__main__":
+    test_mixed_batch()
+    test_failed_flush_is_reported_in_stream()
+    test_broken_pool_is_replaced()
+    print("\nAll ATS batch tests passed!")
@@ -0,0 +1,49 @@
+"""
+Tests for ATS result memoization
+Run with: python test_ats_memo.py
+"""
+
+from ats_engine import ATSEngine
+from ats_memo import ATSResultMemo
+from models import JobRequirement, ResumeData
+
+
+RESUME = ResumeData(
+    name="Alex", email="alex@example.com", skills=["Python", "Django", "SQL"],
+    raw_text="Backend developer, 4 years of experience with python, django and sql. Education: B.Tech"
+)
+JOB = JobRequirement(job_title="Backend Developer", required_skills=["Python", "Go"], keywords=["django"])
+
+
+def test_memo_hits_and_misses():
+    print("Testing memo hits and misses...")
+    memo = ATSResultMemo(max_entries=8)
+    engine = ATSEngine(memo=memo)
+
+    first = engine.score_resume(RESUME, JOB)
+    first["matched_skills"].append("Mutated")  # must not leak into the cache
+    second = engine.score_resume(RESUME.model_copy(), JOB)
+    assert second == ATSEngine(use_memo=False).score_resume(RESUME, JOB)
+    assert memo.stats()["memory_hits"] == 1 and memo.stats()["misses"] == 1
+
+    # A different job or a different resume is a different key
+    engine.score_resume(RESUME, JOB.model_copy(update={"years_of_experience": 6}))
+    engine.score_resume(RESUME.model_copy(update={"skills": ["Go"], "features": None}), JOB)
+    assert memo.stats()["misses"] == 3
+    print(f"[OK] {memo.stats()}")
+
+
+def test_lru_bound():
+    print("Testing LRU bound...")
+    memo = ATSResultMemo(max_entries=2)
+    for i in range(5):
+        memo.put(str(i), {"ats_score": float(i)})
+    assert memo.stats()["entries"] == 2
+    assert memo.get("0") is None and memo.get("4") == {"ats_score": 4.0}
+    print("[OK] Oldest entries are evicted")
+
+
+if __name__ == "__main__":
+    test_memo_hits_and_misses()
+    test_lru_bound()
+    print("\nAll ATS memo tests passed!")
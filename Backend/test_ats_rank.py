@@ -0,0 +1,139 @@
+"""
+Tests for top-K applicant ranking with pruning
+Run with: python test_ats_rank.py
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from ats_engine import ATSEngine
+from database.models import Application, Base, Candidate, Job, User, UserRole
+from models import JobRequirement, ResumeData
+from routers import ats
+
+
+JOB = JobRequirement(
+    job_title="Backend Developer", required_skills=["Python", "Django", "SQL"], preferred_skills=["Docker"],
+    keywords=["api", "postgres"], years_of_experience=2, education_level="Bachelor"
+)
+PROFILES = [
+    (["Python", "Django", "SQL", "Docker"], "4 years of experience building api services on postgres. B.Tech"),
+    (["Python"], "1 year of experience with scripts. Bachelor of Science"),
+    (["Java", "Spring"], "3 years of experience with enterprise java"),
+    (["Python", "SQL"], "2 years of experience, api work. Master of Computer Applications"),
+    ([], "Fresh graduate"),
+    (["Python", "Django"], "5 years of experience with django api and postgres. B.E."),
+    (["Excel"], "Sales associate"),
+]
+
+
+def make_resumes():
+    resumes = []
+    for i, (skills, text) in enumerate(PROFILES * 2):  # every profile twice: exact score ties
+        resumes.append((i, ResumeData(name=f"Applicant {i}", email=f"a{i}@example.com", skills=skills,
+                                      raw_text=f"Applicant {i}\na{i}@example.com\nSkills: {', '.join(skills)}\n{text}")))
+    return resumes
+
+
+def full_sort(engine, resumes, top_k):
+    """Score every resume, best first, earlier resume first on a tie"""
+    scored = [(engine.score_resume(resume, JOB)["ats_score"], -i, key) for i, (key, resume) in enumerate(resumes)]
+    return [(key, score) for score, _, key in sorted(scored, reverse=True)[:top_k]]
+
+
+def test_pruned_top_k_matches_full_sort():
+    print("Testing pruned top-K against a full sort...")
+    engine = ATSEngine(use_memo=False)
+    resumes = make_resumes()
+    for top_k in (1, 2, 3, 5, len(resumes), len(resumes) + 5):
+        *_, final = engine.rank_resumes(resumes, JOB, top_k=top_k)
+        actual = [(item["key"], item["ats_score"]) for item in final["ranking"]]
+        assert actual == full_sort(engine, resumes, top_k), top_k
+        assert final["processed"] == len(resumes) == final["scored"] + final["pruned"]
+    *_, final = engine.rank_resumes(resumes, JOB, top_k=1)
+    assert final["pruned"] > 0
+    print(f"[OK] Identical rankings for K = 1..{len(resumes) + 5}, {final['pruned']} pruned at K = 1")
+
+
+class FailingEngine(ATSEngine):
+    """Raises while extracting the features of the resume named Broken"""
+
+    def _get_features(self, resume_data):
+        if resume_data.name == "Broken":
+            raise ValueError("unreadable resume")
+        return super()._get_features(resume_data)
+
+
+def test_failing_resume_is_skipped():
+    print("Testing a resume that fails to score...")
+    engine = FailingEngine(use_memo=False)
+    resumes = make_resumes()[:4]
+    broken = ResumeData(name="Broken", email="b@example.com", raw_text="Broken")
+    snapshots = list(engine.rank_resumes(resumes[:2] + [("broken", broken)] + resumes[2:], JOB, top_k=10,
+                                         progress_every=2))
+    final = snapshots[-1]
+    assert final["done"] and final["failed"] == 1 and final["errors"][0]["key"] == "broken"
+    assert [item["key"] for item in final["ranking"]] == [key for key, _ in full_sort(engine, resumes, 10)]
+    assert [snapshot["processed"] for snapshot in snapshots] == [2, 4, 5]
+    print(f"[OK] Ranking completed without the failing resume ({final['errors'][0]['error']})")
+
+
+class Cursor(list):
+    def sort(self, key, direction):
+        return self
+
+
+class RecordingResumes:
+    """resumes collection recording the thread each query runs on"""
+
+    def __init__(self, docs):
+        self.docs, self.threads = docs, []
+
+    def find(self, query, projection=None):
+        self.threads.append(threading.current_thread())
+        wanted = set(query["$or"][0]["resume_id"]["$in"])
+        return Cursor(doc for doc in self.docs if doc["resume_id"] in wanted)
+
+
+def make_applicants(count):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(Job(id=1, title="Backend Developer", company="Acme", description="APIs", created_by=1,
+               requirements_json=JOB.model_dump()))
+    docs = []
+    for i, (key, resume) in enumerate(make_resumes()[:count], start=1):
+        db.add(User(id=i, email=resume.email, password_hash="x", role=UserRole.STUDENT))
+        db.add(Candidate(id=i, user_id=i, name=resume.name, email=resume.email, resume_id=f"r{i}"))
+        db.add(Application(id=i, job_id=1, candidate_id=i))
+        docs.append({"_id": f"id{i}", "resume_id": f"r{i}", "user_id": i, "parsed_data": resume.model_dump()})
+    db.commit()
+    return db, RecordingResumes(docs)
+
+
+def test_rank_applicants_loads_off_the_event_loop():
+    print("Testing the rank applicants endpoint...")
+    db, resumes = make_applicants(5)
+    original = ats.get_mongo_db
+    ats.get_mongo_db = lambda: SimpleNamespace(resumes=resumes)
+    recruiter = SimpleNamespace(id=1, role=SimpleNamespace(value="recruiter"))
+    try:
+        response = asyncio.run(ats.rank_applicants(1, top_k=3, stream=False, progress_every=200,
+                                                   current_user=recruiter, db=db))
+    finally:
+        ats.get_mongo_db = original
+    assert response["total_applications"] == 5 and response["done"] and len(response["ranking"]) == 3
+    assert resumes.threads and threading.main_thread() not in resumes.threads
+    print("[OK] Applicants and resumes loaded in the threadpool, top 3 returned")
+
+
+if __name__ == "__main__":
+    test_pruned_top_k_matches_full_sort()
+    test_failing_resume_is_skipped()
+    test_rank_applicants_loads_off_the_event_loop()
+    print("\nAll ATS ranking tests passed!")
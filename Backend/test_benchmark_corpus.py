@@ -0,0 +1,37 @@
+"""
+Tests for the synthetic benchmark corpus
+Run with: python test_benchmark_corpus.py
+"""
+
+from benchmarks.corpus import generate_corpus
+from models import JobRequirement
+from resume_parser import ResumeParser
+
+
+def test_corpus_is_deterministic():
+    print("Testing corpus determinism...")
+    corpus = generate_corpus(resumes=50, jobs=5, queries=5, seed=7)
+    assert corpus == generate_corpus(resumes=50, jobs=5, queries=5, seed=7)
+    assert corpus != generate_corpus(resumes=50, jobs=5, queries=5, seed=8)
+
+    # Collections are independent: more jobs does not reshuffle the resumes
+    assert generate_corpus(resumes=50, jobs=9, queries=5, seed=7)["resumes"] == corpus["resumes"]
+    assert generate_corpus(resumes=80, jobs=5, queries=5, seed=7)["resumes"][:50] == corpus["resumes"]
+    print("[OK] Same arguments, same corpus")
+
+
+def test_corpus_is_realistic_input():
+    print("Testing corpus shape...")
+    corpus = generate_corpus(resumes=20, jobs=5, queries=5)
+    for job in corpus["jobs"]:
+        JobRequirement(**job["requirements"])
+    parsed = ResumeParser().parse(resume_text=corpus["resumes"][0])
+    assert parsed["name"] and parsed["email"] and parsed["skills"]
+    assert parsed["education"] and parsed["experience"]
+    print(f"[OK] Parsed {parsed['name']} with {len(parsed['skills'])} skills")
+
+
+if __name__ == "__main__":
+    test_corpus_is_deterministic()
+    test_corpus_is_realistic_input()
+    print("\nAll benchmark corpus tests passed!")
@@ -0,0 +1,114 @@
+"""
+Tests for the candidate resume passages in Qdrant and the similar-candidates search
+Run with: python test_candidate_index.py
+"""
+
+from qdrant_client import QdrantClient
+
+from config import QDRANT_COLLECTION_CANDIDATES
+from database.models import Job
+from test_vector_reindex import make_session
+from vector import qdrant_client
+from vector.candidate_index import passage_point_id, resume_passages, similar_candidates, sync_candidate_points
+from vector.qdrant_client import ensure_collections
+
+
+TOPICS = ("python", "design", "sales")
+
+
+class TopicEmbedder:
+    """Vector = occurrences of each topic word, so similarity follows the shared topics"""
+
+    model_id = "fake-model:torch"
+    dimension = len(TOPICS)
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_batch(self, texts):
+        self.batches.append(len(texts))
+        return [[text.lower().count(topic) + 0.01 for topic in TOPICS] for text in texts]
+
+
+def in_memory_qdrant():
+    client = QdrantClient(":memory:")
+    qdrant_client._qdrant_client = client
+    ensure_collections(TopicEmbedder.dimension)
+    return client
+
+
+def candidate_points(client, candidate_id):
+    points, _ = client.scroll(QDRANT_COLLECTION_CANDIDATES, limit=1000, with_payload=True)
+    return sorted((point.payload for point in points if point.payload["candidate_id"] == candidate_id),
+                  key=lambda payload: payload["passage_index"])
+
+
+def resume(candidate_id, text, resume_id="r1"):
+    return {"candidate_id": candidate_id, "user_id": candidate_id + 100, "resume_id": resume_id, "text": text}
+
+
+def test_resume_passages():
+    print("Testing resume passage chunking...")
+    text = "Jane Doe\njane@example.com\n\nSkills: Python, SQL\n\nExperience\n" + " ".join(
+        f"w{i}" for i in range(25))
+    passages = resume_passages(text, max_words=10, overlap=2)
+    assert [label for label, _ in passages] == ["contact", "skills", "experience", "experience", "experience"]
+    assert passages[1][1] == "Python, SQL"
+    assert passages[2][1].split()[-2:] == passages[3][1].split()[:2]  # windows overlap
+    assert passages[-1][1].split()[-1] == "w24"
+    assert resume_passages("   ") == []
+    assert passage_point_id(1, 0) == passage_point_id(1, 0) != passage_point_id(1, 1)
+    print(f"[OK] {len(passages)} passages, long sections split into overlapping windows")
+
+
+def test_sync_skips_unchanged_and_drops_stale_passages():
+    print("Testing candidate passage sync...")
+    client, embedder = in_memory_qdrant(), TopicEmbedder()
+    long_resume = "Skills: Python\n\nProjects\nDesign system\n\nExperience\nSales lead"
+    counts = sync_candidate_points([resume(1, long_resume), resume(2, "")], embedder)
+    assert counts == {"embedded": 1, "passages": 3, "patched": 0, "unchanged": 0, "empty": 1}
+    assert [p["section"] for p in candidate_points(client, 1)] == ["skills", "projects", "experience"]
+
+    # Same text under a new resume id: no model call, the payload follows
+    counts = sync_candidate_points([resume(1, long_resume, resume_id="r2")], embedder)
+    assert counts["patched"] == 1 and embedder.batches == [3]
+    assert {p["resume_id"] for p in candidate_points(client, 1)} == {"r2"}
+    assert sync_candidate_points([resume(1, long_resume, resume_id="r2")], embedder)["unchanged"] == 1
+
+    # A shorter resume replaces the old passages instead of leaving the tail behind
+    counts = sync_candidate_points([resume(1, "Skills: Python, Django")], embedder)
+    assert counts["embedded"] == 1 and counts["passages"] == 1
+    assert [p["passage"] for p in candidate_points(client, 1)] == ["Python, Django"]
+
+    # A latest resume without text removes the candidate from the collection
+    sync_candidate_points([resume(3, "Skills: Sales")], embedder)
+    assert sync_candidate_points([resume(1, "   ")], embedder)["empty"] == 1
+    assert candidate_points(client, 1) == [] and len(candidate_points(client, 3)) == 1
+    print("[OK] Re-uploads are skipped, renamed resumes patched, stale passages deleted")
+
+
+def test_similar_candidates_max_pools_passages():
+    print("Testing similar-candidates search...")
+    in_memory_qdrant()
+    embedder = TopicEmbedder()
+    db = make_session(jobs=1)
+    job = db.query(Job).first()  # "Engineer 1 ... Build APIs ... Python"
+    sync_candidate_points([
+        # One strong Python passage among unrelated ones
+        resume(1, "Skills: Python\n\nExperience\nSales sales sales\n\nProjects\nDesign"),
+        resume(2, "Skills: Python scripting, design, sales"),
+        resume(3, "Skills: Sales"),
+    ], embedder)
+
+    matches = similar_candidates(job, embedder, top_k=2)
+    assert [match["candidate_id"] for match in matches] == [1, 2]
+    assert matches[0]["section"] == "skills" and matches[0]["passage"] == "Python"
+    assert matches[0]["score"] > matches[1]["score"]
+    print(f"[OK] Candidate 1 ranks first on its best passage ({matches[0]['score']:.3f})")
+
+
+if __name__ == "__main__":
+    test_resume_passages()
+    test_sync_skips_unchanged_and_drops_stale_passages()
+    test_similar_candidates_max_pools_passages()
+    print("\nAll candidate index tests passed!")
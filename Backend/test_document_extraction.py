@@ -0,0 +1,301 @@
+"""
+Tests for budgeted, page-parallel document extraction
+Run with: python test_document_extraction.py
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+import zipfile
+
+from docx import Document
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+import document_extraction
+from document_extraction import (
+    DOCX_TIER, FAST_TIER, LAYOUT_TIER, DocumentExtractor, ExtractionTimeout, PdfPages,
+    extract_docx_text, fast_text_is_usable
+)
+from resume_parser import ResumeParser
+from upload_reader import MULTIPART_OVERHEAD, UploadSizeLimitMiddleware, open_upload
+
+
+def make_pdf(pages):
+    """Minimal valid PDF with one line of Helvetica text per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def write_pdf(pages):
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(make_pdf(pages))
+    return path
+
+
+def test_page_ranges_in_process_pool():
+    print("Testing page-parallel extraction in the process pool...")
+    path = write_pdf([f"Page number {i}" for i in range(7)])
+    try:
+        extractor = DocumentExtractor(pages_per_task=2, use_process_pool=True)
+        result = extractor.extract(path)
+        assert result.text.splitlines() == [f"Page number {i}" for i in range(7)]
+        assert result.pages_total == result.pages_extracted == 7 and not result.partial
+
+        # Identical to a sequential extraction
+        assert DocumentExtractor(use_process_pool=False).extract(path).text == result.text
+        stats = extractor.stats()
+        assert stats["documents"] == 1 and stats["pages"] == 7 and stats["in_flight"] == 0
+        print(f"[OK] 7 pages in {result.seconds:.3f}s, metrics {stats}")
+    finally:
+        os.remove(path)
+
+
+def test_page_and_time_budgets():
+    print("Testing page and time budgets...")
+    path = write_pdf([f"Page number {i}" for i in range(6)])
+    try:
+        result = DocumentExtractor(max_pages=4, use_process_pool=False).extract(path)
+        assert result.truncated and result.pages_extracted == 4 and result.pages_total == 6
+        assert result.text.splitlines()[-1] == "Page number 3"
+
+        extractor = DocumentExtractor(timeout_seconds=0, use_process_pool=False)
+        try:
+            extractor.extract(path)
+            assert False, "expected ExtractionTimeout"
+        except ExtractionTimeout:
+            pass
+        assert extractor.stats()["failed"] == 1
+        print("[OK] Pages past the budget are skipped; an expired budget with no text raises")
+    finally:
+        os.remove(path)
+
+
+class FlakyPdfPages(PdfPages):
+    """Counts how often the PDF is opened; pages 2-3 cannot be extracted"""
+
+    opened = 0
+
+    def __init__(self, source):
+        super().__init__(source)
+        FlakyPdfPages.opened += 1
+
+    def layout(self, start, stop):
+        if start <= 2 < stop:
+            raise ValueError("broken content stream")
+        return super().layout(start, stop)
+
+
+def test_failed_page_range_keeps_the_others():
+    print("Testing a page range that fails...")
+    data = make_pdf([f"Page number {i}" for i in range(6)])
+    document_extraction.PdfPages = FlakyPdfPages
+    try:
+        extractor = DocumentExtractor(pages_per_task=2, use_process_pool=False, fast_tier=False)
+        result = extractor.extract(data, "resume.pdf")
+        assert result.text.splitlines() == ["Page number 0", "Page number 1", "Page number 4", "Page number 5"]
+        assert result.partial and result.failed_pages == 2 and not result.timed_out
+        assert result.errors == ["pages 3-4: ValueError: broken content stream"]
+        assert FlakyPdfPages.opened == 1  # three ranges, one parse
+        stats = extractor.stats()
+        assert stats["documents"] == 1 and stats["failed_pages"] == 2 and stats["failed"] == 0
+
+        # Nothing extracted at all (the only range failed): the document fails
+        extractor.pages_per_task = 6
+        try:
+            extractor.extract(data, "resume.pdf")
+            raise AssertionError("expected ValueError")
+        except ValueError as e:
+            assert "broken content stream" in str(e)
+        assert extractor.stats()["failed"] == 1
+    finally:
+        document_extraction.PdfPages = PdfPages
+    print("[OK] Other ranges returned as a partial result, failure recorded in the metrics")
+
+
+def test_in_memory_sources():
+    print("Testing extraction from bytes, memoryview and spooled files...")
+    data = make_pdf(["John Smith", "Skills: Python, SQL"])
+    expected = "John Smith\nSkills: Python, SQL\n"
+    for use_process_pool in (False, True):
+        extractor = DocumentExtractor(use_process_pool=use_process_pool)
+        spooled = tempfile.SpooledTemporaryFile()
+        spooled.write(data)
+        for source in (data, memoryview(data), spooled):
+            assert extractor.extract(source, "resume.pdf").text == expected
+        assert not spooled.closed  # the caller's file object is left open
+
+    parsed = ResumeParser().parse(file_data=memoryview(data), filename="resume.PDF")
+    assert parsed["name"] == "John Smith" and "Python" in parsed["skills"]
+    print("[OK] Identical text without a file on disk")
+
+
+def test_fast_tier_and_fallback():
+    print("Testing fast text layer with pdfplumber fallback...")
+    line = "Backend developer with 4 years of Python, Django, PostgreSQL, Redis and Docker experience building APIs"
+    dense = make_pdf([f"{line}, {line.lower()} {i}" for i in range(3)])
+    sparse = make_pdf(["Page 1", "Page 2"])
+
+    result = DocumentExtractor(use_process_pool=False).extract(dense, "resume.pdf")
+    assert result.tier == FAST_TIER and result.text.splitlines()[0] == f"{line}, {line.lower()} 0"
+    layout = DocumentExtractor(use_process_pool=False, fast_tier=False).extract(dense, "resume.pdf")
+    assert layout.tier == LAYOUT_TIER and layout.text == result.text
+
+    extractor = DocumentExtractor(use_process_pool=False)
+    assert extractor.extract(sparse, "resume.pdf").tier == LAYOUT_TIER  # too few characters per page
+    assert extractor.stats()["tiers"] == {LAYOUT_TIER: 1}
+
+    # Quality thresholds are extractor settings and reach the pool workers
+    strict = DocumentExtractor(use_process_pool=True, fast_min_chars_per_page=10 ** 6)
+    assert strict.extract(dense, "resume.pdf").tier == LAYOUT_TIER
+    document_extraction.configure_document_extractor(use_process_pool=False, fast_max_garbage_ratio=0.0)
+    try:
+        configured = document_extraction.get_document_extractor()
+        assert not configured.use_process_pool and configured.fast_quality == (100, 0.0)
+    finally:
+        document_extraction._extractor_settings.clear()
+        document_extraction.configure_document_extractor()
+
+    assert fast_text_is_usable([line * 2])
+    assert not fast_text_is_usable(["(cid:71)(cid:82)(cid:70)" * 20])
+    assert not fast_text_is_usable(["\ufffd\ufffd skills \x01\x02" * 20])
+    print(f"[OK] Dense text served by {FAST_TIER}, sparse or garbled text by {LAYOUT_TIER}")
+
+
+def make_docx_xml(body, part="word/document.xml"):
+    """DOCX archive holding just the main document part with the given body XML"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(part, (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+            'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006">'
+            f"<w:body>{body}</w:body></w:document>"
+        ))
+    return buffer.getvalue()
+
+
+def test_docx_streaming():
+    print("Testing streaming DOCX extraction...")
+    document = Document()
+    document.add_paragraph("John Smith")
+    document.add_paragraph("Skills")
+    table = document.add_table(rows=2, cols=2)
+    for i, skill in enumerate(["Python", "SQL", "Docker", "React"]):
+        table.cell(i // 2, i % 2).text = skill
+    paragraph = document.add_paragraph("Experience:\t3 years")
+    paragraph.add_run().add_break()
+    paragraph.add_run("Backend Developer")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    data = buffer.getvalue()
+
+    text = extract_docx_text(data)
+    assert text.splitlines() == [
+        "John Smith", "Skills", "Python", "SQL", "Docker", "React",
+        "Experience:\t3 years", "Backend Developer",
+    ]
+    # Everything python-docx's paragraphs held, in the same order
+    python_docx = "\n".join(p.text for p in Document(io.BytesIO(data)).paragraphs)
+    assert [line for line in text.splitlines() if line in python_docx.splitlines()] == python_docx.splitlines()
+
+    result = DocumentExtractor(use_process_pool=True).extract(data, "resume.docx")
+    assert result.text == text and result.tier == DOCX_TIER
+    parsed = ResumeParser().parse(file_data=data, filename="resume.docx")
+    assert {"Python", "SQL", "Docker", "React"} <= set(parsed["skills"])
+
+    # Text boxes once (not their VML fallback copy); page breaks add no text
+    text_box = make_docx_xml(
+        '<w:p><w:r><w:t>Anchor </w:t></w:r><w:r><mc:AlternateContent><mc:Choice>'
+        '<w:txbxContent><w:p><w:r><w:t>Box</w:t></w:r></w:p></w:txbxContent></mc:Choice>'
+        '<mc:Fallback><w:txbxContent><w:p><w:r><w:t>Box</w:t></w:r></w:p></w:txbxContent>'
+        '</mc:Fallback></mc:AlternateContent></w:r><w:r><w:br w:type="page"/><w:t>text</w:t></w:r></w:p>'
+    )
+    assert extract_docx_text(text_box).splitlines() == ["Box", "Anchor text"]
+
+    for bad in (b"not a zip", make_docx_xml("", part="word/other.xml")):
+        try:
+            extract_docx_text(bad)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+    print("[OK] Paragraphs and table cells in document order, matching python-docx")
+
+
+def test_upload_size_limit():
+    print("Testing incremental upload size checks...")
+
+    async def check(size, declare_size):
+        spooled = tempfile.SpooledTemporaryFile()
+        spooled.write(b"x" * size)
+        spooled.seek(0)
+        upload = UploadFile(spooled, size=size if declare_size else None, filename="resume.pdf")
+        return await open_upload(upload, max_size=1000, chunk_size=64)
+
+    for declare_size in (True, False):
+        assert asyncio.run(check(1000, declare_size)).read() == b"x" * 1000
+        try:
+            asyncio.run(check(1001, declare_size))
+            assert False, "expected HTTP 413"
+        except HTTPException as e:
+            assert e.status_code == 413
+    print("[OK] Uploads over the limit are rejected with 413")
+
+
+def test_upload_limit_while_streaming():
+    print("Testing the upload limit while the body is received...")
+    app, calls = FastAPI(), []
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        calls.append(file.filename)
+        upload = await open_upload(file, max_size=1000)
+        return {"size": len(upload.read())}
+
+    app.add_middleware(UploadSizeLimitMiddleware, max_size=1000)
+    client = TestClient(app)
+    assert client.post("/upload", files={"file": ("a.pdf", b"x" * 1000)}).json() == {"size": 1000}
+
+    # Declared too large: rejected before the body is read
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * (1000 + MULTIPART_OVERHEAD))})
+    assert response.status_code == 413 and calls == ["a.pdf"]
+
+    # Chunked body without Content-Length: stopped once the running count passes the limit
+    body = b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.pdf\"\r\n\r\n"
+    chunks = iter([body] + [b"x" * 4096] * 40 + [b"\r\n--b--\r\n"])
+    response = client.post("/upload", content=chunks, headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413 and calls == ["a.pdf"]
+    print("[OK] Oversized bodies rejected with 413 before the endpoint runs")
+
+
+if __name__ == "__main__":
+    test_page_ranges_in_process_pool()
+    test_page_and_time_budgets()
+    test_failed_page_range_keeps_the_others()
+    test_in_memory_sources()
+    test_fast_tier_and_fallback()
+    test_docx_streaming()
+    test_upload_size_limit()
+    test_upload_limit_while_streaming()
+    print("\nAll document extraction tests passed!")
@@ -0,0 +1,98 @@
+"""
+Tests for the embedding micro-batcher
+Run with: python test_embedding_batcher.py
+"""
+
+import asyncio
+import threading
+import time
+
+from vector.batcher import EmbeddingBatcher
+
+
+class FakeEmbedder:
+    """Records every embed_batch call; the vector is just the text's length"""
+
+    dimension = 1
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.batches = []
+        self.delay = delay
+        self.fail_on = fail_on
+
+    def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        time.sleep(self.delay)
+        if self.fail_on in texts:
+            raise RuntimeError("encode failed")
+        return [[float(len(text))] for text in texts]
+
+
+def test_concurrent_callers_share_batches():
+    print("Testing concurrent requests coalescing into batches...")
+    embedder = FakeEmbedder(delay=0.01)
+    batcher = EmbeddingBatcher(embedder, max_batch_size=8, max_wait_ms=50)
+    texts = [f"query {'x' * i}" for i in range(20)]
+    results = {}
+
+    def client(text):
+        results[text] = batcher.embed_text(text)
+
+    threads = [threading.Thread(target=client, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert all(results[text] == [float(len(text))] for text in texts)
+    assert sum(len(batch) for batch in embedder.batches) == 20
+    assert max(len(batch) for batch in embedder.batches) <= 8
+    assert len(embedder.batches) < 20
+    stats = batcher.stats()
+    assert stats["texts"] == 20 and stats["batches"] == len(embedder.batches)
+    assert stats["largest_batch"] <= 8 and stats["texts_per_second"] > 0
+    print(f"[OK] 20 requests in {stats['batches']} encodes (mean batch {stats['mean_batch_size']})")
+
+
+def test_async_and_bulk_callers():
+    print("Testing async callers and embed_batch...")
+    embedder = FakeEmbedder()
+    batcher = EmbeddingBatcher(embedder, max_batch_size=4, max_wait_ms=20)
+
+    async def search(texts):
+        return await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+    vectors = asyncio.run(search(["a", "bb", "ccc"]))
+    assert vectors == [[1.0], [2.0], [3.0]]
+    assert embedder.batches == [["a", "bb", "ccc"]]
+
+    # A bulk call is split at max_batch_size and keeps its order
+    assert batcher.embed_batch(["x" * i for i in range(1, 11)]) == [[float(i)] for i in range(1, 11)]
+    assert [len(batch) for batch in embedder.batches[1:]] == [4, 4, 2]
+    batcher.close()
+    print("[OK] Async requests share one encode; bulk calls are chunked in order")
+
+
+def test_unbatched_and_errors():
+    print("Testing max_batch_size=1 and encode failures...")
+    embedder = FakeEmbedder(fail_on="bad")
+    batcher = EmbeddingBatcher(embedder, max_batch_size=1, max_wait_ms=50)
+    assert batcher.embed_batch(["a", "b"]) == [[1.0], [1.0]]
+    assert embedder.batches == [["a"], ["b"]]
+    try:
+        batcher.embed_text("bad")
+        raise AssertionError("expected the encode error")
+    except RuntimeError as e:
+        assert str(e) == "encode failed"
+    assert batcher.embed_text("ok") == [2.0]  # the encoder thread survives a failed batch
+    assert batcher.stats()["errors"] == 1
+    batcher.close()
+    print("[OK] Batching can be turned off; errors reach only the callers of the failed batch")
+
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_batches()
+    test_async_and_bulk_callers()
+    test_unbatched_and_errors()
+    print("\nAll embedding batcher tests passed!")
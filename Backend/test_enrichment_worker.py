@@ -0,0 +1,182 @@
+"""
+Tests for the background LLM resume-enrichment worker
+Run with: python test_enrichment_worker.py
+"""
+
+import time
+
+import httpx
+from groq import RateLimitError
+
+from llm.enrichment_worker import (
+    ENRICH_DONE,
+    ENRICH_PENDING,
+    EnrichmentWorker,
+    RequestPacer,
+    rate_limit_delay,
+)
+
+
+def _get(doc, path):
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return None, False
+        doc = doc[part]
+    return doc, True
+
+
+def _matches(doc, query):
+    for path, condition in query.items():
+        value, present = _get(doc, path)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+        elif "$in" in condition and value not in condition["$in"]:
+            return False
+        elif "$exists" in condition and present != condition["$exists"]:
+            return False
+        elif "$lt" in condition and not (present and value < condition["$lt"]):
+            return False
+    return True
+
+
+def _apply(doc, update):
+    for path, value in update.get("$set", {}).items():
+        target = doc
+        *parents, leaf = path.split(".")
+        for part in parents:
+            target = target.setdefault(part, {})
+        target[leaf] = value
+    for path in update.get("$unset", {}):
+        doc.pop(path, None)
+
+
+class FakeCursor(list):
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self, key=lambda doc: doc[key], reverse=direction < 0))
+
+    def limit(self, n):
+        return FakeCursor(self[:n])
+
+
+class FakeCollection:
+    """The pymongo Collection calls the enrichment worker makes"""
+
+    def __init__(self, docs=()):
+        self.docs = [dict(doc) for doc in docs]
+
+    def find(self, query, projection=None):
+        return FakeCursor(doc for doc in self.docs if _matches(doc, query))
+
+    def update_many(self, query, update):
+        for doc in self.find(query):
+            _apply(doc, update)
+
+    def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            for doc in self.find(op._filter)[:1]:
+                _apply(doc, op._doc)
+
+    def aggregate(self, pipeline):
+        counts = {}
+        for doc in self.find(pipeline[0]["$match"]):
+            counts[doc["enrichment_status"]] = counts.get(doc["enrichment_status"], 0) + 1
+        return [{"_id": status, "count": count} for status, count in counts.items()]
+
+
+class FakeMongo:
+    def __init__(self, resumes, blobs):
+        self.resumes = FakeCollection(resumes)
+        self.resume_blobs = FakeCollection(blobs)
+
+
+def queued(n, text, content_sha256=None):
+    doc = {"_id": n, "resume_id": f"r{n}", "user_id": n, "parsed_data": {"raw_text": text},
+           "enrichment_status": ENRICH_PENDING, "enrichment_attempts": 0}
+    if content_sha256:
+        doc["content_sha256"] = content_sha256
+    return doc
+
+
+def rate_limited(retry_after="7"):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_rate_limit_delay():
+    print("Testing 429 detection...")
+    assert rate_limit_delay(rate_limited("7")) == 7.0
+    assert rate_limit_delay(ValueError("bad json")) is None
+    print("[OK] 429s back off for retry-after; other errors are not rate limits")
+
+
+def test_request_pacer():
+    print("Testing request pacing...")
+    pacer = RequestPacer(requests_per_minute=1200)  # one call per 50ms
+    start = time.monotonic()
+    for _ in range(5):
+        pacer.acquire()
+    elapsed = time.monotonic() - start
+    assert 0.18 <= elapsed < 0.5, elapsed
+
+    pacer.pause(0.2)
+    assert pacer.paused_for() > 0.1
+    start = time.monotonic()
+    pacer.acquire()
+    assert time.monotonic() - start >= 0.15
+    print(f"[OK] 5 calls at 1200 rpm took {elapsed:.2f}s; pause() holds the next call")
+
+
+def test_process_batch():
+    print("Testing batch claim, dedup and write-back...")
+    calls = []
+
+    def enrich(parsed_data):
+        calls.append(parsed_data["raw_text"])
+        if parsed_data["raw_text"] == "busy":
+            raise rate_limited("0")
+        if parsed_data["raw_text"] == "broken":
+            raise ValueError("LLM returned invalid JSON")
+        return {"normalized_skills": ["Python"], "summary": parsed_data["raw_text"]}
+
+    mongo_db = FakeMongo(
+        resumes=[
+            queued(1, "same file", "file-a"), queued(2, "same file", "file-a"),
+            queued(3, "pasted text"), queued(4, "pasted text"),
+            queued(5, "busy", "file-b"), queued(6, "broken", "file-c"),
+            queued(7, "seen before", "file-d"),
+            {"_id": 0, "resume_id": "r0", "content_sha256": "file-d",
+             "parsed_data": {"enriched": {"normalized_skills": ["Go"]}}},
+        ],
+        blobs=[{"_id": "file-a"}],
+    )
+    notified = []
+    worker = EnrichmentWorker(requests_per_minute=0, batch_size=50, enrich=enrich)
+    worker.attach(mongo_db, on_enriched=lambda user_id, resume_id: notified.append(resume_id))
+
+    assert worker.process_batch() == 7
+    assert calls == ["same file", "pasted text", "busy", "broken"]  # one call per distinct resume
+
+    docs = {doc["resume_id"]: doc for doc in mongo_db.resumes.docs}
+    for resume_id in ("r1", "r2", "r3", "r4", "r7"):
+        assert docs[resume_id]["enrichment_status"] == ENRICH_DONE
+        assert "enrichment_claim" not in docs[resume_id]
+    assert docs["r7"]["parsed_data"]["enriched"]["normalized_skills"] == ["Go"]
+    assert docs["r5"]["enrichment_status"] == ENRICH_PENDING and docs["r5"]["enrichment_attempts"] == 0
+    assert docs["r6"]["enrichment_status"] == ENRICH_PENDING and docs["r6"]["enrichment_attempts"] == 1
+    assert mongo_db.resume_blobs.docs[0]["enriched"]["summary"] == "same file"
+    assert notified == ["r1", "r2", "r3", "r4", "r7"]
+
+    stats = worker.stats()
+    assert stats["llm_calls"] == 2 and stats["dedup_hits"] == 1
+    assert stats["rate_limited"] == 1 and stats["errors"] == 1
+    assert stats["backlog"] == 2 and stats["in_progress"] == 0
+    print(f"[OK] 7 resumes, 4 LLM calls: {stats}")
+
+
+if __name__ == "__main__":
+    test_rate_limit_delay()
+    test_request_pacer()
+    test_process_batch()
+    print("\nAll enrichment worker tests passed!")
@@ -0,0 +1,138 @@
+"""
+Tests for the persistent in-memory job embedding index
+Run with: python test_job_index.py
+"""
+
+import re
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from database.models import Job
+from model_registry import get_model_registry, lease_sentence_transformer, sentence_transformer_key
+from student_engine import StudentJobMatchingEngine
+from test_vector_reindex import make_session
+from vector.job_index import (
+    JobEmbeddingIndex,
+    extract_query_skills,
+    job_search_text,
+    job_to_search_dict,
+    refresh_job_index,
+)
+
+
+VOCABULARY = ("python", "django", "react", "java", "sql", "docker", "api", "data", "design", "cloud")
+MODEL_NAME = "fake-index-model"
+
+
+class WordCountModel:
+    """Stand-in SentenceTransformer: normalized vocabulary counts, recording every encode"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, normalize_embeddings=True, **kwargs):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.encoded.extend(batch)
+        vectors = np.array([[text.lower().count(word) + 0.1 for word in VOCABULARY] for text in batch],
+                           dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors[0] if single else vectors
+
+
+get_model_registry().register(sentence_transformer_key(MODEL_NAME), WordCountModel)
+
+JOBS = [
+    ("Backend Developer", "Python Django API services", "Python, Django, SQL"),
+    ("Data Engineer", "Python data pipelines in the cloud", "Python, SQL, AWS"),
+    ("Frontend Developer", "React design systems", "React, JavaScript"),
+    ("Java Developer", "Java API services", "Java, Spring Boot, SQL"),
+    ("DevOps Engineer", "Docker and cloud automation", "Docker, Kubernetes, Linux"),
+    ("Data Analyst", "SQL reporting and data design", "SQL, Excel"),
+    ("Full Stack Developer", "React and Python API", "React, Python, Docker"),
+]
+
+
+def job_dicts():
+    return [
+        {"id": i, "title": title, "company": "Acme", "description": description, "requirements": requirements}
+        for i, (title, description, requirements) in enumerate(JOBS, start=1)
+    ]
+
+
+def brute_force_ranking(model, query, jobs, top_k):
+    """The ranking before the index: regex skill filter, encode every job, full stable sort."""
+    query_skills = [skill.lower() for skill in extract_query_skills(query)]
+    if query_skills:
+        jobs = [job for job in jobs if any(re.search(r"\b" + re.escape(skill) + r"\b", job_search_text(job).lower())
+                                           for skill in query_skills)]
+    if not jobs:
+        return []
+    scores = model.encode([job_search_text(job) for job in jobs]) @ model.encode(query)
+    order = sorted(range(len(jobs)), key=lambda i: -scores[i])[:top_k]
+    return [(jobs[i]["id"], round(float(scores[i]) * 100, 2)) for i in order]
+
+
+def test_index_matches_brute_force_ranking():
+    print("Testing index search against the brute-force ranking...")
+    engine = StudentJobMatchingEngine(MODEL_NAME)
+    engine.job_index.sync(job_dicts())
+    queries = ["backend API role with Python", "Java services", "cloud data work", "React or Docker",
+               "something with design"]
+    for query in queries:
+        for top_k in (1, 3, 10):
+            with lease_sentence_transformer(MODEL_NAME) as model:
+                expected = brute_force_ranking(model, query, job_dicts(), top_k)
+            actual = [(job_id, round(score * 100, 2)) for job_id, score in engine.rank_indexed_jobs(query, top_k)]
+            assert actual == expected, (query, top_k, actual, expected)
+    assert engine.rank_indexed_jobs("Rust embedded", 5) == []  # no job mentions Rust
+    print(f"[OK] {len(queries)} queries x 3 top_k values rank identically")
+
+
+def test_unchanged_jobs_are_not_reencoded():
+    print("Testing incremental sync...")
+    index = JobEmbeddingIndex(MODEL_NAME)
+    with lease_sentence_transformer(MODEL_NAME) as model:
+        pass
+    jobs = job_dicts()
+    for job in jobs:
+        job["version"] = datetime(2026, 1, 1)
+    start = len(model.encoded)
+    assert index.sync(jobs) == 7
+    assert index.sync(jobs) == 0  # same versions: not even hashed
+
+    jobs[0]["version"] = datetime(2026, 1, 2)  # saved, text unchanged
+    assert index.sync(jobs) == 0
+    jobs[1].update(description="Scala pipelines", requirements="Scala, SQL", version=datetime(2026, 1, 3))
+    assert index.sync(jobs) == 1
+    assert len(model.encoded) - start == 8
+    assert index.search(index.encode_query("python"), 10, query_skills=["Python"])  # skills re-indexed
+    assert 2 not in {hit["job_id"] for hit in index.search(index.encode_query("x"), 10, query_skills=["Python"])}
+    print("[OK] Only new and changed jobs are encoded")
+
+
+def test_refresh_from_the_jobs_table():
+    print("Testing refresh from the jobs table...")
+    db = make_session(jobs=5)
+    index = JobEmbeddingIndex(MODEL_NAME)
+    assert refresh_job_index(index, db) == 5 and len(index) == 5
+    assert refresh_job_index(index, db) == 0  # one aggregate query, nothing loaded
+
+    job = db.get(Job, 2)
+    job.description, job.updated_at = "Design React apps", datetime.utcnow() + timedelta(minutes=1)
+    db.add(Job(id=6, title="New", company="Acme", description="Docker", requirements_json={}, created_by=1,
+               created_at=datetime.utcnow() + timedelta(minutes=2)))
+    db.delete(db.get(Job, 4))
+    db.commit()
+    assert refresh_job_index(index, db) == 2
+    assert index.ids() == {1, 2, 3, 5, 6}
+    assert job_to_search_dict(db.get(Job, 6))["version"] is not None
+    print("[OK] Saved jobs are re-read, deleted jobs dropped, unchanged jobs skipped")
+
+
+if __name__ == "__main__":
+    test_index_matches_brute_force_ranking()
+    test_unchanged_jobs_are_not_reencoded()
+    test_refresh_from_the_jobs_table()
+    print("\nAll job index tests passed!")
@@ -0,0 +1,76 @@
+"""
+Tests for compiled job profiles
+Run with: python test_job_profiles.py
+"""
+
+from types import SimpleNamespace
+
+from ats_engine import ATSEngine
+from job_profiles import (
+    extract_jd_keywords, get_job_profile, get_requirement_profile, invalidate_job_profile
+)
+from models import JobRequirement, ResumeData
+
+
+REQUIREMENTS = {
+    "job_title": "Data Engineer",
+    "required_skills": ["Python", "SQL"],
+    "preferred_skills": ["Airflow"],
+    "years_of_experience": 3,
+    "keywords": ["pipelines"],
+    "job_description": (
+        "Build reliable batch and streaming pipelines. Pipelines feed analytics dashboards, "
+        "machine learning features and finance reporting. Strong python, spark, airflow, "
+        "kafka, docker, kubernetes, terraform, snowflake, bigquery, redshift, looker, "
+        "tableau, dbt, great expectations, monitoring, alerting, testing and documentation."
+    ),
+}
+
+
+def test_jd_keywords_are_deterministic():
+    print("Testing job description keyword extraction...")
+    keywords = extract_jd_keywords(REQUIREMENTS["job_description"])
+    assert len(keywords) == 20
+    assert keywords[0] == "pipelines"  # most frequent first
+    assert keywords == extract_jd_keywords(REQUIREMENTS["job_description"])
+    assert extract_jd_keywords(None) == []
+    print(f"[OK] Top keywords: {keywords[:5]}")
+
+
+def test_profile_cache_and_invalidation():
+    print("Testing profile cache keyed by job id and requirements hash...")
+    job = SimpleNamespace(id=42, requirements_json=dict(REQUIREMENTS))
+    profile = get_job_profile(job)
+    assert get_job_profile(job) is profile
+
+    # Key order does not change the hash; content does
+    job.requirements_json = dict(reversed(list(REQUIREMENTS.items())))
+    assert get_job_profile(job) is profile
+    job.requirements_json = dict(REQUIREMENTS, years_of_experience=5)
+    updated = get_job_profile(job)
+    assert updated is not profile and updated.requirement.years_of_experience == 5
+
+    invalidate_job_profile(42)
+    assert get_job_profile(job) is not updated
+    print("[OK] Profiles are reused until the requirements change or the job is invalidated")
+
+
+def test_scoring_with_profile_matches_requirement():
+    print("Testing scoring from a compiled profile...")
+    engine = ATSEngine()
+    resume = ResumeData(
+        name="Sam", email="sam@example.com", skills=["Python", "SQL", "Spark"],
+        raw_text="Data engineer with 4 years building pipelines in python, spark and airflow."
+    )
+    requirement = JobRequirement(**REQUIREMENTS)
+    from_requirement = engine.score_resume(resume, requirement)
+    from_profile = engine.score_resume(resume, get_requirement_profile(REQUIREMENTS))
+    assert from_requirement == from_profile
+    print(f"[OK] Identical results (ATS score {from_profile['ats_score']})")
+
+
+if __name__ == "__main__":
+    test_jd_keywords_are_deterministic()
+    test_profile_cache_and_invalidation()
+    test_scoring_with_profile_matches_requirement()
+    print("\nAll job profile tests passed!")
@@ -0,0 +1,172 @@
+"""
+Tests for the student job search filters pushed down into Qdrant
+Run with: python test_job_search_filter.py
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from config import QDRANT_COLLECTION_CANDIDATES, QDRANT_COLLECTION_JOBS
+from database.models import Job
+from model_registry import get_model_registry, sentence_transformer_key
+from test_vector_reindex import FakeEmbedder, in_memory_qdrant, make_session
+from vector import qdrant_client
+from vector.job_index import (
+    JobEmbeddingIndex,
+    extract_query_skills,
+    job_search_filter,
+    job_to_search_dict,
+    job_vector_text_and_payload,
+)
+from vector.qdrant_client import PAYLOAD_INDEXES, ensure_collections, search
+from vector.reindex import sync_job_points
+
+
+NOW = datetime(2026, 10, 17, tzinfo=timezone.utc)
+JOBS = [
+    # title, company, location, required skills, days since posting
+    ("Backend Engineer", "Acme", "Pune, Maharashtra", ["Python", "Django"], 2),
+    ("Backend Engineer", "Globex", "Bengaluru", ["Python"], 3),
+    ("Frontend Engineer", "Acme", "Pune", ["JavaScript", "React"], 1),
+    ("Java Developer", "Initech", "Pune", ["Java", "Spring Boot"], 40),
+    ("Data Analyst", "Acme Corp", "Remote", ["SQL", "Excel"], 5),
+]
+
+
+class ConstantModel:
+    """Every text gets the same vector, like FakeEmbedder: only the filters decide"""
+
+    def encode(self, texts, normalize_embeddings=True, **kwargs):
+        if isinstance(texts, str):
+            return np.array([0.6, 0.8], dtype=np.float32)
+        return np.tile(np.array([0.6, 0.8], dtype=np.float32), (len(texts), 1))
+
+
+get_model_registry().register(sentence_transformer_key("constant-filter-model"), ConstantModel)
+
+# (query, filters) cases both search paths must agree on
+FILTER_CASES = [
+    ("anything", {}),
+    ("backend roles in Pune with Python", {"location": "Pune"}),
+    ("Java jobs", {}),
+    ("roles", {"company": "  ACME "}),
+    ("roles", {"location": "pune", "posted_within_days": 7}),
+    ("roles", {"location": "Maharashtra, India"}),
+    ("Python", {"company": "acme corp"}),
+    ("React", {"location": "Bengaluru"}),
+]
+
+
+def make_jobs():
+    db = make_session(jobs=0)
+    for i, (title, company, location, skills, age) in enumerate(JOBS, start=1):
+        db.add(Job(id=i, title=title, company=company, location=location, description="Build things",
+                   requirements_json={"required_skills": skills}, created_by=1,
+                   created_at=NOW - timedelta(days=age)))
+    db.commit()
+    return db.query(Job).order_by(Job.id).all()
+
+
+def search_ids(query, top_k=10, **filters):
+    filter_ = job_search_filter(query_skills=extract_query_skills(query), now=NOW, **filters)
+    points = search(QDRANT_COLLECTION_JOBS, [1.0, 1.0], top_k=top_k, filter_=filter_)
+    return sorted(point.payload["job_id"] for point in points)
+
+
+def test_filter_fields_in_payload():
+    print("Testing filter fields of the job payload...")
+    jobs = make_jobs()
+    _, payload = job_vector_text_and_payload(jobs[0])
+    assert payload["skills"] == ["python", "django", "backend"]
+    assert payload["location_terms"] == ["pune", "maharashtra"]
+    assert payload["company_key"] == "acme"
+    _, payload = job_vector_text_and_payload(jobs[3])
+    assert "java" in payload["skills"] and "javascript" not in payload["skills"]
+    assert extract_query_skills("backend roles in Pune with Python") == ["Python", "Backend"]
+    print("[OK] Skills are extracted from the job text like from a query")
+
+
+def test_filtered_search_returns_only_matches():
+    print("Testing filtered search in Qdrant...")
+    in_memory_qdrant()
+    sync_job_points(make_jobs(), FakeEmbedder())
+
+    assert search_ids("anything") == [1, 2, 3, 4, 5]
+    assert job_search_filter() is None
+    assert search_ids("backend roles in Pune with Python", location="Pune") == [1]
+    assert search_ids("Java jobs") == [4]  # not the JavaScript job
+    assert search_ids("roles", company="  ACME ") == [1, 3]  # "Acme Corp" is another company
+    assert search_ids("roles", location="pune", posted_within_days=7) == [1, 3]
+    # top_k is filled with matching jobs only
+    assert len(search_ids("Python or React", top_k=2)) == 2
+    assert search_ids("Python or React", top_k=3) == [1, 2, 3]
+    print("[OK] Skill, location, company and recency conditions are applied before top_k")
+
+
+def test_in_memory_index_applies_the_same_filters():
+    print("Testing the in-memory index against the Qdrant filters...")
+    in_memory_qdrant()
+    jobs = make_jobs()
+    sync_job_points(jobs, FakeEmbedder())
+    index = JobEmbeddingIndex("constant-filter-model")
+    index.sync(job_to_search_dict(job) for job in jobs)
+    query_vector = index.encode_query("")
+    for query, filters in FILTER_CASES:
+        hits = index.search(query_vector, 10, query_skills=extract_query_skills(query), now=NOW, **filters)
+        assert sorted(hit["job_id"] for hit in hits) == search_ids(query, **filters), (query, filters)
+
+    # Moving a job changes its location terms without re-encoding it
+    jobs[1].location = "Pune"
+    assert index.sync([dict(job_to_search_dict(jobs[1]), version=NOW)]) == 0
+    hits = index.search(query_vector, 10, query_skills=["Python"], location="pune", now=NOW)
+    assert sorted(hit["job_id"] for hit in hits) == [1, 2]
+    print(f"[OK] {len(FILTER_CASES)} filter cases return the same jobs in both paths")
+
+
+class RecordingClient:
+    """Just enough of QdrantClient to see which collections and indexes are created"""
+
+    def __init__(self, schemas):
+        self.schemas = schemas
+        self.created, self.indexed = [], []
+
+    def get_collection(self, name):
+        if name not in self.schemas:
+            raise ValueError("Not found")
+        return type("CollectionInfo", (), {"payload_schema": self.schemas[name]})()
+
+    def create_collection(self, collection_name, vectors_config):
+        self.created.append(collection_name)
+        self.schemas[collection_name] = {}
+
+    def create_payload_index(self, collection_name, field_name, field_schema):
+        self.indexed.append((collection_name, field_name, field_schema))
+
+
+def test_ensure_collections_creates_missing_indexes():
+    print("Testing payload index creation...")
+    client = RecordingClient({QDRANT_COLLECTION_JOBS: {"skills": "keyword", "location_terms": "keyword"}})
+    qdrant_client._qdrant_client = client
+    ensure_collections(384)
+    assert client.created == [QDRANT_COLLECTION_CANDIDATES]
+    assert [(name, field) for name, field, _ in client.indexed] == [
+        (QDRANT_COLLECTION_JOBS, "job_id"),
+        (QDRANT_COLLECTION_JOBS, "company_key"),
+        (QDRANT_COLLECTION_JOBS, "created_at"),
+        (QDRANT_COLLECTION_CANDIDATES, "candidate_id"),
+    ]
+    assert dict(PAYLOAD_INDEXES[QDRANT_COLLECTION_JOBS])["created_at"] == "datetime"
+
+    # Later calls (every search) do not go back to Qdrant
+    client.get_collection = None
+    ensure_collections(384)
+    print("[OK] Existing collections keep their data; only missing indexes are created, once")
+
+
+if __name__ == "__main__":
+    test_filter_fields_in_payload()
+    test_filtered_search_returns_only_matches()
+    test_in_memory_index_applies_the_same_filters()
+    test_ensure_collections_creates_missing_indexes()
+    print("\nAll job search filter tests passed!")
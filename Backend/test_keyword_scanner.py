@@ -0,0 +1,59 @@
+"""
+Tests for the compiled keyword scanner
+Run with: python test_keyword_scanner.py
+
+Checks both matching modes against the per-keyword implementations they replaced.
+"""
+
+import random
+import re
+
+from keyword_scanner import KeywordScanner, SUBSTRING_AUTOMATON_MIN_KEYWORDS
+
+
+KEYWORDS = [
+    "python", "java", "javascript", "go", "c++", "c#", "node.js", "ci/cd", "sql", "mysql",
+    "machine learning", "deep learning", "google cloud", "power bi", "git", "github", "r",
+]
+FILLER = ["experience", "developed", "good", "going", "team", "node", "js", "c", "cloud", "google"]
+SEPARATORS = ["", " ", ", ", ". ", "/", "-", "  ", "\n", "("]
+
+
+def _random_text(rng, words):
+    return "".join(rng.choice(words) + rng.choice(SEPARATORS) for _ in range(rng.randint(0, 80)))
+
+
+def test_whole_word_matches_boundary_regex():
+    """Keywords made of words and single spaces behave exactly like \\b...\\b regexes"""
+    print("Testing whole-word mode...")
+    rng = random.Random(1)
+    scanner = KeywordScanner(KEYWORDS, whole_words=True)
+    regular = [k for k in KEYWORDS if re.fullmatch(r'\w+( \w+)*', k)]
+    for _ in range(1000):
+        text = _random_text(rng, KEYWORDS + FILLER)
+        expected = {k for k in regular if re.search(r'\b' + re.escape(k) + r'\b', text.lower())}
+        assert {k for k in scanner.find(text) if k in regular} == expected, text
+    assert scanner.find("Skills: C++, C#, Node.js") == {"c++", "c#", "node.js"}
+    assert scanner.find("abc++ nodejs") == set()
+    print("[OK] Whole-word hits match the regex implementation")
+
+
+def test_substring_modes_match_contains():
+    """Both substring strategies (direct and automaton) equal `keyword in text`"""
+    print("Testing substring mode...")
+    rng = random.Random(2)
+    large = KEYWORDS + ["%s%d" % (rng.choice(FILLER), i) for i in range(SUBSTRING_AUTOMATON_MIN_KEYWORDS)]
+    small_scanner = KeywordScanner(KEYWORDS + ["Go", ""], whole_words=False)
+    large_scanner = KeywordScanner(large + ["Go", ""], whole_words=False)
+    for _ in range(1000):
+        text = _random_text(rng, KEYWORDS + FILLER)
+        text_lower = text.lower()
+        assert small_scanner.find(text) == {k for k in KEYWORDS + ["Go", ""] if k.lower() in text_lower}
+        assert large_scanner.find(text) == {k for k in large + ["Go", ""] if k.lower() in text_lower}
+    print("[OK] Substring hits match str.__contains__")
+
+
+if __name__ == "__main__":
+    test_whole_word_matches_boundary_regex()
+    test_substring_modes_match_contains()
+    print("\nAll keyword scanner tests passed!")
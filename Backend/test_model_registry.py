@@ -0,0 +1,101 @@
+"""
+Tests for the process-wide model registry
+Run with: python test_model_registry.py
+"""
+
+import threading
+import time
+
+from model_registry import ModelRegistry
+
+
+class CountingLoader:
+    """Slow loader that records how often it ran; fails the first `failures` calls"""
+
+    def __init__(self, failures=0):
+        self.calls = 0
+        self.failures = failures
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(0.05)
+        if self.calls <= self.failures:
+            raise RuntimeError("weights not found")
+        return object()
+
+
+def test_single_load_under_concurrency():
+    print("Testing one load for concurrent first callers...")
+    registry, loader = ModelRegistry(), CountingLoader()
+    registry.register("encoder", loader)
+    registry.register("encoder", CountingLoader())  # re-registering keeps the first loader
+    models, barrier = [], threading.Barrier(8)
+
+    def caller():
+        barrier.wait()
+        with registry.lease("encoder") as model:
+            models.append(model)
+
+    threads = [threading.Thread(target=caller) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loader.calls == 1
+    assert len(models) == 8 and all(model is models[0] for model in models)
+    print("[OK] 8 concurrent callers shared one load")
+
+
+def test_load_errors_are_recorded():
+    print("Testing load error reporting...")
+    registry, loader = ModelRegistry(), CountingLoader(failures=1)
+    registry.register("encoder", loader)
+    assert registry.warm_up() == {"encoder": "weights not found"}
+    report = registry.memory_report()[0]
+    assert report["error"] == "weights not found" and not report["loaded"]
+
+    # A later lease retries the load and clears the error
+    registry.lease("encoder").release()
+    report = registry.memory_report()[0]
+    assert report["error"] is None and report["loaded"] and report["load_seconds"] is not None
+    try:
+        registry.lease("missing")
+        raise AssertionError("expected KeyError for an unregistered model")
+    except KeyError:
+        pass
+    print("[OK] Failed loads are reported and retried")
+
+
+def refcount(registry):
+    return registry.memory_report()[0]["refcount"]
+
+
+def test_leases_and_unloading():
+    print("Testing leases and unloading of unused models...")
+    registry, loader = ModelRegistry(), CountingLoader()
+    registry.register("encoder", loader)
+    assert not registry.is_loaded("encoder")
+    held = registry.lease("encoder")
+    with registry.lease("encoder") as model:
+        assert model is held.model and refcount(registry) == 2
+    assert refcount(registry) == 1 and registry.warm_up() == {"encoder": None} and loader.calls == 1
+
+    # A held model is never unloaded; releasing twice drops only one reference
+    assert registry.unload_unused() == [] and registry.is_loaded("encoder")
+    held.release()
+    held.release()
+    assert refcount(registry) == 0
+    assert registry.unload_unused(idle_seconds=60) == []  # just used
+    assert registry.unload_unused() == ["encoder"] and not registry.is_loaded("encoder")
+
+    # The next lease loads it again
+    with registry.lease("encoder"):
+        assert loader.calls == 2 and registry.is_loaded("encoder")
+    print("[OK] Models stay loaded while leased and are unloaded once released")
+
+
+if __name__ == "__main__":
+    test_single_load_under_concurrency()
+    test_load_errors_are_recorded()
+    test_leases_and_unloading()
+    print("\nAll model registry tests passed!")
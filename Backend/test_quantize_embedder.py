@@ -0,0 +1,68 @@
+"""
+Tests for the int8 embedding backend selection and validation
+Run with: python test_quantize_embedder.py
+"""
+
+import numpy as np
+
+from model_registry import (
+    ONNX_INT8_BACKEND,
+    TORCH_BACKEND,
+    lease_sentence_transformer,
+    onnx_int8_file,
+    sentence_transformer_key,
+)
+from quantize_embedder import compare_backends
+
+
+def normalized(matrix):
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def test_backend_registry_keys():
+    print("Testing backend selection in the model registry...")
+    # The torch key is unchanged, so the student engine and LocalEmbedder still share one model
+    assert sentence_transformer_key("all-MiniLM-L6-v2") == "sentence-transformer:all-MiniLM-L6-v2"
+    assert sentence_transformer_key("all-MiniLM-L6-v2", TORCH_BACKEND) == "sentence-transformer:all-MiniLM-L6-v2"
+    assert sentence_transformer_key("all-MiniLM-L6-v2", ONNX_INT8_BACKEND).endswith(":onnx-int8")
+    assert onnx_int8_file("avx512_vnni") == "onnx/model_qint8_avx512_vnni.onnx"
+    try:
+        lease_sentence_transformer("all-MiniLM-L6-v2", "tensorrt")
+        raise AssertionError("expected an unknown backend to be rejected")
+    except ValueError:
+        pass
+    try:
+        lease_sentence_transformer("never-exported-model", ONNX_INT8_BACKEND)
+        raise AssertionError("expected a missing export to be reported")
+    except FileNotFoundError as e:
+        assert "quantize_embedder.py export" in str(e)
+    print("[OK] Backends get separate registry entries; a missing export names the fix")
+
+
+def test_compare_backends():
+    print("Testing cosine agreement and top-k overlap...")
+    rng = np.random.default_rng(0)
+    jobs = normalized(rng.normal(size=(50, 16)).astype(np.float32))
+    queries = normalized(rng.normal(size=(20, 16)).astype(np.float32))
+
+    identical = compare_backends(jobs, jobs, queries, queries, top_k=5)
+    assert abs(identical["cosine_mean"] - 1.0) < 1e-5 and identical["cosine_min"] > 0.9999
+    assert identical["top_k_overlap"] == 1.0 and identical["top1_agreement"] == 1.0
+
+    # Small perturbations (like int8 rounding) keep agreement high; unrelated vectors do not
+    noisy_jobs = normalized(jobs + rng.normal(scale=0.02, size=jobs.shape).astype(np.float32))
+    noisy_queries = normalized(queries + rng.normal(scale=0.02, size=queries.shape).astype(np.float32))
+    close = compare_backends(jobs, noisy_jobs, queries, noisy_queries, top_k=5)
+    assert close["cosine_mean"] > 0.99 and close["top_k_overlap"] >= 0.8
+    unrelated = compare_backends(jobs, normalized(rng.normal(size=jobs.shape)), queries,
+                                 normalized(rng.normal(size=queries.shape)), top_k=5)
+    assert unrelated["cosine_mean"] < 0.5 and unrelated["top_k_overlap"] < close["top_k_overlap"]
+    assert compare_backends(jobs[:3], jobs[:3], queries, queries, top_k=10)["top_k"] == 3
+    print(f"[OK] perturbed: cosine {close['cosine_mean']:.4f}, overlap {close['top_k_overlap']:.2f}; "
+          f"unrelated: overlap {unrelated['top_k_overlap']:.2f}")
+
+
+if __name__ == "__main__":
+    test_backend_registry_keys()
+    test_compare_backends()
+    print("\nAll quantized embedder tests passed!")
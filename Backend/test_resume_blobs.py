@@ -0,0 +1,42 @@
+"""
+Tests for content-hash resume deduplication
+Run with: python test_resume_blobs.py
+"""
+
+import hashlib
+import os
+import tempfile
+
+from resume_blobs import ResumeBlobCache, content_sha256
+
+
+def test_content_hash_is_source_independent():
+    print("Testing content hashes of paths, buffers and file objects...")
+    data = b"%PDF-1.4 resume bytes " * 100000
+    expected = hashlib.sha256(data).hexdigest()
+
+    spooled = tempfile.SpooledTemporaryFile()
+    spooled.write(data)
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    try:
+        for source in (data, memoryview(data), spooled, path):
+            assert content_sha256(source) == expected
+        assert spooled.tell() == 0  # rewound for the parser
+    finally:
+        os.remove(path)
+    print(f"[OK] {expected[:16]}... for every source type")
+
+
+def test_stats_without_store():
+    print("Testing dedup stats...")
+    stats = ResumeBlobCache().stats()
+    assert stats == {"hits": 0, "misses": 0, "errors": 0, "hit_rate": 0.0}
+    print("[OK] Empty counters")
+
+
+if __name__ == "__main__":
+    test_content_hash_is_source_independent()
+    test_stats_without_store()
+    print("\nAll resume blob tests passed!")
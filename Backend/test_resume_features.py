@@ -0,0 +1,76 @@
+"""
+Tests for precomputed resume features
+Run with: python test_resume_features.py
+
+Scoring from the stored feature record must give exactly the same result as scoring
+from the raw parsed resume, and stale records must be recomputed.
+"""
+
+from ats_engine import ATSEngine
+from models import JobRequirement, ResumeData
+from resume_features import FEATURE_VERSION, compute_resume_features, resume_data_from_doc
+from resume_parser import ResumeParser
+
+
+SAMPLE_RESUME = """
+Jane Doe
+jane.doe@example.com
++1 555 123 4567
+
+Skills: Python, SQL, React, Docker
+
+Education: B.Tech in Computer Science, State University, 2019
+
+Experience
+Software Engineer, Acme Corp (3.5 years)
+Led the management of data engineering pipelines in Python.
+"""
+
+JOB = JobRequirement(
+    job_title="Backend Engineer",
+    required_skills=["Python", "SQL", "Go"],
+    preferred_skills=["Docker"],
+    education_level="Master's",
+    years_of_experience=5,
+    keywords=["python", "machine learning", "manage"],
+    job_description="We want engineers with management experience building pipelines"
+)
+
+
+def _without_features(parsed_data):
+    return {key: value for key, value in parsed_data.items() if key != "features"}
+
+
+def test_parse_attaches_features():
+    print("Testing feature record produced by the parser...")
+    parsed = ResumeParser().parse(resume_text=SAMPLE_RESUME)
+    features = parsed["features"]
+    assert features["version"] == FEATURE_VERSION
+    assert features["max_years"] == 3.5
+    assert features["education_rank"] == 3
+    assert "python" in features["tokens"]
+    assert features["has_email"] and features["has_standard_sections"]
+    assert "features" not in ResumeData(**parsed).model_dump()
+    print("[OK] Features computed at parse time and excluded from ResumeData dumps")
+
+
+def test_scoring_parity():
+    print("Testing stored vs recomputed features...")
+    engine = ATSEngine(use_memo=False)  # compare real computations, not memo hits
+    parsed = ResumeParser().parse(resume_text=SAMPLE_RESUME)
+    features = parsed.pop("features")
+    stale = dict(features, version=FEATURE_VERSION - 1, max_years=99.0)
+
+    from_stored = engine.score_resume(resume_data_from_doc({"parsed_data": parsed, "features": features}), JOB)
+    from_raw = engine.score_resume(ResumeData(**_without_features(parsed)), JOB)
+    from_stale = engine.score_resume(resume_data_from_doc({"parsed_data": parsed, "features": stale}), JOB)
+
+    assert from_stored == from_raw == from_stale
+    assert compute_resume_features(ResumeData(**parsed)) == features
+    print(f"[OK] Identical results (ATS score {from_stored['ats_score']})")
+
+
+if __name__ == "__main__":
+    test_parse_attaches_features()
+    test_scoring_parity()
+    print("\nAll resume feature tests passed!")
@@ -0,0 +1,133 @@
+"""
+Tests for bulk resume ingestion
+Run with: python test_resume_ingest.py
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Candidate, User, UserRole
+from database.postgres import Base
+from resume_ingest import INGEST_COMPLETED, ResumeFiles, ResumeIngestion, create_ingest_job
+from test_document_extraction import make_pdf
+
+
+class FakeCollection:
+    """The few pymongo Collection calls the ingest pipeline makes"""
+
+    def __init__(self):
+        self.docs = []
+
+    def insert_one(self, doc):
+        self.docs.append(doc)
+
+    def insert_many(self, docs, ordered=True):
+        self.docs.extend(docs)
+
+    def find_one(self, query, projection=None):
+        return next((doc for doc in self.docs if all(doc.get(k) == v for k, v in query.items())), None)
+
+    def update_one(self, query, update):
+        doc = self.find_one(query)
+        doc.update(update.get("$set", {}))
+        for key, value in update.get("$push", {}).items():
+            doc[key].extend(value["$each"])
+
+
+class FakeMongo:
+    def __init__(self):
+        self.resumes = FakeCollection()
+        self.ingest_jobs = FakeCollection()
+
+
+def make_archive(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+RESUMES = {
+    "drive/asha.pdf": make_pdf(["Asha Verma", "ASHA.Verma@example.com", "Skills: Python, SQL"]),
+    "drive/ravi.pdf": make_pdf(["Ravi Kumar", "ravi@example.com", "Skills: Java"]),
+    "drive/broken.pdf": b"not really a pdf",
+    "drive/notes.txt": b"ignored",
+    "__MACOSX/drive/._asha.pdf": b"resource fork",
+}
+
+
+def test_resume_files_from_zip_and_directory():
+    print("Testing resume discovery in archives and directories...")
+    fd, archive_path = tempfile.mkstemp(suffix=".zip")
+    with os.fdopen(fd, "wb") as f:
+        f.write(make_archive(RESUMES))
+    directory = tempfile.mkdtemp()
+    try:
+        for name, data in RESUMES.items():
+            os.makedirs(os.path.join(directory, os.path.dirname(name)), exist_ok=True)
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(data)
+        expected = ["drive/asha.pdf", "drive/broken.pdf", "drive/ravi.pdf"]
+        with ResumeFiles(archive_path) as files:
+            assert sorted(files.names) == expected
+            assert files.payload("drive/asha.pdf") == RESUMES["drive/asha.pdf"]
+        with ResumeFiles(directory) as files:
+            assert files.names == expected
+            assert files.payload("drive/asha.pdf") == os.path.join(directory, "drive/asha.pdf")
+        print("[OK] Only PDF/DOCX files are ingested; archive members are read as bytes")
+    finally:
+        os.remove(archive_path)
+        shutil.rmtree(directory)
+
+
+def test_ingestion_pipeline():
+    print("Testing parallel parse, batched writes and candidate linking...")
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=7, email="asha.verma@example.com", password_hash="x", role=UserRole.STUDENT))
+    db.add(Candidate(id=3, user_id=7, name="Asha Verma", email="asha.verma@example.com"))
+    db.commit()
+
+    mongo_db = FakeMongo()
+    job = create_ingest_job(mongo_db, user_id=1, source="drive.zip")
+    fd, archive_path = tempfile.mkstemp(suffix=".zip")
+    with os.fdopen(fd, "wb") as f:
+        f.write(make_archive(RESUMES))
+    updates, linked = [], []
+    try:
+        progress = ResumeIngestion(mongo_db, db, job_id=job["job_id"], user_id=1, batch_size=1,
+                                   on_progress=updates.append, on_linked=linked.extend).run(archive_path)
+    finally:
+        os.remove(archive_path)
+
+    assert progress["total"] == 3 and progress["succeeded"] == 2 and progress["failed"] == 1
+    assert progress["linked"] == 1 and progress["resumes_per_second"] > 0
+    assert updates and updates[-1]["processed"] == 3
+
+    by_file = {doc["filename"]: doc for doc in mongo_db.resumes.docs}
+    assert set(by_file) == {"asha.pdf", "ravi.pdf"}
+    assert by_file["asha.pdf"]["user_id"] == 7  # owned by the linked student
+    assert by_file["ravi.pdf"]["user_id"] == 1  # no candidate: stays with the uploader
+    assert "Python" in by_file["asha.pdf"]["parsed_data"]["skills"]
+    assert db.get(Candidate, 3).resume_id == by_file["asha.pdf"]["resume_id"]
+    assert linked == [{"candidate_id": 3, "user_id": 7, "resume_id": by_file["asha.pdf"]["resume_id"],
+                       "text": by_file["asha.pdf"]["raw_text"]}]  # handed to the candidate vector index
+
+    stored_job = mongo_db.ingest_jobs.find_one({"job_id": job["job_id"]})
+    assert stored_job["status"] == INGEST_COMPLETED and stored_job["processed"] == 3
+    assert [error["file"] for error in stored_job["errors"]] == ["drive/broken.pdf"]
+    print(f"[OK] {progress}")
+
+
+if __name__ == "__main__":
+    test_resume_files_from_zip_and_directory()
+    test_ingestion_pipeline()
+    print("\nAll resume ingest tests passed!")
@@ -0,0 +1,134 @@
+"""
+Tests for asynchronous resume uploads: background stages and the status endpoint
+Run with: python test_resume_processing.py
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+
+from routers import resume
+from test_document_extraction import make_pdf
+
+
+USER_ID = 5
+
+
+class FakeCollection:
+    """insert_one / find_one / update_one with $set and $push, as the upload pipeline uses them"""
+
+    def __init__(self):
+        self.docs = []
+
+    def insert_one(self, doc):
+        self.docs.append(doc)
+
+    def find_one(self, query, projection=None):
+        return next((doc for doc in self.docs if all(doc.get(k) == v for k, v in query.items())), None)
+
+    def update_one(self, query, update):
+        doc = self.find_one(query)
+        doc.update(update.get("$set", {}))
+        for key, value in update.get("$push", {}).items():
+            doc.setdefault(key, []).append(value)
+
+
+class FakeMongo:
+    def __init__(self):
+        self.resumes = FakeCollection()
+        self.resume_processing = FakeCollection()
+
+
+def run_background(data, mongo):
+    """Run the background task for a queued processing doc; returns (doc, notifications)"""
+    notifications = []
+    original = resume.get_mongo_db, resume.notify_user, resume.RESUME_DEDUP_ENABLED
+    resume.get_mongo_db = mongo if callable(mongo) else (lambda: mongo)
+    resume.notify_user = lambda user_id, event: notifications.append(event)
+    resume.RESUME_DEDUP_ENABLED = False
+    try:
+        asyncio.run(resume._process_upload_in_background("p1", data, "resume.pdf", USER_ID))
+    finally:
+        resume.get_mongo_db, resume.notify_user, resume.RESUME_DEDUP_ENABLED = original
+    return notifications
+
+
+def queued_mongo():
+    mongo = FakeMongo()
+    mongo.resume_processing.insert_one({"processing_id": "p1", "user_id": USER_ID, "status": resume.PROCESSING_QUEUED,
+                                        "stage": None, "stages": [], "resume_id": None})
+    return mongo
+
+
+def test_successful_upload():
+    print("Testing a successful background upload...")
+    mongo = queued_mongo()
+    notifications = run_background(make_pdf(["Asha Verma", "asha@example.com", "Skills: Python, SQL"]), mongo)
+    doc = mongo.resume_processing.docs[0]
+    assert doc["status"] == resume.PROCESSING_COMPLETED and doc["finished_at"] is not None
+    assert [stage["stage"] for stage in doc["stages"]] == [
+        resume.PROCESSING_STAGE_STARTED, resume.PROCESSING_STAGE_PARSED, resume.PROCESSING_STAGE_STORED,
+        resume.PROCESSING_COMPLETED,
+    ]
+    assert doc["resume_id"] == mongo.resumes.docs[0]["resume_id"]
+    assert mongo.resumes.docs[0]["parsed_data"]["email"] == "asha@example.com"
+    assert [event["stage"] for event in notifications] == [stage["stage"] for stage in doc["stages"]]
+    print("[OK] Every stage recorded and notified, resume stored")
+
+
+def test_parse_failure():
+    print("Testing a background upload that cannot be parsed...")
+    mongo = queued_mongo()
+    notifications = run_background(b"not really a pdf", mongo)
+    doc = mongo.resume_processing.docs[0]
+    assert doc["status"] == resume.PROCESSING_FAILED and doc["stage"] == resume.PROCESSING_FAILED
+    assert doc["error"].startswith("Error processing resume") and doc["finished_at"] is not None
+    assert not mongo.resumes.docs
+    assert notifications[-1]["status"] == resume.PROCESSING_FAILED
+    print(f"[OK] Failure recorded: {doc['error'][:60]}...")
+
+
+def test_mongo_unavailable():
+    print("Testing a background upload while MongoDB is down...")
+
+    def unavailable():
+        raise HTTPException(status_code=503, detail="MongoDB connection failed")
+
+    notifications = run_background(make_pdf(["Asha Verma"]), unavailable)
+    assert [event["status"] for event in notifications] == [resume.PROCESSING_FAILED]
+    assert "MongoDB connection failed" in notifications[0]["error"]
+    print("[OK] The task does not crash and the user is notified")
+
+
+def test_status_lookup():
+    print("Testing the processing status endpoint...")
+    mongo = queued_mongo()
+    original = resume.get_mongo_db
+    resume.get_mongo_db = lambda: mongo
+    user = SimpleNamespace(id=USER_ID, role=SimpleNamespace(value="student"))
+    try:
+        doc = asyncio.run(resume.get_processing_status("p1", current_user=user))
+        assert doc["status"] == resume.PROCESSING_QUEUED
+        try:
+            asyncio.run(resume.get_processing_status("unknown", current_user=user))
+            raise AssertionError("expected HTTP 404")
+        except HTTPException as e:
+            assert e.status_code == 404
+        other = SimpleNamespace(id=USER_ID + 1, role=SimpleNamespace(value="student"))
+        try:
+            asyncio.run(resume.get_processing_status("p1", current_user=other))
+            raise AssertionError("expected HTTP 403")
+        except HTTPException as e:
+            assert e.status_code == 403
+    finally:
+        resume.get_mongo_db = original
+    print("[OK] Unknown ids are 404, other users' jobs 403")
+
+
+if __name__ == "__main__":
+    test_successful_upload()
+    test_parse_failure()
+    test_mongo_unavailable()
+    test_status_lookup()
+    print("\nAll resume processing tests passed!")
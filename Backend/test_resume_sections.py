@@ -0,0 +1,77 @@
+"""
+Tests for single-pass resume section segmentation
+Run with: python test_resume_sections.py
+"""
+
+from resume_parser import ResumeParser
+from resume_sections import ResumeSections, segment_resume
+
+
+RESUME = """JANE DOE
+jane@example.com | 555-123-4567
+
+PROFESSIONAL SUMMARY
+Data analyst who likes clean pipelines.
+
+Work Experience
+Data Analyst, Acme (2.5 years)
+- Built dashboards
+
+Education: B.Sc Statistics, Pune University
+
+Technical Skills: Python, SQL
+Tableau
+
+Projects:
+1. Sales forecasting model in Python
+2. Campus placement dashboard
+
+Certifications: Google Data Analytics
+"""
+
+
+def test_headers_and_slices():
+    print("Testing section headers...")
+    sections = segment_resume(RESUME)
+    assert sections.labels() == ["contact", "experience", "education", "skills", "projects", "certifications"]
+    assert sections.get("contact").startswith("JANE DOE")
+    assert "PROFESSIONAL SUMMARY" in sections.get("contact")  # not a known section
+    assert sections.block("skills", 10) == "Python, SQL\nTableau"
+    assert sections.block("skills", 0) == "Python, SQL"
+    assert sections.to_dict()["education"] == "B.Sc Statistics, Pune University"
+    assert segment_resume("no headers here").labels() == ["contact"]
+    print(f"[OK] {sections.labels()}")
+
+
+def test_prose_is_not_a_header():
+    print("Testing that prose mentioning section words is left alone...")
+    text = "Summary: 5 years of experience with python\nStrong background in education technology\n"
+    assert segment_resume(text).labels() == ["contact"]
+    print("[OK] Only heading lines start sections")
+
+
+def test_parser_uses_sections():
+    print("Testing parser extraction from sections...")
+    parsed = ResumeParser().parse(resume_text=RESUME)
+    assert parsed["name"] == "JANE DOE" and parsed["email"] == "jane@example.com"
+    assert {"Python", "SQL", "Tableau"} <= set(parsed["skills"])
+    assert parsed["education"][0]["institution"] == "Pune University"
+    assert parsed["experience"][0]["duration"] == "2.5 years"
+    assert parsed["certifications"] == ["Google Data Analytics"]
+    assert [p["title"] for p in parsed["projects"]] == [
+        "Sales forecasting model in Python", "Campus placement dashboard"
+    ]
+    assert set(parsed["section_offsets"]) == {"contact", "experience", "education", "skills", "projects",
+                                              "certifications"}
+    # Only offsets are stored; the sections come back from raw_text without a rescan
+    stored = ResumeSections.from_offsets(parsed["raw_text"], parsed["section_offsets"])
+    assert stored.to_dict() == segment_resume(RESUME).to_dict()
+    assert stored.block("skills", 10) == "Python, SQL\nTableau"
+    print("[OK] Every extractor found its section")
+
+
+if __name__ == "__main__":
+    test_headers_and_slices()
+    test_prose_is_not_a_header()
+    test_parser_uses_sections()
+    print("\nAll resume section tests passed!")
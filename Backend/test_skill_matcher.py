@@ -0,0 +1,129 @@
+"""
+Parity tests for the compiled skill matcher used by ATSEngine
+Run with: python test_skill_matcher.py
+
+Compares ATSEngine._calculate_skill_score against the original pairwise
+SequenceMatcher implementation on hand-picked and randomly generated skill lists.
+"""
+
+import random
+from difflib import SequenceMatcher
+
+from ats_engine import ATSEngine
+
+
+# ============ REFERENCE IMPLEMENTATION (pre-compilation ATSEngine) ============
+
+def reference_skill_score(resume_skills, required_skills, preferred_skills, threshold=0.7):
+    """The original O(R*S) loop, kept verbatim as the parity oracle"""
+    if not required_skills and not preferred_skills:
+        return 100.0, [], []
+
+    resume_skills_lower = [skill.lower().strip() for skill in resume_skills]
+    required_skills_lower = [skill.lower().strip() for skill in required_skills]
+    preferred_skills_lower = [skill.lower().strip() for skill in preferred_skills]
+
+    matched_skills = []
+    missing_skills = []
+
+    required_matches = 0
+    for req_skill in required_skills_lower:
+        matched = False
+        for res_skill in resume_skills_lower:
+            similarity = SequenceMatcher(None, req_skill, res_skill).ratio()
+            if similarity >= threshold or req_skill in res_skill or res_skill in req_skill:
+                matched_skills.append(req_skill.title())
+                matched = True
+                break
+        if not matched:
+            missing_skills.append(req_skill.title())
+        else:
+            required_matches += 1
+
+    required_score = (required_matches / len(required_skills_lower) * 100) if required_skills_lower else 50
+
+    preferred_matches = 0
+    for pref_skill in preferred_skills_lower:
+        for res_skill in resume_skills_lower:
+            similarity = SequenceMatcher(None, pref_skill, res_skill).ratio()
+            if similarity >= threshold or pref_skill in res_skill or res_skill in pref_skill:
+                if pref_skill.title() not in matched_skills:
+                    matched_skills.append(pref_skill.title())
+                preferred_matches += 1
+                break
+
+    preferred_score = (preferred_matches / len(preferred_skills_lower) * 100) if preferred_skills_lower else 50
+
+    if required_skills_lower and preferred_skills_lower:
+        total_score = (required_score * 0.7) + (preferred_score * 0.3)
+    elif required_skills_lower:
+        total_score = required_score
+    elif preferred_skills_lower:
+        total_score = preferred_score * 0.5
+    else:
+        total_score = 100.0
+
+    return total_score, matched_skills, missing_skills
+
+
+# ============ TEST DATA ============
+
+SKILL_POOL = [
+    "Python", "python3", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "Go", "Golang",
+    "React", "React.js", "ReactJS", "Angular", "Vue", "Node.js", "NodeJS", "Django", "Flask",
+    "SQL", "MySQL", "PostgreSQL", "Postgres", "MongoDB", "Redis", "Docker", "Kubernetes", "k8s",
+    "AWS", "Azure", "GCP", "Machine Learning", "Deep Learning", "ML", "NLP", "TensorFlow",
+    "PyTorch", "Git", "GitHub", "CI/CD", "Linux", "REST API", "REST APIs", "GraphQL",
+    "Data Analysis", "Data Analytics", "Excel", "Pandas", "NumPy", "Spring Boot", "Spring",
+    "  Rust ", "R", "scikit-learn", "Scikit Learn", "Power BI", "Tableau", "",
+]
+
+HAND_PICKED_CASES = [
+    (["Python", "Django"], ["python", "Flask"], ["Docker"]),
+    (["ReactJS", "node"], ["React.js", "Node.js", "Express"], []),
+    ([], ["Python"], ["SQL"]),
+    (["Postgres"], [], ["PostgreSQL", "MySQL"]),
+    (["c"], ["C++", "C#", "Go"], ["Rust"]),
+    ([""], ["Python", "Java"], ["Kubernetes"]),
+    (["Machine Learning"], ["ML", "machine learning", "Deep Learning"], ["ml"]),
+    (["Java"], ["JavaScript", "Java", "java"], ["JAVA "]),
+]
+
+
+# ============ TESTS ============
+
+def _assert_parity(engine, resume_skills, required, preferred):
+    expected = reference_skill_score(resume_skills, required, preferred, engine.skill_similarity_threshold)
+    actual = engine._calculate_skill_score(resume_skills, required, preferred)
+    assert actual == expected, (
+        f"Mismatch for resume={resume_skills} required={required} preferred={preferred}:\n"
+        f"  expected {expected}\n  got      {actual}"
+    )
+
+
+def test_hand_picked_parity():
+    """Edge cases: containment, near-duplicates, empty strings, duplicates"""
+    print("Testing hand-picked skill lists...")
+    engine = ATSEngine()
+    for resume_skills, required, preferred in HAND_PICKED_CASES:
+        _assert_parity(engine, resume_skills, required, preferred)
+    print(f"[OK] {len(HAND_PICKED_CASES)} cases match the reference implementation")
+
+
+def test_randomized_parity(iterations: int = 2000, seed: int = 42):
+    """Random resumes scored against random job requirements"""
+    print("Testing randomized skill lists...")
+    rng = random.Random(seed)
+    engine = ATSEngine()
+    for _ in range(iterations):
+        resume_skills = rng.sample(SKILL_POOL, rng.randint(0, 15))
+        required = rng.sample(SKILL_POOL, rng.randint(0, 8))
+        preferred = rng.sample(SKILL_POOL, rng.randint(0, 5))
+        _assert_parity(engine, resume_skills, required, preferred)
+    print(f"[OK] {iterations} randomized cases match the reference implementation")
+
+
+if __name__ == "__main__":
+    test_hand_picked_parity()
+    test_randomized_parity()
+    print("\nAll skill matcher parity tests passed!")
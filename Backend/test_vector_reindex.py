@@ -0,0 +1,194 @@
+"""
+Tests for the streaming, resumable Qdrant jobs reindex
+Run with: python test_vector_reindex.py
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from qdrant_client import QdrantClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config import QDRANT_COLLECTION_JOBS
+from database.models import Job
+from database.postgres import Base
+from test_resume_ingest import FakeCollection
+from vector import qdrant_client
+from vector.qdrant_client import ensure_collections
+from vector.reindex import (
+    REINDEX_COMPLETED,
+    REINDEX_FAILED,
+    REINDEX_RUNNING,
+    JobReindex,
+    create_reindex_job,
+    get_reindex_job,
+    is_resumable,
+    sync_job_points,
+)
+
+
+class FakeMongo:
+    def __init__(self):
+        self.reindex_jobs = FakeCollection()
+
+
+class FakeEmbedder:
+    model_id = "fake-model:torch"
+    dimension = 2
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_batch(self, texts):
+        self.batches.append(len(texts))
+        return [[1.0, float(len(text))] for text in texts]
+
+
+def in_memory_qdrant(fail_on_upsert=None):
+    """Point vector.qdrant_client at an in-process Qdrant; optionally fail the n-th upsert once."""
+    client = QdrantClient(":memory:")
+    qdrant_client._qdrant_client = client
+    ensure_collections(FakeEmbedder.dimension)
+    upsert, calls = client.upsert, []
+
+    def flaky_upsert(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == fail_on_upsert:
+            raise ConnectionError("qdrant unavailable")
+        return upsert(*args, **kwargs)
+
+    client.upsert = flaky_upsert
+    return client
+
+
+def stored_points(client):
+    points, _ = client.scroll(QDRANT_COLLECTION_JOBS, limit=1000, with_payload=True)
+    return {point.id: point.payload for point in points}
+
+
+def make_session(jobs=7):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    for i in range(1, jobs + 1):
+        db.add(Job(id=i, title=f"Engineer {i}", company="Acme", description="Build APIs",
+                   requirements_json={"required_skills": ["Python"]}, created_by=1))
+    db.commit()
+    return db
+
+
+def test_chunked_reindex():
+    print("Testing chunked streaming reindex...")
+    db, mongo_db, embedder, client = make_session(), FakeMongo(), FakeEmbedder(), in_memory_qdrant()
+    job = create_reindex_job(mongo_db, user_id=1)
+    updates = []
+    progress = JobReindex(mongo_db, db, embedder, reindex_id=job["reindex_id"],
+                          chunk_size=3, on_progress=updates.append).run()
+
+    assert embedder.batches == [3, 3, 1]  # one embed_batch and one upsert per chunk
+    points = stored_points(client)
+    assert sorted(points) == list(range(1, 8))
+    assert points[1]["required_skills"] == ["Python"] and points[1]["embedding_model"] == "fake-model:torch"
+    assert [update["last_job_id"] for update in updates] == [3, 6, 7]
+    assert progress["total"] == 7 and progress["embedded"] == 7 and progress["jobs_per_second"] > 0
+    stored = get_reindex_job(mongo_db, job["reindex_id"])
+    assert stored["status"] == REINDEX_COMPLETED and stored["last_job_id"] == 7
+    print(f"[OK] {progress}")
+
+
+def test_resume_after_failure():
+    print("Testing resume from the checkpoint after a failed chunk...")
+    db, mongo_db, embedder = make_session(), FakeMongo(), FakeEmbedder()
+    client = in_memory_qdrant(fail_on_upsert=2)
+    job = create_reindex_job(mongo_db, user_id=1)
+    try:
+        JobReindex(mongo_db, db, embedder, reindex_id=job["reindex_id"], chunk_size=3).run()
+        raise AssertionError("expected the upsert failure to propagate")
+    except ConnectionError:
+        pass
+    stored = get_reindex_job(mongo_db, job["reindex_id"])
+    assert stored["status"] == REINDEX_FAILED and stored["last_job_id"] == 3 and stored["processed"] == 3
+    assert is_resumable(stored)
+
+    # The resumed run continues after job 3 and keeps the earlier counts
+    progress = JobReindex(mongo_db, db, embedder, reindex_id=job["reindex_id"], chunk_size=3).run()
+    assert sorted(stored_points(client)) == list(range(1, 8))
+    assert embedder.batches == [3, 3, 3, 1]  # chunk 2 is embedded again, chunk 1 is not
+    assert progress["processed"] == 7 and progress["embedded"] == 7 and progress["total"] == 7
+    assert get_reindex_job(mongo_db, job["reindex_id"])["status"] == REINDEX_COMPLETED
+    print("[OK] Resumed at job 4 with the first chunk kept")
+
+
+def test_unchanged_jobs_are_not_embedded():
+    print("Testing text-hash skipping...")
+    db, embedder, client = make_session(jobs=4), FakeEmbedder(), in_memory_qdrant()
+    jobs = db.query(Job).order_by(Job.id).all()
+    assert sync_job_points(jobs, embedder)["embedded"] == 4
+
+    jobs[0].salary = "12 LPA"  # payload-only edit
+    jobs[1].description = "Build data pipelines"  # changes the embedded text
+    counts = sync_job_points(jobs, embedder)
+    assert counts == {"embedded": 1, "patched": 1, "unchanged": 2, "empty": 0}
+    assert embedder.batches == [4, 1]
+    assert stored_points(client)[1]["salary"] == "12 LPA"
+
+    # A different embedding model, or force, re-embeds everything
+    embedder.model_id = "fake-model:onnx-int8"
+    assert sync_job_points(jobs, embedder)["embedded"] == 4
+    assert sync_job_points(jobs, embedder, force=True)["embedded"] == 4
+    assert sync_job_points(jobs, embedder)["unchanged"] == 4
+
+    mongo_db = FakeMongo()
+    job = create_reindex_job(mongo_db, user_id=1)
+    progress = JobReindex(mongo_db, db, embedder, reindex_id=job["reindex_id"], chunk_size=3).run()
+    assert progress["embedded"] == 0 and progress["skipped"] == 4 and progress["indexed"] == 4
+    print("[OK] Salary edits patch the payload; unchanged jobs are skipped by a full reindex")
+
+
+def test_deleted_jobs_are_removed():
+    print("Testing removal of deleted jobs' points...")
+    db, embedder, client = make_session(), FakeEmbedder(), in_memory_qdrant()
+    sync_job_points(db.query(Job).all(), embedder)
+    for job_id in (2, 5, 7):  # deleted inside a chunk, at a chunk's end and past the last job
+        db.delete(db.get(Job, job_id))
+    db.commit()
+    JobReindex(FakeMongo(), db, embedder, chunk_size=3).run()
+    assert sorted(stored_points(client)) == [1, 3, 4, 6]
+
+    # A job left without any text loses its point as well
+    job = db.get(Job, 4)
+    job.title, job.company, job.description, job.requirements_json = "", "", "", {}
+    assert sync_job_points([job], embedder)["empty"] == 1
+    assert sorted(stored_points(client)) == [1, 3, 6]
+
+    # Deleting a job through the API removes its point right away
+    from routers import jobs as jobs_router
+    original = jobs_router.USE_QDRANT_MATCHING
+    jobs_router.USE_QDRANT_MATCHING = True
+    admin = SimpleNamespace(id=99, role=SimpleNamespace(value="admin"))
+    try:
+        asyncio.run(jobs_router.delete_job(3, current_user=admin, db=db))
+    finally:
+        jobs_router.USE_QDRANT_MATCHING = original
+    assert sorted(stored_points(client)) == [1, 6]
+    print("[OK] Points of deleted and emptied jobs are gone")
+
+
+def test_stale_running_jobs_are_resumable():
+    print("Testing crash detection...")
+    now = datetime.utcnow()
+    assert not is_resumable({"status": REINDEX_RUNNING, "updated_at": now - timedelta(seconds=30)}, now)
+    assert is_resumable({"status": REINDEX_RUNNING, "updated_at": now - timedelta(hours=1)}, now)
+    assert not is_resumable({"status": REINDEX_COMPLETED, "updated_at": now - timedelta(hours=1)}, now)
+    print("[OK] Only failed or stale runs are resumed")
+
+
+if __name__ == "__main__":
+    test_chunked_reindex()
+    test_resume_after_failure()
+    test_unchanged_jobs_are_not_embedded()
+    test_deleted_jobs_are_removed()
+    test_stale_running_jobs_are_resumable()
+    print("\nAll vector reindex tests passed!")
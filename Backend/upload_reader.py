@@ -0,0 +1,110 @@
+"""
+Upload Reader Module
+Upload size limits enforced while the request body streams in, and size-checked access
+to the parsed upload without copying it again.
+
+Starlette's multipart parser spools every uploaded file into a SpooledTemporaryFile
+(in memory up to 1 MB, then on disk) before the endpoint runs, so a check inside the
+endpoint comes too late to stop an oversized body. `UploadSizeLimitMiddleware` therefore
+rejects multipart requests whose Content-Length is over the limit before reading them,
+and counts the body as it is received, failing with 413 as soon as the limit is passed.
+`open_upload` then checks the exact size of the parsed file against the per-endpoint
+limit and hands the rewound file object to the parsers, which read it directly.
+"""
+
+from typing import BinaryIO, Dict, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.responses import JSONResponse
+
+from config import MAX_UPLOAD_SIZE
+
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for the multipart boundaries, part headers and small form fields around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Maximum size is {max_size // (1024 * 1024)} MB"
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware bounding the body of multipart requests while it is received.
+
+    Args:
+        app: The wrapped ASGI application
+        max_size: Largest upload accepted (the body may exceed it by MULTIPART_OVERHEAD)
+        path_limits: Larger or smaller limits for specific paths, e.g. archive uploads
+    """
+
+    def __init__(self, app, max_size: int = MAX_UPLOAD_SIZE, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_size = max_size
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        if not headers.get(b"content-type", b"").lower().startswith(b"multipart/"):
+            await self.app(scope, receive, send)
+            return
+
+        max_size = self.path_limits.get(scope.get("path", "").rstrip("/"), self.max_size)
+        limit = max_size + MULTIPART_OVERHEAD
+        try:
+            declared = int(headers.get(b"content-length", b""))
+        except ValueError:
+            declared = None  # chunked transfer: only the running count applies
+        if declared is not None and declared > limit:
+            error = _too_large(max_size)
+            response = JSONResponse({"detail": error.detail}, status_code=error.status_code,
+                                    headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the form parser; FastAPI passes HTTPException through
+                    raise _too_large(max_size)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def open_upload(file: UploadFile, max_size: int = MAX_UPLOAD_SIZE,
+                      chunk_size: int = UPLOAD_CHUNK_SIZE) -> BinaryIO:
+    """
+    Validate the size of a parsed upload and return its underlying binary file object.
+
+    The body has already been received and spooled at this point; the streaming limit
+    is UploadSizeLimitMiddleware's job. This is the exact per-file check.
+
+    Raises:
+        HTTPException 413: if the upload is larger than max_size
+    """
+    size = file.size
+    if size is None:
+        # Size not reported by the multipart parser: count it, stopping at the limit
+        size = 0
+        while size <= max_size:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+    if size > max_size:
+        raise _too_large(max_size)
+    await file.seek(0)
+    return file.file
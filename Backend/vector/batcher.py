@@ -0,0 +1,169 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from config import EMBED_BATCH_MAX_SIZE, EMBED_BATCH_MAX_WAIT_MS
+from vector.embedder import LocalEmbedder, get_embedder
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching front end for a LocalEmbedder.
+
+    Callers (async routes, sync routes in the thread pool, reindexing) enqueue texts and get
+    a future back. A single encoder thread takes the first waiting text, keeps collecting
+    for up to `max_wait_ms` or until `max_batch_size` texts are waiting, runs one
+    `embed_batch` for all of them and resolves every caller's future. Concurrent requests
+    therefore share sentence-transformers' batched forward pass instead of each paying for
+    a full one, and the model is only ever driven by one thread. `max_batch_size=1`
+    turns batching off (one encode per text, still off the event loop).
+    """
+
+    def __init__(self, embedder: LocalEmbedder, max_batch_size: int = EMBED_BATCH_MAX_SIZE,
+                 max_wait_ms: float = EMBED_BATCH_MAX_WAIT_MS) -> None:
+        self._embedder = embedder
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics = {"texts": 0, "batches": 0, "largest_batch": 0, "encode_seconds": 0.0,
+                         "wait_seconds": 0.0, "errors": 0}
+
+    @property
+    def dimension(self) -> int:
+        return self._embedder.dimension
+
+    @property
+    def model_id(self) -> str:
+        return self._embedder.model_id
+
+    def submit(self, text: str) -> "Future[List[float]]":
+        """Queue one text; the future resolves to its normalized embedding."""
+        future: "Future[List[float]]" = Future()
+        self._ensure_thread()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def embed_text(self, text: str) -> List[float]:
+        """Blocking variant of `embed` for sync callers (same signature as LocalEmbedder)."""
+        return self.submit(text).result()
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed many texts; they are queued together and may share batches with other callers."""
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch sizes, queueing delay and encoder throughput since start."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        batches, texts = metrics["batches"], metrics["texts"]
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queued": self._queue.qsize(),
+            "texts": texts,
+            "batches": batches,
+            "largest_batch": metrics["largest_batch"],
+            "mean_batch_size": round(texts / batches, 2) if batches else 0.0,
+            "mean_wait_ms": round(metrics["wait_seconds"] / texts * 1000.0, 3) if texts else 0.0,
+            "encode_seconds": round(metrics["encode_seconds"], 3),
+            "texts_per_second": round(texts / metrics["encode_seconds"], 1) if metrics["encode_seconds"] else 0.0,
+            "errors": metrics["errors"],
+        }
+
+    def close(self) -> None:
+        """Stop the encoder thread after the texts already queued."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._thread.start()
+
+    def _collect(self, first: tuple) -> tuple:
+        """Gather a batch starting with `first`; returns (batch, stop_requested)."""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+            self._encode(batch)
+            if stop:
+                return
+
+    def _encode(self, batch: List[tuple]) -> None:
+        # Callers that gave up (cancelled futures) are dropped before encoding
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            vectors = self._embedder.embed_batch([text for text, _, _ in batch])
+        except Exception as e:
+            with self._lock:
+                self._metrics["errors"] += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        finished = time.perf_counter()
+        with self._lock:
+            self._metrics["texts"] += len(batch)
+            self._metrics["batches"] += 1
+            self._metrics["largest_batch"] = max(self._metrics["largest_batch"], len(batch))
+            self._metrics["encode_seconds"] += finished - started
+            self._metrics["wait_seconds"] += sum(started - queued_at for _, _, queued_at in batch)
+        for (_, future, _), vector in zip(batch, vectors):
+            future.set_result(vector)
+
+
+_batcher: Optional[EmbeddingBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Process-wide micro-batcher in front of get_embedder()."""
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = EmbeddingBatcher(get_embedder())
+    return _batcher
+
+
+def embedding_batcher_stats() -> Optional[Dict[str, Any]]:
+    """Stats of the process-wide batcher, or None if nothing has used it yet."""
+    return _batcher.stats() if _batcher is not None else None
+
+
+def shutdown_embedding_batcher() -> None:
+    if _batcher is not None:
+        _batcher.close()
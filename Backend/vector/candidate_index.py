@@ -0,0 +1,180 @@
+import hashlib
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from qdrant_client.http import models as qm
+
+from config import (
+    CANDIDATE_PASSAGE_MAX_WORDS,
+    CANDIDATE_PASSAGE_OVERLAP_WORDS,
+    QDRANT_COLLECTION_CANDIDATES,
+    QDRANT_COLLECTION_JOBS,
+)
+from resume_sections import segment_resume
+from vector.qdrant_client import (
+    delete_by_filter,
+    retrieve_payloads,
+    retrieve_vector,
+    search_groups,
+    set_payload_by_filter,
+    upsert_points,
+)
+from vector.reindex import sync_job_points
+
+
+def passage_point_id(candidate_id: int, index: int) -> str:
+    """Deterministic point id of a candidate's index-th passage (Qdrant ids are ints or UUIDs)."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"candidates/{candidate_id}/passages/{index}"))
+
+
+def resume_passages(text: str, max_words: int = CANDIDATE_PASSAGE_MAX_WORDS,
+                    overlap: int = CANDIDATE_PASSAGE_OVERLAP_WORDS) -> List[Tuple[str, str]]:
+    """
+    (section label, passage) pairs of a resume, in document order.
+
+    Each section (resume_sections.py) is one passage; a section longer than max_words is
+    split into windows of max_words words, consecutive windows sharing `overlap` words so
+    a phrase on a boundary is whole in one of them.
+    """
+    max_words = max(1, max_words)
+    step = max(1, max_words - max(0, overlap))
+    passages = []
+    for label, content in segment_resume(text).to_dict().items():
+        words = content.split()
+        start = 0
+        while words:
+            passages.append((label, " ".join(words[start:start + max_words])))
+            if start + max_words >= len(words):
+                break
+            start += step
+    return passages
+
+
+def _candidate_filter(candidate_id: int) -> qm.FieldCondition:
+    return qm.FieldCondition(key="candidate_id", match=qm.MatchValue(value=candidate_id))
+
+
+def sync_candidate_points(resumes: List[Dict[str, Any]], embedder, force: bool = False) -> Dict[str, int]:
+    """
+    Bring the Qdrant passages of candidates up to date with their latest resume.
+
+    `resumes` holds one dict per candidate with candidate_id, user_id, resume_id and text
+    (the resume's raw text); a candidate listed twice keeps its last entry. Like
+    `sync_job_points`, every payload carries the hash of the whole resume text and the
+    embedder's model id: a candidate whose stored hash and model match is not embedded again
+    (only its resume_id/user_id are updated if they changed). The passages of every other
+    candidate are embedded with one `embed_batch` and upserted under deterministic ids, then
+    the points left over from a longer previous resume are deleted in one request. A
+    candidate whose latest resume has no text loses all its points. `force` re-embeds every
+    candidate.
+
+    Returns:
+        Counts of candidates embedded, passages upserted, payload-only updates, unchanged and
+        empty (no resume text, points deleted)
+    """
+    counts = {"embedded": 0, "passages": 0, "patched": 0, "unchanged": 0, "empty": 0}
+    latest = {resume["candidate_id"]: resume for resume in resumes}
+    entries, empty = [], []
+    for candidate_id, resume in latest.items():
+        text = resume.get("text") or ""
+        passages = resume_passages(text) if text.strip() else []
+        if not passages:
+            empty.append(candidate_id)
+            continue
+        payload = {
+            "candidate_id": candidate_id,
+            "user_id": resume.get("user_id"),
+            "resume_id": resume.get("resume_id"),
+            # Lets a re-upload of the same resume skip the model
+            "text_hash": hashlib.sha1(text.encode("utf-8")).hexdigest(),
+            "embedding_model": embedder.model_id,
+        }
+        entries.append((candidate_id, passages, payload))
+
+    stored = {} if force else retrieve_payloads(
+        QDRANT_COLLECTION_CANDIDATES, [passage_point_id(candidate_id, 0) for candidate_id, _, _ in entries]
+    )
+    to_embed = []
+    for entry in entries:
+        candidate_id, _, payload = entry
+        previous = stored.get(passage_point_id(candidate_id, 0))
+        if (previous is None or previous.get("text_hash") != payload["text_hash"]
+                or previous.get("embedding_model") != payload["embedding_model"]):
+            to_embed.append(entry)
+        elif (previous.get("resume_id"), previous.get("user_id")) != (payload["resume_id"], payload["user_id"]):
+            set_payload_by_filter(
+                QDRANT_COLLECTION_CANDIDATES,
+                {"resume_id": payload["resume_id"], "user_id": payload["user_id"]},
+                qm.Filter(must=[_candidate_filter(candidate_id)]),
+            )
+            counts["patched"] += 1
+        else:
+            counts["unchanged"] += 1
+
+    if to_embed:
+        ids, texts, payloads = [], [], []
+        for candidate_id, passages, payload in to_embed:
+            for index, (section, passage) in enumerate(passages):
+                ids.append(passage_point_id(candidate_id, index))
+                texts.append(passage)
+                payloads.append({**payload, "section": section, "passage_index": index, "passage": passage})
+        upsert_points(
+            collection=QDRANT_COLLECTION_CANDIDATES,
+            ids=ids,
+            vectors=embedder.embed_batch(texts),
+            payloads=payloads,
+        )
+        # Passages past the new count belong to an older, longer resume
+        delete_by_filter(QDRANT_COLLECTION_CANDIDATES, qm.Filter(should=[
+            qm.Filter(must=[
+                _candidate_filter(candidate_id),
+                qm.FieldCondition(key="passage_index", range=qm.Range(gte=len(passages))),
+            ])
+            for candidate_id, passages, _ in to_embed
+        ]))
+        counts["passages"] = len(ids)
+    if empty:
+        # A latest resume without text must not leave the previous resume's passages searchable
+        delete_by_filter(QDRANT_COLLECTION_CANDIDATES, qm.Filter(must=[
+            qm.FieldCondition(key="candidate_id", match=qm.MatchAny(any=empty))
+        ]))
+    counts["embedded"] = len(to_embed)
+    counts["empty"] = len(empty)
+    return counts
+
+
+def job_query_vector(job: Any, embedder) -> Optional[List[float]]:
+    """
+    The job's vector from the Qdrant jobs collection, indexing the job first if its point
+    is missing or stale. None for a job without text.
+    """
+    sync_job_points([job], embedder)
+    stored = retrieve_vector(QDRANT_COLLECTION_JOBS, job.id)
+    return stored["vector"] if stored else None
+
+
+def similar_candidates(job: Any, embedder, top_k: int = 10) -> List[Dict[str, Any]]:
+    """
+    Candidates whose resume passages are closest to the job, best first.
+
+    A candidate's score is the maximum over its passages (max pooling), computed by Qdrant
+    grouping the passage hits by candidate_id, so one strong section is not diluted by the
+    rest of a long resume.
+
+    Returns:
+        candidate_id, score, and the section and text of the best-matching passage
+    """
+    vector = job_query_vector(job, embedder)
+    if vector is None:
+        return []
+    results = []
+    for group in search_groups(QDRANT_COLLECTION_CANDIDATES, vector, group_by="candidate_id", top_k=top_k):
+        best = group.hits[0]
+        payload = best.payload or {}
+        results.append({
+            "candidate_id": int(group.id),
+            "score": float(best.score),
+            "section": payload.get("section"),
+            "passage": payload.get("passage"),
+        })
+    return results
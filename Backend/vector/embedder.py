@@ -1,32 +1,57 @@
 from typing import List
 
-from sentence_transformers import SentenceTransformer
+from config import EMBEDDING_BACKEND
+from model_registry import DEFAULT_SENTENCE_MODEL, TORCH_BACKEND, lease_sentence_transformer
 
 
 class LocalEmbedder:
     """
     Wrapper around sentence-transformers so we have a single place
     to load the model and control normalization.
+
+    `backend` selects the inference runtime ("torch" or "onnx-int8", see model_registry.py);
+    both produce normalized vectors of the same dimension for the same model. The model is
+    leased from the model registry for each encode, so an idle model can be unloaded.
     """
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2") -> None:
-        self._model = SentenceTransformer(model_name)
+    def __init__(self, model_name: str = DEFAULT_SENTENCE_MODEL, backend: str = EMBEDDING_BACKEND) -> None:
+        try:
+            # On the torch backend, the same instance the student matching engine uses
+            lease = lease_sentence_transformer(model_name, backend)
+        except Exception as e:
+            if backend == TORCH_BACKEND:
+                raise
+            # A missing export should slow search down, not take it offline
+            print(f"[EMBEDDER] {backend} backend unavailable ({e}); falling back to {TORCH_BACKEND}")
+            backend = TORCH_BACKEND
+            lease = lease_sentence_transformer(model_name, backend)
+        with lease as model:
+            self._dimension = int(model.get_sentence_embedding_dimension())
+        self.backend = backend
+        self.model_name = model_name
+
+    @property
+    def model_id(self) -> str:
+        """Model and backend; stored with Qdrant points so a backend switch re-embeds them."""
+        return f"{self.model_name}:{self.backend}"
 
     @property
     def dimension(self) -> int:
         """Return the underlying model's embedding dimension."""
-        return int(self._model.get_sentence_embedding_dimension())
+        return self._dimension
 
     def embed_text(self, text: str) -> List[float]:
         """Encode a single piece of text into a vector."""
-        embedding = self._model.encode(text, normalize_embeddings=True)
+        with lease_sentence_transformer(self.model_name, self.backend) as model:
+            embedding = model.encode(text, normalize_embeddings=True)
         return embedding.tolist()
 
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Encode a batch of texts into vectors."""
         if not texts:
             return []
-        embeddings = self._model.encode(texts, normalize_embeddings=True)
+        with lease_sentence_transformer(self.model_name, self.backend) as model:
+            embeddings = model.encode(texts, normalize_embeddings=True)
         return [e.tolist() for e in embeddings]
 
 
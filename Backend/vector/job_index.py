@@ -0,0 +1,425 @@
+import hashlib
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from qdrant_client.http import models as qm
+
+from model_registry import DEFAULT_SENTENCE_MODEL, lease_sentence_transformer
+
+
+# Skills recognised in a student's search query (and the same words in job texts)
+QUERY_SKILL_KEYWORDS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust',
+    'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'Spring Boot',
+    'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis',
+    'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP',
+    'REST API', 'GraphQL', 'Microservices',
+    'TensorFlow', 'PyTorch', 'Machine Learning', 'Deep Learning',
+    'Git', 'CI/CD', 'Linux', 'DevOps',
+    'Pandas', 'NumPy', 'Data Analysis', 'Excel',
+    'Backend', 'Frontend', 'Full Stack', 'Full-Stack'
+]
+# Word boundaries avoid partial matches (e.g. "javascript" matching "java")
+_QUERY_SKILL_PATTERNS = [
+    (skill, re.compile(r'\b' + re.escape(skill.lower()) + r'\b')) for skill in QUERY_SKILL_KEYWORDS
+]
+_LOCATION_SEPARATORS = re.compile(r"[,/;|()]|\s+-\s+")
+
+
+def extract_query_skills(text: str) -> List[str]:
+    """QUERY_SKILL_KEYWORDS mentioned in `text` as whole words (case-insensitive)."""
+    if not text:
+        return []
+    text_lower = text.lower()
+    return [skill for skill, pattern in _QUERY_SKILL_PATTERNS if pattern.search(text_lower)]
+
+
+def location_terms(location: Optional[str]) -> List[str]:
+    """Lowercased parts of a location ("Pune, Maharashtra" -> ["pune", "maharashtra"])."""
+    if not location:
+        return []
+    return [" ".join(part.split()).lower() for part in _LOCATION_SEPARATORS.split(location) if part.strip()]
+
+
+def company_key(company: Optional[str]) -> Optional[str]:
+    """Case- and whitespace-insensitive form of a company name, for exact payload matches."""
+    return " ".join(company.split()).lower() if company else None
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timezone-aware UTC datetime (naive values from the database are UTC)."""
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def job_to_search_dict(job: Any) -> Dict[str, Any]:
+    """Convert a `Job` row into the dict shape used by the student job search."""
+    requirements = job.requirements_json or {}
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "salary": job.salary,
+        "description": job.description or "",
+        "requirements": requirements.get("job_description", "") or
+                        f"{', '.join(requirements.get('required_skills', []))}",
+        "created_at": job.created_at,
+        # Changes whenever the row is saved; lets JobEmbeddingIndex.sync skip unchanged jobs unhashed
+        "version": job.updated_at or job.created_at,
+    }
+
+
+def job_vector_text_and_payload(job: Any) -> Tuple[str, Dict[str, Any]]:
+    """Text embedded for a `Job` row in the Qdrant jobs collection, and its point payload."""
+    requirements = job.requirements_json or {}
+    required_skills = requirements.get("required_skills") or []
+    job_description = requirements.get("job_description") or ""
+
+    text_parts = [
+        job.title or "",
+        job.company or "",
+        job.description or "",
+        job_description or "",
+        ", ".join(required_skills),
+    ]
+    full_text = " ".join(part for part in text_parts if part)
+
+    payload = {
+        # Lets a re-save or reindex skip the model when the embedded text is unchanged
+        "text_hash": _content_hash(full_text),
+        "job_id": job.id,
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "salary": job.salary,
+        "required_skills": required_skills,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        # Filter fields of the student search (indexed in vector.qdrant_client.PAYLOAD_INDEXES);
+        # skills are matched like the query's skills are matched against the search text
+        "skills": [skill.lower() for skill in extract_query_skills(job_search_text(job_to_search_dict(job)))],
+        "location_terms": location_terms(job.location),
+        "company_key": company_key(job.company),
+    }
+    return full_text, payload
+
+
+def job_search_filter(
+    query_skills: Sequence[str] = (),
+    location: Optional[str] = None,
+    company: Optional[str] = None,
+    posted_within_days: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> Optional[qm.Filter]:
+    """
+    Qdrant filter on the jobs collection for a student search, or None without conditions.
+
+    A job must mention one of the query's skills, share a part of its location, belong to
+    the company and have been posted in the last `posted_within_days` days (each only when
+    given). Every condition uses a payload field indexed in PAYLOAD_INDEXES.
+    JobEmbeddingIndex.search applies the same conditions to the in-memory index.
+    """
+    conditions = []
+    if query_skills:
+        conditions.append(qm.FieldCondition(
+            key="skills", match=qm.MatchAny(any=[skill.lower() for skill in query_skills])))
+    terms = location_terms(location)
+    if terms:
+        conditions.append(qm.FieldCondition(key="location_terms", match=qm.MatchAny(any=terms)))
+    if company_key(company):
+        conditions.append(qm.FieldCondition(key="company_key", match=qm.MatchValue(value=company_key(company))))
+    if posted_within_days:
+        since = (now or datetime.now(timezone.utc)) - timedelta(days=posted_within_days)
+        conditions.append(qm.FieldCondition(key="created_at", range=qm.DatetimeRange(gte=since)))
+    return qm.Filter(must=conditions) if conditions else None
+
+
+def job_search_text(job: Dict[str, Any]) -> str:
+    """Text that is embedded for a job (must match StudentJobMatchingEngine.search_jobs)."""
+    return f"{job.get('title', '')} {job.get('description', '')} {job.get('requirements', '')}"
+
+
+class JobEmbeddingIndex:
+    """
+    Incrementally maintained float32 matrix of normalized job embeddings.
+
+    Rows are keyed by job id and the hash of the embedded text, so a job is only
+    re-encoded when its searchable text actually changes; a job whose "version" (the row's
+    updated_at/created_at) is unchanged is not even hashed again. The query skills each job
+    mentions, its location terms and its company are kept in inverted indexes, so a
+    filtered search scores only the matching rows; the filters are those of
+    `job_search_filter`, so the Qdrant and the in-memory search return the same jobs.
+    Searching is a single matrix-vector product followed by an `argpartition` top-k.
+    `refresh_job_index` keeps the index in step with the jobs table.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_SENTENCE_MODEL, initial_capacity: int = 256) -> None:
+        self.model_name = model_name  # leased from the model registry for each encode
+        lease_sentence_transformer(model_name).release()
+        self._lock = threading.RLock()
+        self._matrix: Optional[np.ndarray] = None  # allocated lazily once the dimension is known
+        self._capacity = initial_capacity
+        self._size = 0
+        self._row_by_id: Dict[Any, int] = {}
+        self._id_by_row: List[Any] = []
+        self._hash_by_id: Dict[Any, str] = {}
+        self._version_by_id: Dict[Any, Any] = {}
+        # Filter fields: job id -> {field: values}, and (field, value) -> job ids
+        self._terms_by_id: Dict[Any, Dict[str, List[str]]] = {}
+        self._ids_by_term: Dict[Tuple[str, str], set] = {}
+        self._created_by_id: Dict[Any, Optional[datetime]] = {}
+        # (job count, latest version) of the jobs table at the last refresh_job_index
+        self.db_state: Optional[Tuple[int, Any]] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, job_id: Any) -> bool:
+        return job_id in self._row_by_id
+
+    def ids(self) -> set:
+        with self._lock:
+            return set(self._row_by_id)
+
+    def encode_query(self, text: str) -> np.ndarray:
+        with lease_sentence_transformer(self.model_name) as model:
+            return np.asarray(model.encode(text, normalize_embeddings=True), dtype=np.float32)
+
+    def upsert(self, job: Dict[str, Any]) -> bool:
+        """Add or refresh a single job. Returns True if the job had to be (re-)encoded."""
+        return self.sync([job]) > 0
+
+    def sync(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """
+        Make sure every job in `jobs` is indexed with its current text.
+
+        Only new or changed jobs are encoded (in one batch). Returns the number encoded.
+        """
+        with self._lock:
+            pending_ids = []
+            pending_texts = []
+            pending_hashes = []
+            pending_versions = []
+            for job in jobs:
+                job_id = job.get("id")
+                if job_id is None:
+                    continue
+                version = job.get("version")
+                if version is not None and self._version_by_id.get(job_id) == version:
+                    continue
+                text = job_search_text(job)
+                digest = _content_hash(text)
+                # Location, company and posting date are not embedded: refreshed on every save
+                self._set_terms(job_id, "skills", [skill.lower() for skill in extract_query_skills(text)])
+                self._set_terms(job_id, "location", location_terms(job.get("location")))
+                self._set_terms(job_id, "company", [company_key(job.get("company"))] if job.get("company") else [])
+                self._created_by_id[job_id] = _as_utc(job.get("created_at"))
+                if self._hash_by_id.get(job_id) == digest:
+                    self._version_by_id[job_id] = version
+                    continue
+                pending_ids.append(job_id)
+                pending_texts.append(text)
+                pending_hashes.append(digest)
+                pending_versions.append(version)
+
+            if not pending_ids:
+                return 0
+
+            with lease_sentence_transformer(self.model_name) as model:
+                embeddings = np.asarray(model.encode(pending_texts, normalize_embeddings=True), dtype=np.float32)
+            for job_id, digest, version, vector in zip(pending_ids, pending_hashes, pending_versions, embeddings):
+                self._set_row(job_id, vector)
+                self._hash_by_id[job_id] = digest
+                self._version_by_id[job_id] = version
+            return len(pending_ids)
+
+    def score_jobs(self, query_vector: np.ndarray, jobs: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Sync `jobs` into the index and return their cosine similarity to the query, in order."""
+        with self._lock:
+            self.sync(jobs)
+            return self.similarities(query_vector, [job["id"] for job in jobs])
+
+    def remove(self, job_id: Any) -> bool:
+        """Drop a job from the index (swap-with-last, O(dimension))."""
+        with self._lock:
+            row = self._row_by_id.pop(job_id, None)
+            if row is None:
+                return False
+            self._hash_by_id.pop(job_id, None)
+            self._version_by_id.pop(job_id, None)
+            for field in list(self._terms_by_id.get(job_id, {})):
+                self._set_terms(job_id, field, [])
+            self._terms_by_id.pop(job_id, None)
+            self._created_by_id.pop(job_id, None)
+            last = self._size - 1
+            if row != last:
+                moved_id = self._id_by_row[last]
+                self._matrix[row] = self._matrix[last]
+                self._id_by_row[row] = moved_id
+                self._row_by_id[moved_id] = row
+            self._id_by_row.pop()
+            self._size -= 1
+            return True
+
+    def similarities(self, query_vector: np.ndarray, job_ids: Sequence[Any]) -> np.ndarray:
+        """Cosine similarity of the query against the given (already indexed) jobs, in order."""
+        with self._lock:
+            rows = np.fromiter((self._row_by_id[job_id] for job_id in job_ids), dtype=np.int64, count=len(job_ids))
+            if len(rows) == self._size and np.array_equal(rows, np.arange(self._size)):
+                scores = self._matrix[:self._size] @ query_vector
+            else:
+                scores = self._matrix[rows] @ query_vector
+        return scores
+
+    def search(self, query_vector: np.ndarray, top_k: int = 10,
+               query_skills: Sequence[str] = (),
+               location: Optional[str] = None,
+               company: Optional[str] = None,
+               posted_within_days: Optional[int] = None,
+               now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Top-k jobs across the whole index as [{"job_id", "score"}], best first; ties keep
+        index order. Only jobs passing the conditions of `job_search_filter` are ranked: a
+        job mentioning one of `query_skills`, sharing a location term, at the company,
+        posted in the last `posted_within_days` days.
+        """
+        with self._lock:
+            if self._size == 0:
+                return []
+            matching = None
+            for field, values in (
+                ("skills", [skill.lower() for skill in query_skills]),
+                ("location", location_terms(location)),
+                ("company", [company_key(company)] if company_key(company) else []),
+            ):
+                if not values:
+                    continue
+                ids = set()
+                for value in values:
+                    ids |= self._ids_by_term.get((field, value), set())
+                matching = ids if matching is None else matching & ids
+            if posted_within_days:
+                since = (now or datetime.now(timezone.utc)) - timedelta(days=posted_within_days)
+                matching = {
+                    job_id for job_id in (self._row_by_id if matching is None else matching)
+                    if self._created_by_id.get(job_id) is not None and self._created_by_id[job_id] >= since
+                }
+            if matching is None:
+                rows = np.arange(self._size)
+                scores = self._matrix[:self._size] @ query_vector
+            else:
+                rows = np.array(sorted(self._row_by_id[job_id] for job_id in matching
+                                       if job_id in self._row_by_id), dtype=np.int64)
+                scores = self._matrix[rows] @ query_vector
+            ids = [self._id_by_row[row] for row in rows]
+        top = top_k_indices(scores, top_k)
+        return [{"job_id": ids[i], "score": float(scores[i])} for i in top]
+
+    def _set_terms(self, job_id: Any, field: str, values: List[str]) -> None:
+        terms = self._terms_by_id.setdefault(job_id, {})
+        for value in terms.pop(field, []):
+            self._ids_by_term[(field, value)].discard(job_id)
+        if values:
+            terms[field] = values
+            for value in values:
+                self._ids_by_term.setdefault((field, value), set()).add(job_id)
+
+    def _set_row(self, job_id: Any, vector: np.ndarray) -> None:
+        if self._matrix is None:
+            self._matrix = np.zeros((self._capacity, vector.shape[0]), dtype=np.float32)
+        row = self._row_by_id.get(job_id)
+        if row is None:
+            if self._size == self._matrix.shape[0]:
+                grown = np.zeros((self._matrix.shape[0] * 2, self._matrix.shape[1]), dtype=np.float32)
+                grown[:self._size] = self._matrix[:self._size]
+                self._matrix = grown
+            row = self._size
+            self._size += 1
+            self._row_by_id[job_id] = row
+            self._id_by_row.append(job_id)
+        self._matrix[row] = vector
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the `top_k` highest scores, best first, via argpartition."""
+    n = scores.shape[0]
+    if top_k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if top_k < n:
+        kth = scores[np.argpartition(-scores, top_k - 1)[top_k - 1]]
+        # Jobs tied with the k-th score are taken in input order, as a full stable sort would
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[:top_k - above.shape[0]]
+        candidates = np.sort(np.concatenate([above, tied]))
+    else:
+        candidates = np.arange(n)
+    # Stable sort keeps tied jobs in input order
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+_indexes: Dict[str, JobEmbeddingIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_job_index(model_name: str = DEFAULT_SENTENCE_MODEL) -> JobEmbeddingIndex:
+    """Process-wide job index for a given embedding model."""
+    index = _indexes.get(model_name)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(model_name)
+            if index is None:
+                index = JobEmbeddingIndex(model_name)
+                _indexes[model_name] = index
+    return index
+
+
+def refresh_job_index(index: JobEmbeddingIndex, db) -> int:
+    """
+    Bring `index` up to date with the jobs table; returns the number of jobs encoded.
+
+    Costs one aggregate query (job count and latest updated_at/created_at) when nothing
+    changed since the last refresh. Otherwise only jobs saved since then are loaded, and
+    the id column is read to drop deleted jobs when the counts disagree.
+    """
+    from sqlalchemy import func
+    from database.models import Job
+
+    version = func.coalesce(Job.updated_at, Job.created_at)
+    state = tuple(db.query(func.count(Job.id), func.max(version)).one())
+    previous = index.db_state
+    if previous == state:
+        return 0
+    query = db.query(Job)
+    if previous is not None and previous[1] is not None:
+        # >= : rows saved within the same timestamp as the last refresh are compared by version
+        query = query.filter(version >= previous[1])
+    encoded = index.sync(job_to_search_dict(job) for job in query.all())
+    if len(index) != state[0]:
+        live = {job_id for (job_id,) in db.query(Job.id).all()}
+        for job_id in index.ids() - live:
+            index.remove(job_id)
+    index.db_state = state
+    return encoded
+
+
+def update_job_in_indexes(job: Any) -> None:
+    """Refresh a job in every index that has already been built (called from the jobs router)."""
+    if not _indexes:
+        return
+    job_dict = job_to_search_dict(job)
+    for index in list(_indexes.values()):
+        index.upsert(job_dict)
+
+
+def remove_job_from_indexes(job_id: Any) -> None:
+    """Drop a deleted job from every built index."""
+    for index in list(_indexes.values()):
+        index.remove(job_id)
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qm
@@ -12,6 +12,24 @@ from config import (
 
 
 _qdrant_client: Optional[QdrantClient] = None
+# Client whose collections and indexes are known to exist, for these vector sizes
+_ensured_client: Optional[QdrantClient] = None
+_ensured_sizes: Set[int] = set()
+
+# Payload fields that searches filter or group on, per collection. Without an index Qdrant
+# checks the condition point by point; with one, a selective filter is resolved from the index.
+PAYLOAD_INDEXES: Dict[str, Dict[str, qm.PayloadSchemaType]] = {
+    QDRANT_COLLECTION_JOBS: {
+        "job_id": qm.PayloadSchemaType.INTEGER,
+        "skills": qm.PayloadSchemaType.KEYWORD,
+        "location_terms": qm.PayloadSchemaType.KEYWORD,
+        "company_key": qm.PayloadSchemaType.KEYWORD,
+        "created_at": qm.PayloadSchemaType.DATETIME,
+    },
+    QDRANT_COLLECTION_CANDIDATES: {
+        "candidate_id": qm.PayloadSchemaType.INTEGER,
+    },
+}
 
 
 def get_qdrant_client() -> QdrantClient:
@@ -27,31 +45,43 @@ def get_qdrant_client() -> QdrantClient:
 
 def ensure_collections(vector_size: int) -> None:
     """
-    Ensure that the standard collections for jobs and candidates exist.
+    Ensure that the standard collections for jobs and candidates exist, with the payload
+    indexes in PAYLOAD_INDEXES.
 
-    This is safe to call multiple times; it will only create collections if needed.
+    This is safe to call multiple times; it will only create collections and indexes if needed.
+    After the first successful call for a client, further calls return without contacting Qdrant.
     """
+    global _ensured_client
     client = get_qdrant_client()
+    if client is _ensured_client and vector_size in _ensured_sizes:
+        return
 
-    for name in (QDRANT_COLLECTION_JOBS, QDRANT_COLLECTION_CANDIDATES):
+    for name, fields in PAYLOAD_INDEXES.items():
         try:
-            client.get_collection(name)
             # Collection exists
-            continue
+            indexed = client.get_collection(name).payload_schema or {}
         except Exception:
             # Create collection
-            client.recreate_collection(
+            client.create_collection(
                 collection_name=name,
                 vectors_config=qm.VectorParams(
                     size=vector_size,
                     distance=qm.Distance.COSINE,
                 ),
             )
+            indexed = {}
+        for field, schema in fields.items():
+            if field not in indexed:
+                client.create_payload_index(collection_name=name, field_name=field, field_schema=schema)
+    if client is not _ensured_client:
+        _ensured_client = client
+        _ensured_sizes.clear()
+    _ensured_sizes.add(vector_size)
 
 
 def upsert_points(
     collection: str,
-    ids: List[str],
+    ids: List[Any],
     vectors: List[List[float]],
     payloads: List[Dict[str, Any]],
 ) -> None:
@@ -68,18 +98,94 @@ def upsert_points(
     )
 
 
+def retrieve_payloads(collection: str, ids: List[Any]) -> Dict[Any, Dict[str, Any]]:
+    """Payloads of the points among `ids` that exist, by id (vectors are not fetched)."""
+    client = get_qdrant_client()
+    if not ids:
+        return {}
+    records = client.retrieve(collection_name=collection, ids=ids, with_payload=True, with_vectors=False)
+    return {record.id: record.payload or {} for record in records}
+
+
+def overwrite_payloads(collection: str, ids: List[Any], payloads: List[Dict[str, Any]]) -> None:
+    """Replace the payloads of existing points in one request, keeping their vectors."""
+    client = get_qdrant_client()
+    if not ids:
+        return
+    client.batch_update_points(
+        collection_name=collection,
+        update_operations=[
+            qm.OverwritePayloadOperation(overwrite_payload=qm.SetPayload(payload=payload, points=[pid]))
+            for pid, payload in zip(ids, payloads)
+        ],
+    )
+
+
+def retrieve_vector(collection: str, point_id: Any) -> Optional[Dict[str, Any]]:
+    """Vector and payload of one point ({"vector", "payload"}), or None if it does not exist."""
+    client = get_qdrant_client()
+    records = client.retrieve(collection_name=collection, ids=[point_id], with_payload=True, with_vectors=True)
+    if not records:
+        return None
+    return {"vector": records[0].vector, "payload": records[0].payload or {}}
+
+
+def delete_points(collection: str, ids: List[Any]) -> None:
+    """Delete the points with these ids in one request (ids without a point are ignored)."""
+    client = get_qdrant_client()
+    if not ids:
+        return
+    client.delete(collection_name=collection, points_selector=qm.PointIdsList(points=ids))
+
+
+def delete_by_filter(collection: str, filter_: qm.Filter) -> None:
+    """Delete every point matching `filter_` in one request."""
+    client = get_qdrant_client()
+    client.delete(collection_name=collection, points_selector=qm.FilterSelector(filter=filter_))
+
+
+def set_payload_by_filter(collection: str, payload: Dict[str, Any], filter_: qm.Filter) -> None:
+    """Set payload keys on every point matching `filter_`, keeping vectors and other keys."""
+    client = get_qdrant_client()
+    client.set_payload(collection_name=collection, payload=payload, points=qm.FilterSelector(filter=filter_))
+
+
+def search_groups(
+    collection: str,
+    query_vector: List[float],
+    group_by: str,
+    top_k: int = 10,
+    filter_: Optional[qm.Filter] = None,
+) -> List[qm.PointGroup]:
+    """
+    Search by vector similarity, returning the best `top_k` groups of points sharing the
+    `group_by` payload value. Each group holds only its best-scoring point.
+    """
+    client = get_qdrant_client()
+    return client.query_points_groups(
+        collection_name=collection,
+        query=query_vector,
+        group_by=group_by,
+        limit=top_k,
+        group_size=1,
+        query_filter=filter_,
+        with_payload=True,
+    ).groups
+
+
 def search(
     collection: str,
     query_vector: List[float],
     top_k: int = 10,
     filter_: Optional[qm.Filter] = None,
 ) -> List[qm.ScoredPoint]:
-    """Search a collection by vector similarity."""
+    """Search a collection by vector similarity; only points matching `filter_` are ranked."""
     client = get_qdrant_client()
-    return client.search(
+    return client.query_points(
         collection_name=collection,
-        query_vector=query_vector,
+        query=query_vector,
         limit=top_k,
         query_filter=filter_,
-    )
+        with_payload=True,
+    ).points
 
@@ -0,0 +1,244 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from qdrant_client.http import models as qm
+from sqlalchemy import func, select
+
+from config import QDRANT_COLLECTION_JOBS, VECTOR_REINDEX_CHUNK_SIZE
+from database.models import Job
+from vector.job_index import job_vector_text_and_payload
+from vector.qdrant_client import (
+    delete_by_filter,
+    delete_points,
+    overwrite_payloads,
+    retrieve_payloads,
+    upsert_points,
+)
+
+
+REINDEX_QUEUED = "queued"
+REINDEX_RUNNING = "running"
+REINDEX_COMPLETED = "completed"
+REINDEX_FAILED = "failed"
+
+# A running reindex that has not checkpointed for this long is treated as crashed
+REINDEX_STALE_AFTER = timedelta(minutes=5)
+
+
+def sync_job_points(jobs: List[Job], embedder, force: bool = False) -> Dict[str, int]:
+    """
+    Bring the Qdrant points of `jobs` up to date with as few model calls as possible.
+
+    Each point's payload carries the hash of its embedded text and the embedder's model id.
+    Jobs whose stored hash and model match are not embedded again: their payload is
+    overwritten if anything else changed (a salary edit, say) and left alone otherwise.
+    New and changed jobs are embedded with one `embed_batch` and upserted. `force` re-embeds
+    every job. The points of jobs left without text are deleted.
+
+    Returns:
+        Counts of jobs embedded, payload-only updates, unchanged and empty (nothing to embed)
+    """
+    counts = {"embedded": 0, "patched": 0, "unchanged": 0, "empty": 0}
+    entries, empty_ids = [], []
+    for job in jobs:
+        text, payload = job_vector_text_and_payload(job)
+        if not text:
+            empty_ids.append(job.id)
+            continue
+        payload["embedding_model"] = embedder.model_id
+        entries.append((job.id, text, payload))
+
+    stored = {} if force else retrieve_payloads(QDRANT_COLLECTION_JOBS, [job_id for job_id, _, _ in entries])
+    to_embed, to_patch = [], []
+    for entry in entries:
+        previous, payload = stored.get(entry[0]), entry[2]
+        if (previous is None or previous.get("text_hash") != payload["text_hash"]
+                or previous.get("embedding_model") != payload["embedding_model"]):
+            to_embed.append(entry)
+        elif previous != payload:
+            to_patch.append(entry)
+        else:
+            counts["unchanged"] += 1
+
+    if to_embed:
+        vectors = embedder.embed_batch([text for _, text, _ in to_embed])
+        upsert_points(
+            collection=QDRANT_COLLECTION_JOBS,
+            ids=[job_id for job_id, _, _ in to_embed],
+            vectors=vectors,
+            payloads=[payload for _, _, payload in to_embed],
+        )
+    if to_patch:
+        overwrite_payloads(
+            QDRANT_COLLECTION_JOBS,
+            [job_id for job_id, _, _ in to_patch],
+            [payload for _, _, payload in to_patch],
+        )
+    delete_points(QDRANT_COLLECTION_JOBS, empty_ids)
+    counts["embedded"], counts["patched"], counts["empty"] = len(to_embed), len(to_patch), len(empty_ids)
+    return counts
+
+
+def delete_stale_job_points(after_id: int, up_to_id: Optional[int], job_ids: List[int]) -> None:
+    """
+    Delete the points of deleted jobs: those with after_id < job_id <= up_to_id (no upper
+    bound when None) whose id is not in `job_ids`, the jobs of that range that still exist.
+    """
+    delete_by_filter(QDRANT_COLLECTION_JOBS, qm.Filter(
+        must=[qm.FieldCondition(key="job_id", range=qm.Range(gt=after_id, lte=up_to_id))],
+        must_not=[qm.HasIdCondition(has_id=job_ids)] if job_ids else None,
+    ))
+
+
+def create_reindex_job(mongo_db, user_id: Optional[int], force: bool = False) -> Dict[str, Any]:
+    """Insert a queued reindex job and return its document (without the Mongo _id)."""
+    now = datetime.utcnow()
+    job = {
+        "reindex_id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "collection": QDRANT_COLLECTION_JOBS,
+        "status": REINDEX_QUEUED,
+        "force": force,
+        "total": 0,
+        "processed": 0,
+        "indexed": 0,
+        "embedded": 0,
+        "skipped": 0,
+        "patched": 0,
+        "empty": 0,
+        "last_job_id": 0,
+        "jobs_per_second": 0.0,
+        "resumed": 0,
+        "created_at": now,
+        "updated_at": now,
+        "started_at": None,
+        "finished_at": None,
+    }
+    mongo_db.reindex_jobs.insert_one(dict(job))
+    return job
+
+
+def get_reindex_job(mongo_db, reindex_id: str) -> Optional[Dict[str, Any]]:
+    return mongo_db.reindex_jobs.find_one({"reindex_id": reindex_id}, {"_id": 0})
+
+
+def latest_reindex_job(mongo_db) -> Optional[Dict[str, Any]]:
+    return next(iter(mongo_db.reindex_jobs.find({}, {"_id": 0}).sort("created_at", -1).limit(1)), None)
+
+
+def is_resumable(job: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+    """Failed, or left running/queued by a process that stopped checkpointing."""
+    if job["status"] == REINDEX_FAILED:
+        return True
+    if job["status"] in (REINDEX_RUNNING, REINDEX_QUEUED):
+        return (now or datetime.utcnow()) - job["updated_at"] > REINDEX_STALE_AFTER
+    return False
+
+
+def claim_for_resume(mongo_db, job: Dict[str, Any]) -> bool:
+    """
+    Queue an interrupted reindex again. Conditional on the `updated_at` that was read, so of
+    two concurrent requests only one resumes it.
+    """
+    result = mongo_db.reindex_jobs.update_one(
+        {"reindex_id": job["reindex_id"], "updated_at": job["updated_at"]},
+        {"$set": {"status": REINDEX_QUEUED, "updated_at": datetime.utcnow()}, "$inc": {"resumed": 1}},
+    )
+    return result.modified_count == 1
+
+
+def ensure_indexes(mongo_db) -> None:
+    mongo_db.reindex_jobs.create_index("reindex_id", unique=True)
+    mongo_db.reindex_jobs.create_index("created_at")
+
+
+class JobReindex:
+    """
+    Streaming, resumable reindex of the jobs table into the Qdrant jobs collection.
+
+    Jobs are read in id order through a server-side cursor (`yield_per`), VECTOR_REINDEX_CHUNK_SIZE
+    rows at a time. Each chunk is synced with `sync_job_points` (one `embed_batch` and one
+    upsert for its new or changed jobs, payload-only updates for the rest) on its own;
+    the session's identity map only holds weak references to unmodified rows, so finished
+    chunks are freed and memory stays bounded by the chunk size. After every
+    chunk the id of its last job is checkpointed on the `reindex_jobs` document together with
+    the progress; a resumed run continues after that id. Points whose job no longer exists
+    are deleted chunk by chunk (and past the last job at the end), so filtered searches do
+    not spend their top_k on jobs that are gone.
+    """
+
+    def __init__(self, mongo_db, db, embedder, reindex_id: Optional[str] = None, force: bool = False,
+                 chunk_size: int = VECTOR_REINDEX_CHUNK_SIZE,
+                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.mongo_db = mongo_db
+        self.db = db
+        self.embedder = embedder
+        self.reindex_id = reindex_id
+        self.force = force
+        self.chunk_size = max(1, chunk_size)
+        self.on_progress = on_progress
+        # indexed = embedded + skipped (text unchanged; `patched` of those got a new payload)
+        self.progress: Dict[str, Any] = {
+            "total": 0, "processed": 0, "indexed": 0, "embedded": 0, "skipped": 0, "patched": 0,
+            "empty": 0, "last_job_id": 0, "jobs_per_second": 0.0,
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """Index every job after the checkpoint; returns the final progress."""
+        job = get_reindex_job(self.mongo_db, self.reindex_id) if self.reindex_id else None
+        if job:
+            # Resuming: keep the counters of the chunks already upserted
+            for key in self.progress:
+                self.progress[key] = job.get(key, self.progress[key])
+        started_at = time.perf_counter()
+        processed_before = self.progress["processed"]
+        self._update_job({"status": REINDEX_RUNNING,
+                          "started_at": (job or {}).get("started_at") or datetime.utcnow()})
+
+        try:
+            last_job_id = self.progress["last_job_id"]
+            remaining = self.db.scalar(select(func.count(Job.id)).where(Job.id > last_job_id))
+            self.progress["total"] = processed_before + remaining
+            self._update_job(dict(self.progress))
+
+            rows = self.db.execute(
+                select(Job).where(Job.id > last_job_id).order_by(Job.id)
+                .execution_options(yield_per=self.chunk_size)
+            ).scalars()
+            for chunk in rows.partitions():
+                self._index_chunk(chunk)
+                elapsed = time.perf_counter() - started_at
+                done = self.progress["processed"] - processed_before
+                self.progress["jobs_per_second"] = round(done / elapsed, 2) if elapsed else 0.0
+                self._update_job(dict(self.progress))
+                if self.on_progress:
+                    self.on_progress(dict(self.progress))
+            delete_stale_job_points(self.progress["last_job_id"], None, [])
+        except Exception as e:
+            self._update_job({"status": REINDEX_FAILED, "error": str(e)})
+            raise
+        self._update_job({"status": REINDEX_COMPLETED, "finished_at": datetime.utcnow(), "error": None,
+                          "elapsed_seconds": round(time.perf_counter() - started_at, 3)})
+        return dict(self.progress)
+
+    def _index_chunk(self, jobs: List[Job]) -> None:
+        counts = sync_job_points(jobs, self.embedder, force=self.force)
+        delete_stale_job_points(self.progress["last_job_id"], jobs[-1].id, [job.id for job in jobs])
+        skipped = counts["patched"] + counts["unchanged"]
+        self.progress["indexed"] += counts["embedded"] + skipped
+        self.progress["embedded"] += counts["embedded"]
+        self.progress["skipped"] += skipped
+        self.progress["patched"] += counts["patched"]
+        self.progress["empty"] += counts["empty"]
+        # Checkpoint only once the chunk is in Qdrant
+        self.progress["processed"] += len(jobs)
+        self.progress["last_job_id"] = jobs[-1].id
+
+    def _update_job(self, fields: Dict[str, Any]) -> None:
+        if self.reindex_id is None:
+            return
+        self.mongo_db.reindex_jobs.update_one(
+            {"reindex_id": self.reindex_id}, {"$set": {**fields, "updated_at": datetime.utcnow()}}
+        )
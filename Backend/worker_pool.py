@@ -0,0 +1,83 @@
+"""
+Worker Pool Module
+Named, lazily created process pools for CPU-bound work (resume parsing, ATS scoring)
+that must not run on the event loop or contend for the GIL with request handling.
+
+The module reads no configuration (the JD-Resume-Analyzer installs it without the
+backend's config.py); the backend passes WORKER_POOL_SIZE / WORKER_POOL_START_METHOD
+through `configure_pools` at startup.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+
+_pools: Dict[str, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+_default_size = 0  # 0 = one worker per core
+_start_method = "spawn"
+
+
+def configure_pools(default_size: int = 0, start_method: str = "spawn") -> None:
+    """Default pool size and worker start method for pools created from now on."""
+    global _default_size, _start_method
+    _default_size, _start_method = default_size, start_method
+
+
+def default_pool_size() -> int:
+    """One worker per available core."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:  # Not available on macOS / Windows
+        return max(1, os.cpu_count() or 1)
+
+
+def pool_size(max_workers: Optional[int] = None) -> int:
+    """Workers a pool gets: max_workers, else the configured default size, else one per core."""
+    return max_workers or _default_size or default_pool_size()
+
+
+def get_process_pool(name: str, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Return the process pool registered under `name`, creating it on first use.
+
+    Workers are started with the configured start method ("spawn" by default), so they do
+    not inherit database clients or threads from the API process.
+    """
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = ProcessPoolExecutor(
+                    max_workers=pool_size(max_workers),
+                    mp_context=multiprocessing.get_context(_start_method),
+                )
+                _pools[name] = pool
+    return pool
+
+
+def replace_broken_pool(name: str, broken: ProcessPoolExecutor,
+                        max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Replace a pool that raised BrokenProcessPool (a worker died) with a fresh one.
+
+    Concurrent callers holding the same broken pool all get the one replacement.
+    """
+    with _pools_lock:
+        if _pools.get(name) is broken:
+            del _pools[name]
+    broken.shutdown(wait=False, cancel_futures=True)
+    return get_process_pool(name, max_workers)
+
+
+def shutdown_pools(wait: bool = False) -> None:
+    """Shut down every pool (called on application shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=True)